@@ -10,6 +10,7 @@ Criteria:
 6. Free-form categories — LLM assigns whatever fits best
 """
 
+import argparse
 import json
 import os
 import sys
@@ -20,11 +21,12 @@ from rich.table import Table
 
 load_dotenv()
 
-# Add parent to path for imports
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Add parent directory to path so we can import pipeline modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from processing.llm_client import get_llm_client
-from db import get_connection
+from pipeline.processing import batch_api
+from pipeline.processing.llm_client import get_llm_client
+from pipeline.db import get_connection
 
 console = Console()
 
@@ -91,8 +93,27 @@ def fetch_pending():
     return rows
 
 
-def apply_decision(beef_id: str, decision: str, messages_json=None, nsfw_level=None, category=None):
-    """Update the argument status in the database."""
+def fetch_current(ids: list) -> dict[str, tuple[str, list]]:
+    """id -> (status, messages) as they are now, for checking stale batch results."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT id, status, messages FROM arguments WHERE id::text = ANY(%s)",
+        ([str(i) for i in ids],),
+    )
+    rows = {str(row[0]): (row[1], _messages(row[2])) for row in cur.fetchall()}
+    cur.close()
+    conn.close()
+    return rows
+
+
+def _messages(value) -> list:
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def apply_decision(beef_id: str, decision: str, messages_json=None, nsfw_level=None, category=None) -> bool:
+    """Update the argument status in the database. Only pending arguments
+    are touched; returns False if it was reviewed or removed meanwhile."""
     conn = get_connection()
     cur = conn.cursor()
     if decision == "approve":
@@ -109,24 +130,25 @@ def apply_decision(beef_id: str, decision: str, messages_json=None, nsfw_level=N
             params.append(category)
         params.append(beef_id)
         cur.execute(
-            f"UPDATE arguments SET {', '.join(updates)} WHERE id = %s",
+            f"UPDATE arguments SET {', '.join(updates)} "
+            "WHERE id = %s AND status = 'pending_review'",
             params,
         )
     elif decision == "reject":
         cur.execute(
-            "UPDATE arguments SET status = 'rejected' WHERE id = %s",
+            "UPDATE arguments SET status = 'rejected' WHERE id = %s AND status = 'pending_review'",
             (beef_id,),
         )
+    applied = cur.rowcount > 0
     conn.commit()
     cur.close()
     conn.close()
+    return applied
 
 
-def review_argument(client, arg: dict) -> dict:
-    """Send a single argument to the LLM for review."""
-    messages = arg["messages"]
-    if isinstance(messages, str):
-        messages = json.loads(messages)
+def _build_review_prompt(arg: dict) -> str:
+    """The user prompt presenting one argument for review."""
+    messages = _messages(arg["messages"])
 
     # Build readable thread for the LLM
     lines = []
@@ -135,7 +157,7 @@ def review_argument(client, arg: dict) -> dict:
         quoted = f'\n  > Quoting: "{msg["quoted_text"]}"' if msg.get("quoted_text") else ""
         lines.append(f"[{i}] {author_name} ({msg['author']}): {msg['body']}{quoted}")
 
-    user_prompt = f"""Title: {arg['title']}
+    return f"""Title: {arg['title']}
 Category: {arg['category']}
 Entertainment Score: {arg['entertainment_score']}
 Heat: {arg['heat_rating']}/5
@@ -146,37 +168,151 @@ Context: {arg.get('context_blurb', 'N/A')}
 Messages ({len(messages)} total):
 {chr(10).join(lines)}"""
 
-    try:
-        response = client.complete(REVIEW_SYSTEM_PROMPT, user_prompt)
+
+def _parse_review(response: str) -> dict:
+    response = response.strip()
+    if response.startswith("```"):
+        response = response.split("\n", 1)[1]
+        if response.endswith("```"):
+            response = response[:-3]
         response = response.strip()
-        if response.startswith("```"):
-            response = response.split("\n", 1)[1]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
-        return json.loads(response)
+    return json.loads(response)
+
+
+_REVIEW_FAILED = {"decision": "skip", "reason": "Review failed, keeping as pending for manual review"}
+
+
+def review_argument(client, arg: dict) -> dict:
+    """Send a single argument to the LLM for review."""
+    try:
+        return _parse_review(client.complete(REVIEW_SYSTEM_PROMPT, _build_review_prompt(arg)))
     except Exception as e:
         console.print(f"  [red]Review error for #{arg['beef_number']}: {e}[/red]")
-        return {"decision": "skip", "reason": "Review failed, keeping as pending for manual review"}
+        return dict(_REVIEW_FAILED)
+
+
+def review_batch(client, pending: list[dict], poll_interval: float = 60.0):
+    """
+    Review arguments through the provider's batch API, yielding
+    (arg, result) pairs. A job left over from an interrupted run is
+    collected first instead of submitting the same arguments again; its
+    results are skipped for arguments that were reviewed or re-enriched
+    since it was submitted.
+    """
+    store = batch_api.BatchJobStore()
+    jobs = store.open_jobs("review")
+    if not jobs and pending:
+        requests = {
+            f"a{i}": (
+                REVIEW_SYSTEM_PROMPT,
+                _build_review_prompt(arg),
+                json.dumps(arg, default=str),
+            )
+            for i, arg in enumerate(pending)
+        }
+        jobs = [(batch_api.submit(client, store, "review", requests), client.provider)]
+
+    for job_id, provider in jobs:
+        job_client = client if provider == client.provider else get_llm_client(provider=provider)
+        if not job_client.supports_batch:
+            console.print(f"  [red]{type(job_client).__name__} has no batch API support, job {job_id} left open[/red]")
+            continue
+        responses = batch_api.wait(job_client, job_id, poll_interval)
+        payloads = {custom_id: json.loads(p) for custom_id, p in store.payloads(job_id).items()}
+        current = fetch_current([arg["id"] for arg in payloads.values()])
+        for custom_id, arg in payloads.items():
+            status, messages = current.get(str(arg["id"]), (None, None))
+            if status != "pending_review" or messages != _messages(arg["messages"]):
+                yield arg, {
+                    "decision": "skip",
+                    "reason": "Reviewed or changed since the batch was submitted, result dropped",
+                }
+                continue
+            response = responses.get(custom_id)
+            try:
+                if response is None:
+                    raise ValueError("no result in batch")
+                yield arg, _parse_review(response.text)
+            except Exception as e:
+                yield arg, {**_REVIEW_FAILED, "reason": f"Review failed ({e}), keeping as pending"}
+        store.close(job_id)
+
+
+def _no_longer_pending() -> str:
+    console.print("  [dim]⏭ SKIPPED — no longer pending review[/dim]")
+    return "skipped"
+
+
+def apply_review(arg: dict, result: dict) -> str:
+    """Apply one review result; returns "approved", "fixed", "rejected" or "skipped"."""
+    decision = result.get("decision", "skip")
+    reason = result.get("reason", "")
+    nsfw_level = result.get("nsfw_level")
+    category = result.get("category")
+
+    if decision == "fix":
+        # Remove orphan messages
+        messages = _messages(arg["messages"])
+        indices_to_delete = sorted(result.get("delete_message_indices", []), reverse=True)
+        for idx in indices_to_delete:
+            if 0 <= idx < len(messages):
+                messages.pop(idx)
+        if not apply_decision(arg["id"], "approve", json.dumps(messages), nsfw_level, category):
+            return _no_longer_pending()
+        nsfw_tag = f" [{nsfw_level}]" if nsfw_level else ""
+        console.print(f"  [yellow]✂ FIXED[/yellow]{nsfw_tag} (removed {len(indices_to_delete)} msgs) — {reason}")
+        return "fixed"
+    elif decision == "approve":
+        if not apply_decision(arg["id"], "approve", nsfw_level=nsfw_level, category=category):
+            return _no_longer_pending()
+        nsfw_tag = f" [{nsfw_level}]" if nsfw_level else ""
+        console.print(f"  [green]✓ APPROVED[/green]{nsfw_tag} — {reason}")
+        return "approved"
+    elif decision == "reject":
+        if not apply_decision(arg["id"], "reject"):
+            return _no_longer_pending()
+        console.print(f"  [red]✗ REJECTED[/red] — {reason}")
+        return "rejected"
+    else:
+        # skip — leave as pending_review for manual review
+        console.print(f"  [dim]⏭ SKIPPED[/dim] — {reason}")
+        return "skipped"
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Auto-review pending arguments using LLM")
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        dest="batch_api",
+        help="Review through the provider's batch API (cheaper, can take hours); "
+        "rerun to resume a job left waiting",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=60.0,
+        dest="poll_interval",
+        help="Seconds between batch job status checks (default: 60)",
+    )
+    args = parser.parse_args()
+
     console.print("[bold red]🥩 ThreadBeef Auto-Reviewer[/bold red]\n")
 
     pending = fetch_pending()
     console.print(f"Found [bold]{len(pending)}[/bold] pending arguments\n")
 
-    if not pending:
+    if not pending and not args.batch_api:
         console.print("[dim]Nothing to review.[/dim]")
         return
 
     client = get_llm_client()
     console.print(f"Using [bold]{type(client).__name__}[/bold] ({client.model})\n")
+    if args.batch_api and not client.supports_batch:
+        console.print(f"[red]--batch-api: {type(client).__name__} has no batch API support[/red]")
+        return
 
-    approved = 0
-    rejected = 0
-    fixed = 0
-    skipped = 0
+    counts = {"approved": 0, "fixed": 0, "rejected": 0, "skipped": 0}
 
     # Pre-filter: reject anything below entertainment score threshold
     score_threshold = 5.5
@@ -185,65 +321,45 @@ def main():
 
     for arg in pre_rejected:
         apply_decision(arg["id"], "reject")
-        rejected += 1
+        counts["rejected"] += 1
         console.print(
             f"  [red]✗ AUTO-REJECTED[/red] #{arg['beef_number']} — "
             f"Score {arg['entertainment_score']} below {score_threshold} threshold"
         )
 
-    for i, arg in enumerate(pending):
-        console.print(
-            f"[{i + 1}/{len(pending)}] [bold]#{arg['beef_number']}[/bold] — {arg['title']}"
-        )
-
-        result = review_argument(client, arg)
-        decision = result.get("decision", "skip")
-        reason = result.get("reason", "")
-        nsfw_level = result.get("nsfw_level")
-        category = result.get("category")
-
-        if decision == "fix":
-            # Remove orphan messages
-            messages = arg["messages"]
-            if isinstance(messages, str):
-                messages = json.loads(messages)
-            indices_to_delete = sorted(result.get("delete_message_indices", []), reverse=True)
-            for idx in indices_to_delete:
-                if 0 <= idx < len(messages):
-                    messages.pop(idx)
-            apply_decision(arg["id"], "approve", json.dumps(messages), nsfw_level, category)
-            fixed += 1
-            nsfw_tag = f" [{nsfw_level}]" if nsfw_level else ""
-            console.print(f"  [yellow]✂ FIXED[/yellow]{nsfw_tag} (removed {len(indices_to_delete)} msgs) — {reason}")
-        elif decision == "approve":
-            apply_decision(arg["id"], "approve", nsfw_level=nsfw_level, category=category)
-            approved += 1
-            nsfw_tag = f" [{nsfw_level}]" if nsfw_level else ""
-            console.print(f"  [green]✓ APPROVED[/green]{nsfw_tag} — {reason}")
-        elif decision == "reject":
-            apply_decision(arg["id"], "reject")
-            rejected += 1
-            console.print(f"  [red]✗ REJECTED[/red] — {reason}")
-        else:
-            # skip — leave as pending_review for manual review
-            skipped += 1
-            console.print(f"  [dim]⏭ SKIPPED[/dim] — {reason}")
-
-        # Rate limit
-        if i < len(pending) - 1:
-            time.sleep(0.5)
+    if args.batch_api:
+        reviewed = 0
+        for arg, result in review_batch(client, pending, args.poll_interval):
+            reviewed += 1
+            console.print(f"[bold]#{arg['beef_number']}[/bold] — {arg['title']}")
+            counts[apply_review(arg, result)] += 1
+        total = reviewed + len(pre_rejected)
+    else:
+        for i, arg in enumerate(pending):
+            console.print(
+                f"[{i + 1}/{len(pending)}] [bold]#{arg['beef_number']}[/bold] — {arg['title']}"
+            )
+
+            result = review_argument(client, arg)
+            counts[apply_review(arg, result)] += 1
+
+            # Rate limit
+            if i < len(pending) - 1:
+                time.sleep(0.5)
+        total = len(pending) + len(pre_rejected)
 
     # Summary
     console.print()
     table = Table(title="Review Summary")
     table.add_column("Status", style="bold")
     table.add_column("Count", justify="right")
-    table.add_row("[green]Approved[/green]", str(approved))
-    table.add_row("[yellow]Fixed & Approved[/yellow]", str(fixed))
-    table.add_row("[red]Rejected[/red]", str(rejected))
-    table.add_row("[dim]Skipped (pending)[/dim]", str(skipped))
-    table.add_row("[bold]Total[/bold]", str(len(pending) + len(pre_rejected)))
+    table.add_row("[green]Approved[/green]", str(counts["approved"]))
+    table.add_row("[yellow]Fixed & Approved[/yellow]", str(counts["fixed"]))
+    table.add_row("[red]Rejected[/red]", str(counts["rejected"]))
+    table.add_row("[dim]Skipped (pending)[/dim]", str(counts["skipped"]))
+    table.add_row("[bold]Total[/bold]", str(total))
     console.print(table)
+    console.print(f"[dim]LLM usage: {client.usage.summary()}[/dim]")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,940 @@
+"""
+ThreadBeef pipeline benchmarks.
+
+Compares hot-path implementations against the versions they replaced on
+synthetic inputs, and checks that their output still matches. `batch`
+runs a provider batch job end to end against a local stand-in instead.
+
+Usage:
+  python benchmark.py reconstruct [--replies 10000] [--authors 80] [--repeat 1]
+  python benchmark.py chains [--comments 5000] [--authors 300] [--repeat 1]
+  python benchmark.py scoring [--threads 5000] [--repeat 3]
+  python benchmark.py prompts [--threads 1000 | --threads-file threads.jsonl] [--live 10]
+  python benchmark.py batch [--threads 200] [--running-polls 2] [--fail-every 10]
+"""
+
+import sys
+import os
+import argparse
+import copy
+import hashlib
+import json
+import random
+import re
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from rich.console import Console
+from rich.table import Table
+
+# Add parent directory to path so we can import pipeline modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline.config import LLMConfig, YouTubeConfig
+from pipeline.detection.argument_finder import find_argument_chains
+from pipeline.detection.scoring import (
+    CONFRONTATIONAL_MARKERS as _LEGACY_CONFRONTATIONAL,
+    ENTERTAINMENT_MARKERS as _LEGACY_ENTERTAINMENT,
+    score_threads,
+)
+from pipeline.models import RawMessage, RawThread
+from pipeline.processing.enrichment import (
+    ENRICHMENT_SYSTEM_PROMPT,
+    PACKED_ENRICHMENT_SYSTEM_PROMPT,
+    _OUTPUT_OVERHEAD,
+    _OUTPUT_PER_BODY_TOKEN,
+    _OUTPUT_PER_MESSAGE,
+    _build_enrichment_prompt,
+    collect_enrichment_batch,
+    estimate_tokens,
+    submit_enrichment_batch,
+)
+from pipeline.processing.batch_api import BatchJobStore
+from pipeline.processing.dedupe import thread_fingerprint
+from pipeline.processing.llm_client import BatchClient, LLMResponse, min_cacheable_tokens
+from pipeline.scrapers.youtube import _reconstruct_threads
+
+console = Console()
+
+
+# ---------------------------------------------------------------------------
+# Previous implementations, kept verbatim as the "before" baseline
+# ---------------------------------------------------------------------------
+
+def _legacy_reconstruct_threads(comments: list[dict], min_per_side: int = 3) -> list[dict]:
+    top_level = [c for c in comments if not c["parent_id"]]
+    replies_by_parent: dict[str, list[dict]] = defaultdict(list)
+    for c in comments:
+        if c["parent_id"]:
+            replies_by_parent[c["parent_id"]].append(c)
+
+    result = list(top_level)
+
+    for top_id, replies in replies_by_parent.items():
+        author_counts: dict[str, int] = defaultdict(int)
+        for r in replies:
+            author_counts[r["author"]] += 1
+
+        qualifying_authors = [a for a, c in author_counts.items() if c >= min_per_side]
+
+        paired_ids: set[str] = set()
+
+        for i, author_a in enumerate(qualifying_authors):
+            for author_b in qualifying_authors[i + 1:]:
+                pair_msgs = sorted(
+                    [r for r in replies if r["author"] in (author_a, author_b)],
+                    key=lambda r: r.get("timestamp", ""),
+                )
+
+                if len(pair_msgs) < min_per_side * 2:
+                    continue
+
+                for idx, msg in enumerate(pair_msgs):
+                    if idx == 0:
+                        msg["parent_id"] = top_id
+                        msg["depth"] = 1
+                    else:
+                        msg["parent_id"] = pair_msgs[idx - 1]["id"]
+                        msg["depth"] = idx + 1
+
+                    paired_ids.add(msg["id"])
+
+                result.extend(pair_msgs)
+
+        for r in replies:
+            if r["id"] not in paired_ids:
+                result.append(r)
+
+    return result
+
+
+def _legacy_score_argumentness(thread: RawThread) -> int:
+    """
+    Score how much a thread looks like a genuine argument (0-100).
+
+    Factors:
+    - Sentiment polarity / confrontational markers
+    - Reply depth (alternating authors)
+    - Score disparity between messages
+    - Direct quoting / referencing
+    """
+    score = 0
+    messages = thread.messages
+
+    if len(messages) < 4:
+        return 0
+
+    # 1. Confrontational markers (up to 40 points)
+    marker_count = 0
+    for msg in messages:
+        text = msg.body.lower()
+        for pattern in _LEGACY_CONFRONTATIONAL:
+            if re.search(pattern, text, re.IGNORECASE):
+                marker_count += 1
+
+    score += min(40, marker_count * 5)
+
+    # 2. Alternation quality (up to 25 points)
+    # How often do authors alternate? (sign of back-and-forth)
+    alternations = 0
+    for i in range(1, len(messages)):
+        if messages[i].author_id != messages[i - 1].author_id:
+            alternations += 1
+
+    alternation_ratio = alternations / max(1, len(messages) - 1)
+    score += int(alternation_ratio * 25)
+
+    # 3. Score disparity (up to 15 points)
+    # Controversial comments (some upvoted, some downvoted) signal arguments
+    scores = [m.score for m in messages if m.score is not None]
+    if len(scores) >= 2:
+        score_range = max(scores) - min(scores)
+        if score_range > 20:
+            score += 15
+        elif score_range > 10:
+            score += 10
+        elif score_range > 3:
+            score += 5
+
+    # 4. Message length consistency (up to 10 points)
+    # Arguments tend to have longer messages (people explaining their positions)
+    avg_length = sum(len(m.body) for m in messages) / max(1, len(messages))
+    if avg_length > 100:
+        score += 10
+    elif avg_length > 50:
+        score += 5
+
+    # 5. Direct references (up to 10 points)
+    # Quoting or directly referencing the other person
+    ref_count = 0
+    for msg in messages:
+        body_lower = msg.body.lower()
+        if (
+            ">" in msg.body
+            or "you said" in body_lower
+            or "your" in body_lower
+            or "@" in msg.body
+        ):
+            ref_count += 1
+    score += min(10, ref_count * 3)
+
+    return min(100, score)
+
+
+def _legacy_score_entertainment(thread: RawThread) -> int:
+    """
+    Score how entertaining an argument is (0-100).
+
+    Factors:
+    - Absurdity / humor markers
+    - Escalation arc
+    - Zinger quality
+    - Relatability (common topics)
+    - Sweet spot length (6-10 messages)
+    """
+    score = 0
+    messages = thread.messages
+
+    # 1. Entertainment markers (up to 30 points)
+    marker_count = 0
+    for msg in messages:
+        for pattern in _LEGACY_ENTERTAINMENT:
+            if re.search(pattern, msg.body):
+                marker_count += 1
+
+    score += min(30, marker_count * 4)
+
+    # 2. Escalation arc (up to 25 points)
+    # Messages getting longer or more heated over time
+    lengths = [len(m.body) for m in messages]
+    if len(lengths) >= 4:
+        first_half_avg = sum(lengths[: len(lengths) // 2]) / max(
+            1, len(lengths) // 2
+        )
+        second_half_avg = sum(lengths[len(lengths) // 2 :]) / max(
+            1, len(lengths) - len(lengths) // 2
+        )
+        if second_half_avg > first_half_avg * 1.5:
+            score += 25
+        elif second_half_avg > first_half_avg * 1.2:
+            score += 15
+        elif second_half_avg > first_half_avg:
+            score += 8
+
+    # 3. Length bonus (up to 15 points)
+    # Longer arguments = more investment from both sides = likely more entertaining
+    msg_count = len(messages)
+    if msg_count >= 6:
+        score += 15
+    elif msg_count >= 4:
+        score += 10
+
+    # 4. Caps usage / emphasis (up to 15 points)
+    caps_count = sum(
+        1 for m in messages if re.search(r"[A-Z]{3,}", m.body)
+    )
+    score += min(15, caps_count * 4)
+
+    # 5. Topic variety bonus (up to 10 points)
+    # If the argument drifts topics, it's often more entertaining
+    all_text = " ".join(m.body for m in messages)
+    unique_words = len(set(all_text.lower().split()))
+    if unique_words > 200:
+        score += 10
+    elif unique_words > 100:
+        score += 5
+
+    return min(100, score)
+
+
+_LEGACY_MAX_MESSAGES_FOR_ENRICHMENT = 15
+
+
+def _legacy_build_enrichment_prompt(thread: RawThread) -> str:
+    """Build the user prompt, truncating long threads to avoid output token limits."""
+    messages = thread.messages
+    truncated = False
+
+    if len(messages) > _LEGACY_MAX_MESSAGES_FOR_ENRICHMENT:
+        # Keep first 6, last 6, and 3 from the middle for context
+        head = messages[:6]
+        tail = messages[-6:]
+        middle_start = len(messages) // 2 - 1
+        middle = messages[middle_start : middle_start + 3]
+        messages = head + middle + tail
+        truncated = True
+
+    messages_text = []
+    for msg in messages:
+        messages_text.append(
+            f"[{msg.author_id}] (score: {msg.score}): {msg.body}"
+        )
+
+    truncation_note = ""
+    if truncated:
+        truncation_note = (
+            f"\n\n(Thread has {len(thread.messages)} total messages. "
+            f"Showing {len(messages)} representative messages — first 6, "
+            f"3 from middle, last 6. Include ALL shown messages in your output.)"
+        )
+
+    return f"""Platform: {thread.platform}
+Source: {thread.source}
+Thread title: {thread.title or "N/A"}
+Participant A: {thread.participant_a}
+Participant B: {thread.participant_b}
+
+Messages:
+{chr(10).join(messages_text)}{truncation_note}"""
+
+
+# ---------------------------------------------------------------------------
+# Synthetic inputs
+# ---------------------------------------------------------------------------
+
+def _synthetic_youtube_comments(
+    replies: int,
+    authors: int,
+    top_level: int = 1,
+    seed: int = 42,
+) -> list[dict]:
+    """Flat YouTube-style comments: `replies` replies spread over `top_level`
+    threads, posted by `authors` users with a Zipf-like activity skew."""
+    rng = random.Random(seed)
+    names = [f"user{i}" for i in range(authors)]
+    weights = [1 / (rank + 1) for rank in range(authors)]
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    comments: list[dict] = []
+    for t in range(top_level):
+        comments.append({
+            "id": f"top{t}",
+            "parent_id": "",
+            "author": f"op{t}",
+            "body": "Top-level take",
+            "score": rng.randint(0, 5000),
+            "timestamp": start.isoformat(),
+            "depth": 0,
+        })
+
+    for i in range(replies):
+        ts = start + timedelta(seconds=rng.randint(0, 7 * 24 * 3600))
+        comments.append({
+            "id": f"r{i}",
+            "parent_id": f"top{rng.randrange(top_level)}",
+            "author": rng.choices(names, weights)[0],
+            "body": "No, you're wrong about this.",
+            "score": rng.randint(0, 50),
+            "timestamp": ts.isoformat(),
+            "depth": 1,
+        })
+
+    return comments
+
+
+def _synthetic_reddit_comments(
+    comments: int,
+    authors: int,
+    seed: int = 42,
+) -> list[dict]:
+    """A flat Reddit-style comment tree in parent-first order: mostly
+    drive-by replies, with two-person arguments running deep among them."""
+    rng = random.Random(seed)
+    names = [f"user{i}" for i in range(authors)]
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    out: list[dict] = []
+    # Active arguments: [comment id, its author, the other participant]
+    arguments: list[list] = []
+
+    for i in range(comments):
+        roll = rng.random()
+        if out and arguments and roll < 0.5:
+            arg = rng.choice(arguments)
+            parent_id, parent_author, author = arg
+            depth = next(c["depth"] for c in reversed(out) if c["id"] == parent_id) + 1
+            arg[0], arg[1], arg[2] = f"c{i}", author, parent_author
+            if rng.random() < 0.05:
+                arguments.remove(arg)
+        elif out and roll < 0.85:
+            parent = rng.choice(out)
+            parent_id, depth = parent["id"], parent["depth"] + 1
+            author = rng.choice(names)
+            if rng.random() < 0.1 and author != parent["author"]:
+                arguments.append([f"c{i}", author, parent["author"]])
+        else:
+            parent_id, depth = "post", 0
+            author = rng.choice(names)
+
+        out.append({
+            "id": f"c{i}",
+            "parent_id": parent_id,
+            "author": author if rng.random() > 0.02 else "[deleted]",
+            "body": "No, you're wrong about this.",
+            "score": rng.randint(-5, 200),
+            "timestamp": (start + timedelta(seconds=i)).isoformat(),
+            "depth": depth,
+        })
+
+    return out
+
+
+_PHRASES = [
+    "you're wrong", "actually", "That's not what I said", "no offense but",
+    "LMAO", "lmao", "bruh", "are you serious", "WHAT?", "imagine thinking",
+    "you don't understand", "nonsense", "sir, this is a Wendy's", "cope",
+    "seething", "peak", "take the L", "touched grass", "!!!", "???", "@you",
+    "> you said", "your", "stupid", "ridiculous", "you clearly", "idiotic",
+]
+_FILLER = (
+    "the is are was have that this with people think really data shows "
+    "because however point source argument about never always maybe"
+).split()
+
+
+def _synthetic_threads(count: int, seed: int = 42) -> list[RawThread]:
+    """Two-person threads mixing filler words with scoring markers."""
+    rng = random.Random(seed)
+    threads = []
+    for t in range(count):
+        messages = []
+        for i in range(rng.randint(3, 14)):
+            words = [rng.choice(_FILLER) for _ in range(rng.randint(3, 60))]
+            for _ in range(rng.randint(0, 3)):
+                words.insert(rng.randrange(len(words) + 1), rng.choice(_PHRASES))
+            messages.append(RawMessage(
+                author_id="ab"[i % 2],
+                body=" ".join(words),
+                score=rng.choice([None, rng.randint(-20, 300)]),
+            ))
+        threads.append(RawThread(
+            platform="reddit",
+            source="r/bench",
+            messages=messages,
+            participant_a="a",
+            participant_b="b",
+        ))
+    return threads
+
+
+def _synthetic_enrichment_threads(count: int, seed: int = 42) -> list[RawThread]:
+    """Threads with long-tailed message sizes: mostly one-liners and short
+    replies, some multi-paragraph essays, and a few very long arguments."""
+    rng = random.Random(seed)
+    threads = []
+    for _ in range(count):
+        length = rng.choice([4, 5, 6, 8, 10, 12, 16, 20, 30, 45])
+        messages = []
+        for i in range(length):
+            size = rng.choices([6, 25, 80, 400], weights=[40, 35, 18, 7])[0]
+            words = [rng.choice(_FILLER) for _ in range(rng.randint(size // 2, size))]
+            messages.append(RawMessage(
+                author_id="ab"[i % 2],
+                body=" ".join(words).capitalize() + ".",
+                score=rng.randint(-20, 300),
+            ))
+        threads.append(RawThread(
+            platform="reddit",
+            source="r/bench",
+            title="Synthetic argument",
+            messages=messages,
+            participant_a="a",
+            participant_b="b",
+        ))
+    return threads
+
+
+def _load_threads(path: str) -> list[RawThread]:
+    """Threads recorded with `main.py scrape --record-threads PATH` (JSON lines)."""
+    with open(path) as fh:
+        return [RawThread.model_validate_json(line) for line in fh if line.strip()]
+
+
+def _best_time(fn, make_input, repeat: int) -> tuple[float, object]:
+    """Best wall time of `repeat` runs, each on a fresh input."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        data = make_input()
+        start = time.perf_counter()
+        result = fn(data)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _timing_table(title: str, rows: list[tuple[str, float]]) -> Table:
+    table = Table(title=title)
+    table.add_column("Implementation", style="cyan")
+    table.add_column("Time", justify="right", style="green")
+    table.add_column("Speedup", justify="right")
+    baseline = rows[0][1]
+    for name, seconds in rows:
+        table.add_row(name, f"{seconds * 1000:.1f} ms", f"{baseline / seconds:.1f}x")
+    return table
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def bench_reconstruct(args):
+    """_reconstruct_threads on a synthetic mega-thread."""
+    min_per_side = 3
+    cap = YouTubeConfig().max_pair_authors
+    comments = _synthetic_youtube_comments(args.replies, args.authors, args.top_level)
+    fresh = lambda: copy.deepcopy(comments)
+
+    console.print(
+        f"[bold]{args.replies:,} replies, {args.authors} authors, "
+        f"{args.top_level} top-level comment(s)[/bold]"
+    )
+
+    before, legacy_out = _best_time(
+        lambda c: _legacy_reconstruct_threads(c, min_per_side), fresh, args.repeat
+    )
+    uncapped, new_out = _best_time(
+        lambda c: _reconstruct_threads(c, min_per_side), fresh, args.repeat
+    )
+    capped, _ = _best_time(
+        lambda c: _reconstruct_threads(c, min_per_side, cap), fresh, args.repeat
+    )
+
+    shape = lambda out: [(c["id"], c["parent_id"], c["depth"]) for c in out]
+    parity = shape(legacy_out) == shape(new_out)
+
+    console.print(
+        _timing_table(
+            "_reconstruct_threads",
+            [
+                ("legacy (rescan + sort per pair)", before),
+                ("indexed merge, uncapped", uncapped),
+                (f"indexed merge, top {cap} authors", capped),
+            ],
+        )
+    )
+    console.print(
+        f"Uncapped output identical to legacy: "
+        f"{'[green]yes[/green]' if parity else '[red]NO[/red]'}"
+    )
+    if not parity:
+        sys.exit(1)
+
+
+def _check_chains(chains: list[dict], min_per_side: int) -> list[str]:
+    """Invariants every detected chain must hold; returns the violations."""
+    problems = []
+    claimed: set[str] = set()
+    for n, chain in enumerate(chains):
+        msgs = chain["messages"]
+        authors = {m["author"] for m in msgs}
+        if authors != {chain["participant_a"], chain["participant_b"]} or len(authors) != 2:
+            problems.append(f"chain {n}: authors {sorted(authors)}")
+        if len(msgs) < 4 or any(
+            sum(1 for m in msgs if m["author"] == a) < min_per_side for a in authors
+        ):
+            problems.append(f"chain {n}: too short ({len(msgs)} messages)")
+        if any(m["parent_id"] != prev["id"] for prev, m in zip(msgs, msgs[1:])):
+            problems.append(f"chain {n}: not a reply path")
+        ids = {m["id"] for m in msgs}
+        if ids & claimed:
+            problems.append(f"chain {n}: overlaps an earlier chain")
+        claimed |= ids
+    return problems
+
+
+def bench_chains(args):
+    """find_argument_chains on a synthetic Reddit-style thread (timing and validity only)."""
+    min_per_side = 3
+    comments = _synthetic_reddit_comments(args.comments, args.authors)
+    fresh = lambda: comments
+
+    console.print(f"[bold]{args.comments:,} comments, {args.authors} authors[/bold]")
+
+    after, out = _best_time(
+        lambda c: find_argument_chains(c, min_per_side), fresh, args.repeat
+    )
+
+    console.print(_timing_table("find_argument_chains", [("greedy walk per comment", after)]))
+
+    lengths = [len(c["messages"]) for c in out]
+    console.print(
+        f"Chains: {len(out)}, messages: {sum(lengths)}, "
+        f"longest: {max(lengths, default=0)}"
+    )
+
+    problems = _check_chains(out, min_per_side)
+    for problem in problems[:10]:
+        console.print(f"  [red]{problem}[/red]")
+    console.print(
+        f"Chains valid (2 authors, min_per_side, reply paths, no overlap): "
+        f"{'[red]NO[/red]' if problems else '[green]yes[/green]'}"
+    )
+    if problems:
+        sys.exit(1)
+
+
+def bench_scoring(args):
+    """score_argumentness / score_entertainment over a batch of threads."""
+    threads = _synthetic_threads(args.threads)
+    messages = sum(len(t.messages) for t in threads)
+    fresh = lambda: threads
+
+    console.print(f"[bold]{args.threads:,} threads, {messages:,} messages[/bold]")
+
+    # Warm re's pattern cache so the baseline isn't charged for compiling
+    _legacy_score_argumentness(threads[0])
+    _legacy_score_entertainment(threads[0])
+
+    before, legacy_out = _best_time(
+        lambda ts: (
+            [_legacy_score_argumentness(t) for t in ts],
+            [_legacy_score_entertainment(t) for t in ts],
+        ),
+        fresh,
+        args.repeat,
+    )
+    after, new_out = _best_time(score_threads, fresh, args.repeat)
+
+    console.print(
+        _timing_table(
+            "Thread scoring",
+            [
+                ("legacy (re.search per marker)", before),
+                ("score_threads (combined matcher)", after),
+            ],
+        )
+    )
+    console.print(
+        f"Throughput: {args.threads / before:,.0f} -> {args.threads / after:,.0f} threads/s"
+    )
+
+    mismatches = [
+        i for i in range(len(threads))
+        if (legacy_out[0][i], legacy_out[1][i]) != (new_out[0][i], new_out[1][i])
+    ]
+    console.print(
+        f"Scores identical to legacy: "
+        f"{'[red]NO[/red]' if mismatches else '[green]yes[/green]'}"
+        + (f" ({len(mismatches)} threads differ)" if mismatches else "")
+    )
+    if mismatches:
+        sys.exit(1)
+
+
+def _legacy_expected_output(thread: RawThread) -> int:
+    """The budgeted builder's output model applied to what the fixed
+    15-message truncation shows, so both sides are predicted alike."""
+    messages = thread.messages
+    if len(messages) > _LEGACY_MAX_MESSAGES_FOR_ENRICHMENT:
+        middle_start = len(messages) // 2 - 1
+        messages = messages[:6] + messages[middle_start : middle_start + 3] + messages[-6:]
+    return (
+        _OUTPUT_OVERHEAD
+        + _OUTPUT_PER_MESSAGE * len(messages)
+        + int(_OUTPUT_PER_BODY_TOKEN * sum(estimate_tokens(m.body) for m in messages))
+    )
+
+
+def _live_prompt_run(client, system: str, prompts: list[tuple[str, int | None]]) -> tuple[float, int, int]:
+    """Mean seconds per call plus total input/output tokens, against the
+    configured provider with the response cache off."""
+    usage_before = (client.usage.input_tokens, client.usage.output_tokens)
+    started = time.perf_counter()
+    for user, max_tokens in prompts:
+        client.complete(system, user, use_cache=False, max_tokens=max_tokens)
+    elapsed = time.perf_counter() - started
+    return (
+        elapsed / max(1, len(prompts)),
+        client.usage.input_tokens - usage_before[0],
+        client.usage.output_tokens - usage_before[1],
+    )
+
+
+def bench_prompts(args):
+    """Enrichment prompt size: fixed 15-message truncation vs the token budget."""
+    config = LLMConfig()
+    threads = (
+        _load_threads(args.threads_file)
+        if args.threads_file
+        else _synthetic_enrichment_threads(args.threads)
+    )
+    messages = sum(len(t.messages) for t in threads)
+    source = args.threads_file or "synthetic"
+    console.print(f"[bold]{len(threads):,} threads, {messages:,} messages ({source})[/bold]")
+
+    system_tokens = estimate_tokens(ENRICHMENT_SYSTEM_PROMPT)
+    legacy = [_legacy_build_enrichment_prompt(t) for t in threads]
+    budgeted = [
+        _build_enrichment_prompt(t, config.prompt_token_budget, config.message_token_cap)
+        for t in threads
+    ]
+
+    legacy_input = sum(system_tokens + estimate_tokens(p) for p in legacy)
+    new_input = sum(system_tokens + estimate_tokens(p.text) for p in budgeted)
+    legacy_output = sum(_legacy_expected_output(t) for t in threads)
+    new_output = sum(p.expected_output for p in budgeted)
+    legacy_limit = 4096 * len(threads)
+    new_limit = sum(min(p.max_tokens, 4096) for p in budgeted)
+    legacy_max = max(estimate_tokens(p) for p in legacy)
+    new_max = max(estimate_tokens(p.text) for p in budgeted)
+
+    # Decode time dominates enrichment latency, so it scales with output tokens
+    legacy_seconds = args.base_latency + legacy_output / len(threads) / args.output_tps
+    new_seconds = args.base_latency + new_output / len(threads) / args.output_tps
+
+    table = Table(title="Enrichment prompts (estimated tokens)")
+    table.add_column("Metric", style="cyan")
+    table.add_column("15-message cut", justify="right")
+    table.add_column("Token budget", justify="right", style="green")
+    table.add_column("Change", justify="right")
+    for name, before, after in [
+        ("Input tokens", legacy_input, new_input),
+        ("Largest prompt", legacy_max, new_max),
+        ("Expected output tokens", legacy_output, new_output),
+        ("max_tokens requested", legacy_limit, new_limit),
+    ]:
+        table.add_row(name, f"{before:,}", f"{after:,}", f"{(after - before) / before:+.0%}")
+    table.add_row(
+        f"Est. latency/call @ {args.output_tps:.0f} tok/s",
+        f"{legacy_seconds:.1f}s",
+        f"{new_seconds:.1f}s",
+        f"{(new_seconds - legacy_seconds) / legacy_seconds:+.0%}",
+    )
+    console.print(table)
+
+    # The system prompt is the part a provider prompt cache can reuse
+    config_models = {"claude": config.claude_model, "openai": config.openai_model}
+    for prompt_name, prompt in (
+        ("system prompt", ENRICHMENT_SYSTEM_PROMPT),
+        ("packed system prompt", PACKED_ENRICHMENT_SYSTEM_PROMPT),
+    ):
+        tokens = estimate_tokens(prompt)
+        minimums = ", ".join(
+            f"{model} {minimum:,} ({'cacheable' if tokens >= minimum else 'too short'})"
+            for model, minimum in (
+                (model, min_cacheable_tokens(provider, model))
+                for provider, model in config_models.items()
+            )
+        )
+        console.print(f"Enrichment {prompt_name}: ~{tokens:,} tokens; caching minimum {minimums}")
+
+    trimmed = sum(1 for p in budgeted if p.trimmed)
+    cut = sum(1 for t, p in zip(threads, budgeted) if p.shown < len(t.messages))
+    legacy_cut = sum(1 for t in threads if len(t.messages) > _LEGACY_MAX_MESSAGES_FOR_ENRICHMENT)
+    console.print(
+        f"Threads with messages omitted: {legacy_cut} -> {cut}; "
+        f"threads with long messages trimmed in the prompt (stored in full): 0 -> {trimmed}"
+    )
+
+    if args.live:
+        from pipeline.processing.llm_client import get_llm_client
+
+        client = get_llm_client(use_cache=False)
+        sample = list(zip(threads, legacy, budgeted))[: args.live]
+        console.print(f"\n[bold]Live run: {len(sample)} threads on {client.model}...[/bold]")
+        before = _live_prompt_run(
+            client, ENRICHMENT_SYSTEM_PROMPT, [(p, None) for _, p, _ in sample]
+        )
+        after = _live_prompt_run(
+            client,
+            ENRICHMENT_SYSTEM_PROMPT,
+            [(p.text, min(p.max_tokens, client.max_tokens)) for _, _, p in sample],
+        )
+        live = Table(title="Live enrichment calls")
+        live.add_column("Prompt", style="cyan")
+        live.add_column("Mean latency", justify="right")
+        live.add_column("Input tokens", justify="right")
+        live.add_column("Output tokens", justify="right")
+        live.add_row("15-message cut", f"{before[0]:.2f}s", f"{before[1]:,}", f"{before[2]:,}")
+        live.add_row("Token budget", f"{after[0]:.2f}s", f"{after[1]:,}", f"{after[2]:,}")
+        console.print(live)
+
+
+_PROMPT_MESSAGE = re.compile(r"^\[(\w+)\] \(score: [^)]*\): (.*)$", re.MULTILINE)
+
+
+class _StandInBatchClient(BatchClient):
+    """In-process stand-in for a provider batch endpoint. A job reports
+    "running" for the first `running_polls` status checks, then answers
+    each request with a minimal enrichment result that echoes the shown
+    messages as they appear in the prompt and is titled with a digest of
+    the prompt; every `fail_every`-th request errors instead."""
+
+    provider = "stand-in"
+    model = "stand-in"
+
+    def __init__(self, running_polls: int = 2, fail_every: int = 10):
+        self.running_polls = running_polls
+        self.fail_every = fail_every
+        self.jobs: dict[str, dict[str, tuple[str, str]]] = {}
+        self.polls: dict[str, int] = {}
+
+    @staticmethod
+    def digest(user: str) -> str:
+        return hashlib.sha256(user.encode()).hexdigest()[:16]
+
+    def _answer(self, user: str) -> LLMResponse:
+        data = {
+            "entertainment_score": 5.0,
+            "category": "petty",
+            "heat_rating": 3,
+            "title": self.digest(user),
+            "user_a_display_name": "a",
+            "user_b_display_name": "b",
+            "messages": [
+                {"author": author, "body": body}
+                for author, body in _PROMPT_MESSAGE.findall(user)
+            ],
+        }
+        return LLMResponse(
+            text=json.dumps(data), input_tokens=estimate_tokens(user), output_tokens=60
+        )
+
+    def _complete(self, system: str, user: str, max_tokens=None) -> LLMResponse:
+        return self._answer(user)
+
+    async def _acomplete(self, system: str, user: str, max_tokens=None) -> LLMResponse:
+        return self._answer(user)
+
+    def submit_batch(self, requests: dict[str, tuple[str, str]]) -> str:
+        job_id = f"stand_in_{len(self.jobs)}"
+        self.jobs[job_id] = dict(requests)
+        self.polls[job_id] = 0
+        return job_id
+
+    def batch_state(self, job_id: str) -> str:
+        self.polls[job_id] += 1
+        return "done" if self.polls[job_id] > self.running_polls else "running"
+
+    def batch_results(self, job_id: str) -> dict[str, LLMResponse | None]:
+        return {
+            custom_id: None if n % self.fail_every == self.fail_every - 1 else self._answer(user)
+            for n, (custom_id, (_, user)) in enumerate(self.jobs[job_id].items())
+        }
+
+
+def bench_batch(args):
+    """Enrichment batch job end to end (submit -> poll -> collect) against the
+    stand-in client, collected through a fresh job store as
+    `main.py batch-resume` would after an interrupted scrape."""
+    config = LLMConfig()
+    threads = _synthetic_enrichment_threads(args.threads)
+    client = _StandInBatchClient(args.running_polls, args.fail_every)
+
+    store = BatchJobStore("bench_batch_jobs")
+    for stale, _ in store.open_jobs("enrich"):
+        store.close(stale, "abandoned")  # Left by an aborted earlier run
+
+    updated = thread_fingerprint(threads[0])
+    job_id = submit_enrichment_batch(client, threads, store, {updated: 1}, config)
+
+    resumed = BatchJobStore("bench_batch_jobs")
+    open_jobs = resumed.open_jobs("enrich")
+    results, job_threads, updates = collect_enrichment_batch(client, resumed, job_id, 0)
+
+    expected = {
+        thread_fingerprint(t): client.digest(
+            _build_enrichment_prompt(t, config.prompt_token_budget, config.message_token_cap).text
+        )
+        for t in threads
+    }
+    originals = {thread_fingerprint(t): {m.body for m in t.messages} for t in threads}
+    failures = len(threads) // args.fail_every
+    checks = [
+        ("Job found by a fresh store", open_jobs == [(job_id, client.provider)]),
+        (f"Polled until done ({client.polls[job_id]} status checks)",
+         client.polls[job_id] == args.running_polls + 1),
+        ("All threads restored from the store", len(job_threads) == len(threads)),
+        (f"Results collected ({len(results)}, {failures} requests errored)",
+         len(results) == len(threads) - failures),
+        ("Each result matched to its own thread",
+         all(expected.get(arg.fingerprint) == arg.title for arg in results)),
+        ("Trimmed messages stored in full",
+         all(m.body in originals[arg.fingerprint] for arg in results for m in arg.messages)),
+        ("Pending update carried through", updates == {updated: 1}),
+        ("Job closed", not resumed.open_jobs("enrich")),
+    ]
+
+    table = Table(title="Batch round trip")
+    table.add_column("Check", style="cyan")
+    table.add_column("OK", justify="right")
+    for name, ok in checks:
+        table.add_row(name, "[green]yes[/green]" if ok else "[red]NO[/red]")
+    console.print(table)
+    if not all(ok for _, ok in checks):
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="ThreadBeef pipeline benchmarks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Benchmark to run")
+
+    reconstruct_parser = subparsers.add_parser(
+        "reconstruct", help="YouTube reply-thread reconstruction"
+    )
+    reconstruct_parser.add_argument("--replies", type=int, default=10_000)
+    reconstruct_parser.add_argument("--authors", type=int, default=80)
+    reconstruct_parser.add_argument("--top-level", type=int, default=1, dest="top_level")
+    reconstruct_parser.add_argument("--repeat", type=int, default=1)
+    reconstruct_parser.set_defaults(func=bench_reconstruct)
+
+    chains_parser = subparsers.add_parser(
+        "chains", help="Argument chain detection on a comment tree"
+    )
+    chains_parser.add_argument("--comments", type=int, default=5_000)
+    chains_parser.add_argument("--authors", type=int, default=300)
+    chains_parser.add_argument("--repeat", type=int, default=1)
+    chains_parser.set_defaults(func=bench_chains)
+
+    scoring_parser = subparsers.add_parser(
+        "scoring", help="Pre-LLM argumentness/entertainment scoring"
+    )
+    scoring_parser.add_argument("--threads", type=int, default=5_000)
+    scoring_parser.add_argument("--repeat", type=int, default=3)
+    scoring_parser.set_defaults(func=bench_scoring)
+
+    prompts_parser = subparsers.add_parser(
+        "prompts", help="Enrichment prompt size, output budget and latency"
+    )
+    prompts_parser.add_argument("--threads", type=int, default=1_000)
+    prompts_parser.add_argument(
+        "--threads-file",
+        dest="threads_file",
+        help="JSON-lines threads recorded with `main.py scrape --record-threads`",
+    )
+    prompts_parser.add_argument(
+        "--output-tps", type=float, default=80.0, dest="output_tps",
+        help="Output tokens/s used to estimate latency",
+    )
+    prompts_parser.add_argument(
+        "--base-latency", type=float, default=0.8, dest="base_latency",
+        help="Fixed seconds per call (network + time to first token)",
+    )
+    prompts_parser.add_argument(
+        "--live", type=int, default=0,
+        help="Also send the first N threads to the configured LLM with both prompts",
+    )
+    prompts_parser.set_defaults(func=bench_prompts)
+
+    batch_parser = subparsers.add_parser(
+        "batch", help="Enrichment batch job round trip against a local stand-in client"
+    )
+    batch_parser.add_argument("--threads", type=int, default=200)
+    batch_parser.add_argument("--running-polls", type=int, default=2, dest="running_polls")
+    batch_parser.add_argument("--fail-every", type=int, default=10, dest="fail_every")
+    batch_parser.set_defaults(func=bench_batch)
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return
+
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
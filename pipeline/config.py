@@ -6,6 +6,12 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Local on-disk state: incremental scrape stores, caches, indexes
+STATE_DIR = os.getenv(
+    "PIPELINE_STATE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".state"),
+)
+
 
 @dataclass
 class RedditConfig:
@@ -33,6 +39,19 @@ class RedditConfig:
     min_messages_per_side: int = 3
     min_score: int = 5
 
+    # Concurrent scraping (workers > 1 fans out over a thread pool)
+    workers: int = 1
+    requests_per_minute: int = 100  # Per OAuth app credential
+
+    # Incremental re-scrapes: skip posts that gained fewer new comments
+    # than this since the last time we scraped them
+    min_new_comments: int = 10
+
+    # MoreComments expansion: top-level "load more" stubs resolved per post,
+    # plus a request budget reserved for stubs under two-author exchanges
+    top_level_more_limit: int = 3
+    more_comments_budget: int = 8
+
 
 @dataclass
 class HNConfig:
@@ -45,6 +64,19 @@ class HNConfig:
     stories_per_type: int = 30
     min_messages_per_side: int = 3
 
+    # Crawler limits: request concurrency and per-run budgets
+    max_concurrency: int = 32
+    max_connections_per_host: int = 16
+    max_concurrent_stories: int = 8
+    item_budget: int = 5000
+    time_budget_seconds: float = 300.0
+
+    # Incremental recrawls: changed-items feed (URL or local JSON file;
+    # defaults to {base_url}/updates.json) and when comments count as settled
+    use_item_cache: bool = True
+    updates_url: str = ""
+    settle_after_seconds: float = 2 * 24 * 3600
+
 
 @dataclass
 class YouTubeConfig:
@@ -56,6 +88,26 @@ class YouTubeConfig:
     max_results_per_video: int = 100
     max_comments: int = 1000
     min_messages_per_side: int = 3
+    max_pair_authors: int = 12  # Most active repliers paired per top-level comment
+
+    # Concurrency: videos scraped at once, reply pages fetched at once
+    video_concurrency: int = 4
+    reply_concurrency: int = 8
+
+    # Quota planning: daily unit budget, videos skipped below this many
+    # comments, and the expected share of threads needing extra reply pages
+    daily_quota: int = 10_000
+    min_video_comments: int = 20
+    reply_fetch_ratio: float = 0.2
+
+    # Discovery: concurrent search.list calls and how long results are reused
+    search_concurrency: int = 4
+    search_cache_ttl_hours: float = 6.0
+
+    # yt-dlp fallback: extractions running at once (in worker processes)
+    # and the per-video time limit
+    ytdlp_concurrency: int = 3
+    ytdlp_timeout_seconds: float = 600.0
 
 
 @dataclass
@@ -75,6 +127,58 @@ class LLMConfig:
     argumentness_threshold: int = 30
     entertainment_pre_threshold: int = 30
 
+    # Trained approval classifier (main.py train-filter): when a model has
+    # been saved it gates the threads that clear the two thresholds above,
+    # tuned to keep this share of them that would be approved
+    use_approval_model: bool = True
+    approval_target_recall: float = 0.95
+
+    # Async enrichment: requests in flight, and per-provider rate limits
+    # as (requests/min, tokens/min)
+    max_concurrency: int = 16
+    pack_size: int = 1  # Max threads per enrichment request (1 = no packing)
+    rate_limits: dict[str, tuple[int, int]] = field(
+        default_factory=lambda: {
+            "claude": (50, 50_000),
+            "openai": (500, 30_000),
+            "kimi": (200, 128_000),
+        }
+    )
+
+    # On-disk LLM response cache (opt out with LLM_CACHE=0 or --no-cache)
+    cache_responses: bool = field(
+        default_factory=lambda: os.getenv("LLM_CACHE", "1") != "0"
+    )
+    cache_max_mb: float = 256
+    cache_max_age_days: float = 30
+
+    # Enrichment prompt size: token budget for a thread's messages, and the
+    # cap on any one message body (longer ones are cut in the middle)
+    prompt_token_budget: int = 800
+    message_token_cap: int = 150
+
+    # Provider-side prompt caching of the static system prompts. Providers
+    # only cache prefixes of a minimum length (1,024+ tokens, more for some
+    # Claude models); the usage summary counts requests under it
+    prompt_caching: bool = True
+
+
+@dataclass
+class DedupeConfig:
+    """Near-duplicate detection before LLM enrichment."""
+
+    enabled: bool = True
+    similarity_threshold: float = 0.8  # Estimated Jaccard over message shingles
+    shingle_size: int = 5  # Words per shingle
+
+    # MinHash signature length, split into LSH bands of equal rows
+    num_perm: int = 128
+    bands: int = 16
+
+    # Live chains: an already-enriched chain is re-enriched once it has grown
+    # by this many messages (or its previous last message is gone)
+    min_chain_growth: int = 4
+
 
 # Static evergreen queries — broad enough to surface fresh content each run
 YOUTUBE_SEARCH_QUERIES = [
@@ -0,0 +1,89 @@
+"""
+Process-pool executor for the CPU-bound pipeline stages.
+
+Chain detection (find_argument_chains, _reconstruct_threads) and the
+pre-filter/scoring pass are pure Python and hold the GIL, so after a big
+crawl they run one core at a time while the scrapers' event loops wait.
+The CPU stage ships comment trees and threads to a pool of worker
+processes instead; results always come back in submission order.
+
+Small jobs are not worth pickling across a process boundary, so inputs
+below `min_items` (and everything when workers <= 1) run in-process.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+# Below this many comments (or threads, for map) a job runs in-process
+DEFAULT_MIN_ITEMS = 200
+
+
+class CpuStage:
+    """Runs CPU-bound functions in worker processes, or inline when small."""
+
+    def __init__(self, workers: int = 1, min_items: int = DEFAULT_MIN_ITEMS):
+        self.workers = max(1, workers)
+        self.min_items = min_items
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 1:
+            return None
+        with self._lock:
+            if self._pool is None:
+                # Spawned, not forked: the scrapers run in threads by now
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def run(self, fn: Callable, *args, size: int = 0) -> Any:
+        """fn(*args), in a worker when the input has at least `min_items` items."""
+        pool = self._executor() if size >= self.min_items else None
+        if pool is None:
+            return fn(*args)
+        return pool.submit(fn, *args).result()
+
+    async def arun(self, fn: Callable, *args, size: int = 0) -> Any:
+        """Like run(), but awaits the worker instead of blocking the event loop."""
+        pool = self._executor() if size >= self.min_items else None
+        if pool is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+    def map(self, fn: Callable, items: Iterable) -> list:
+        """[fn(item) for item in items], in order, spread over the workers."""
+        items = list(items)
+        pool = self._executor() if len(items) >= self.min_items else None
+        if pool is None:
+            return [fn(item) for item in items]
+        chunksize = max(1, len(items) // (self.workers * 4))
+        return list(pool.map(fn, items, chunksize=chunksize))
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+_stage = CpuStage()
+
+
+def configure_cpu_stage(workers: Optional[int], min_items: int = DEFAULT_MIN_ITEMS) -> CpuStage:
+    """Set up the shared CPU stage; workers=0 means one per core."""
+    global _stage
+    _stage.shutdown()
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    _stage = CpuStage(workers or 1, min_items)
+    return _stage
+
+
+def get_cpu_stage() -> CpuStage:
+    return _stage
@@ -32,7 +32,7 @@ def insert_argument(data: dict) -> Optional[int]:
                     user_a_display_name, user_b_display_name,
                     user_a_zinger, user_b_zinger,
                     messages, entertainment_score, status,
-                    nsfw_level
+                    nsfw_level, fingerprint
                 ) VALUES (
                     %(platform)s, %(platform_source)s, %(original_url)s,
                     %(title)s, %(context_blurb)s, %(topic_drift)s,
@@ -40,7 +40,7 @@ def insert_argument(data: dict) -> Optional[int]:
                     %(user_a_display_name)s, %(user_b_display_name)s,
                     %(user_a_zinger)s, %(user_b_zinger)s,
                     %(messages)s, %(entertainment_score)s, %(status)s,
-                    %(nsfw_level)s
+                    %(nsfw_level)s, %(fingerprint)s
                 )
                 RETURNING beef_number
                 """,
@@ -49,6 +49,7 @@ def insert_argument(data: dict) -> Optional[int]:
                     "messages": json.dumps(data["messages"]),
                     "status": data.get("status", "pending_review"),
                     "nsfw_level": data.get("nsfw_level"),
+                    "fingerprint": data.get("fingerprint"),
                 },
             )
             result = cur.fetchone()
@@ -61,6 +62,104 @@ def insert_argument(data: dict) -> Optional[int]:
         conn.close()
 
 
+def update_argument(beef_number: int, data: dict) -> Optional[int]:
+    """
+    Replace the enriched content of an existing argument (e.g. after its
+    chain grew) and send it back to pending_review, since the new content
+    hasn't been reviewed. Votes and reactions are left alone; rejected
+    arguments are not touched.
+    Returns the beef_number, or None if no such unrejected argument exists.
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                """
+                UPDATE arguments SET
+                    title = %(title)s,
+                    context_blurb = %(context_blurb)s,
+                    topic_drift = %(topic_drift)s,
+                    category = %(category)s,
+                    heat_rating = %(heat_rating)s,
+                    user_a_display_name = %(user_a_display_name)s,
+                    user_b_display_name = %(user_b_display_name)s,
+                    user_a_zinger = %(user_a_zinger)s,
+                    user_b_zinger = %(user_b_zinger)s,
+                    messages = %(messages)s,
+                    entertainment_score = %(entertainment_score)s,
+                    nsfw_level = %(nsfw_level)s,
+                    fingerprint = %(fingerprint)s,
+                    status = 'pending_review',
+                    updated_at = now()
+                WHERE beef_number = %(beef_number)s AND status <> 'rejected'
+                RETURNING beef_number
+                """,
+                {
+                    **data,
+                    "messages": json.dumps(data["messages"]),
+                    "nsfw_level": data.get("nsfw_level"),
+                    "fingerprint": data.get("fingerprint"),
+                    "beef_number": beef_number,
+                },
+            )
+            result = cur.fetchone()
+            conn.commit()
+            return result["beef_number"] if result else None
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        conn.close()
+
+
+def get_fingerprints() -> set[str]:
+    """Fingerprints of every argument already in the DB."""
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT fingerprint FROM arguments WHERE fingerprint IS NOT NULL"
+            )
+            return {row[0] for row in cur.fetchall()}
+    finally:
+        conn.close()
+
+
+def get_statuses(beef_numbers: list[int]) -> dict[int, str]:
+    """Current status of each of the given arguments that still exists."""
+    if not beef_numbers:
+        return {}
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT beef_number, status FROM arguments WHERE beef_number = ANY(%s)",
+                (list(beef_numbers),),
+            )
+            return {row[0]: row[1] for row in cur.fetchall()}
+    finally:
+        conn.close()
+
+
+def get_labeled_arguments() -> list[dict]:
+    """Reviewed arguments (approved or rejected) with their messages, for
+    training the pre-LLM approval classifier."""
+    conn = get_connection()
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(
+                """
+                SELECT platform, platform_source, original_url, title,
+                       messages, status, fingerprint
+                FROM arguments
+                WHERE status IN ('approved', 'rejected')
+                """
+            )
+            return list(cur.fetchall())
+    finally:
+        conn.close()
+
+
 def get_stats() -> dict:
     """Get pipeline stats from the database."""
     conn = get_connection()
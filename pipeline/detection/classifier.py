@@ -0,0 +1,160 @@
+"""
+On-box approval classifier for the pre-LLM filter.
+
+A logistic regression over hashed word unigrams/bigrams plus the heuristic
+score features, trained on the raw threads recorded at enrichment time
+(detection/training_data.py), labelled by the post-filter and by review
+(`main.py train-filter`). At scrape time it estimates the
+probability that a thread clearing the score thresholds would end up
+approved, and threads below the threshold chosen at training time never
+reach enrichment.
+
+Pure Python with sparse weights, so it needs no extra dependencies.
+"""
+
+import json
+import math
+import os
+import random
+import re
+import zlib
+from typing import Optional
+
+from pipeline.config import STATE_DIR
+from pipeline.detection.features import ThreadFeatures, extract_features
+from pipeline.detection.scoring import score_argumentness, score_entertainment
+from pipeline.models import RawThread
+
+MODEL_PATH = os.path.join(STATE_DIR, "approval_model.json")
+
+_DIMENSIONS = 1 << 18
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def _bucket(token: str) -> int:
+    return zlib.crc32(token.encode()) % _DIMENSIONS
+
+
+def featurize(thread: RawThread, features: Optional[ThreadFeatures] = None) -> dict[int, float]:
+    """Sparse feature vector: hashed n-gram presence plus scaled score features."""
+    f = features or extract_features(thread)
+    vector: dict[int, float] = {}
+
+    # N-gram presence, L2-normalised so long threads don't saturate the logit
+    words = _WORD.findall(f.lower_text)
+    grams = set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+    weight = 1 / math.sqrt(len(grams)) if grams else 0.0
+    for gram in grams:
+        vector[_bucket(gram)] = weight
+
+    numeric = {
+        "__argumentness": score_argumentness(thread, f) / 100,
+        "__entertainment": score_entertainment(thread, f) / 100,
+        "__messages": math.log1p(f.message_count) / 5,
+        "__avg_length": math.log1p(f.avg_length) / 8,
+        "__unique_words": math.log1p(f.unique_words) / 8,
+        "__alternation": f.alternations / max(1, f.message_count - 1),
+        "__deleted": f.deleted_count / max(1, f.message_count),
+        "__platform_" + thread.platform: 1.0,
+    }
+    for name, value in numeric.items():
+        vector[_bucket(name)] = value
+
+    return vector
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1 / (1 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1 + e)
+
+
+class ApprovalModel:
+    """Sparse logistic regression: P(approved | thread)."""
+
+    def __init__(
+        self,
+        weights: Optional[dict[int, float]] = None,
+        bias: float = 0.0,
+        threshold: float = 0.5,
+    ):
+        self.weights = weights or {}
+        self.bias = bias
+        self.threshold = threshold
+
+    def predict_vector(self, vector: dict[int, float]) -> float:
+        w = self.weights
+        # fsum: exact, so the result does not depend on set/dict ordering
+        return _sigmoid(math.fsum([self.bias, *(w.get(i, 0.0) * v for i, v in vector.items())]))
+
+    def predict(self, thread: RawThread, features: Optional[ThreadFeatures] = None) -> float:
+        return self.predict_vector(featurize(thread, features))
+
+    def fit(
+        self,
+        vectors: list[dict[int, float]],
+        labels: list[int],
+        epochs: int = 10,
+        learning_rate: float = 0.1,
+        l2: float = 1e-5,
+        seed: int = 0,
+    ) -> None:
+        """Plain SGD on log loss, classes reweighted to balance."""
+        positives = sum(labels) or 1
+        negatives = (len(labels) - sum(labels)) or 1
+        class_weight = {1: len(labels) / (2 * positives), 0: len(labels) / (2 * negatives)}
+
+        order = list(range(len(vectors)))
+        rng = random.Random(seed)
+        w = self.weights
+        for epoch in range(epochs):
+            rng.shuffle(order)
+            rate = learning_rate / (1 + epoch)
+            for i in order:
+                vector, label = vectors[i], labels[i]
+                error = (self.predict_vector(vector) - label) * class_weight[label]
+                self.bias -= rate * error
+                for j, value in vector.items():
+                    weight = w.get(j, 0.0)
+                    w[j] = weight - rate * (error * value + l2 * weight)
+
+    def save(self, path: str = MODEL_PATH) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        weights = {str(k): round(v, 6) for k, v in self.weights.items() if abs(v) > 1e-6}
+        with open(path, "w") as fh:
+            json.dump({"bias": self.bias, "threshold": self.threshold, "weights": weights}, fh)
+
+    @classmethod
+    def load(cls, path: str = MODEL_PATH) -> Optional["ApprovalModel"]:
+        """The saved model, or None if none has been trained yet."""
+        if not os.path.exists(path):
+            return None
+        with open(path) as fh:
+            data = json.load(fh)
+        weights = {int(k): v for k, v in data["weights"].items()}
+        return cls(weights, data["bias"], data["threshold"])
+
+
+def threshold_at_recall(probs: list[float], labels: list[int], recall: float) -> float:
+    """Highest threshold that still keeps `recall` of the approved threads."""
+    positives = sorted((p for p, y in zip(probs, labels) if y), reverse=True)
+    if not positives:
+        return 0.0
+    keep = max(1, math.ceil(recall * len(positives)))
+    return positives[keep - 1]
+
+
+def evaluate(probs: list[float], labels: list[int], threshold: float) -> dict:
+    """What gating at `threshold` would have done on labelled threads."""
+    passed = [y for p, y in zip(probs, labels) if p >= threshold]
+    positives = sum(labels)
+    return {
+        "threads": len(labels),
+        "approved": positives,
+        "passed": len(passed),
+        "recall": sum(passed) / positives if positives else 0.0,
+        "precision": sum(passed) / len(passed) if passed else 0.0,
+        "baseline_precision": positives / len(labels) if labels else 0.0,
+        "llm_calls_saved": len(labels) - len(passed),
+    }
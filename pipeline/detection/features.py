@@ -0,0 +1,162 @@
+"""
+Per-thread features shared by the pre-filter and the scorers.
+
+extract_features() walks a thread's messages once and collects everything
+pre_filter(), score_argumentness() and score_entertainment() look at, so
+the hot path in cmd_scrape lowercases, joins and scans each body once per
+thread instead of once per consumer. New scorers should add what they need
+here rather than re-reading the messages.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from pipeline.models import RawThread
+
+# Confrontational markers
+CONFRONTATIONAL_MARKERS = [
+    r"\bactually\b",
+    r"\bwrong\b",
+    r"\byou clearly\b",
+    r"\bthat's not\b",
+    r"\byou('re| are) (wrong|mistaken|confused|ignorant)\b",
+    r"\bnonsense\b",
+    r"\bridiculous\b",
+    r"\bidiotic\b",
+    r"\bstupid\b",
+    r"\bno offense\b",
+    r"\blmao\b",
+    r"\bwhat\?\b",
+    r"\bare you serious\b",
+    r"\byou (don't|dont) (know|understand)\b",
+    r"\bimagine (thinking|believing)\b",
+]
+
+# Entertainment indicators
+ENTERTAINMENT_MARKERS = [
+    r"!{2,}",  # Multiple exclamation marks
+    r"\?{2,}",  # Multiple question marks
+    r"[A-Z]{4,}",  # CAPS shouting
+    r"\blmao\b",
+    r"\bbruh\b",
+    r"\bsir\b.*\bthis is\b",
+    r"\btouched grass\b",
+    r"\bcope\b",
+    r"\bseeth(e|ing)\b",
+    r"\bpeak\b",
+    r"\btake the L\b",
+]
+
+# Common English words used by the pre-filter's language check
+ENGLISH_MARKERS = ["the", "is", "are", "was", "have", "that", "this", "with"]
+
+
+class MarkerSet:
+    """
+    Counts how many distinct marker patterns occur in a text, in one scan.
+
+    All markers are compiled into a single alternation (those opening with a
+    word boundary share one leading \\b), and the scan resumes one character
+    past each hit so overlapping markers are still seen. Markers that could
+    also start at a hit position are tried there directly, so the count is
+    exactly what a separate re.search per marker would give.
+    """
+
+    def __init__(self, patterns: list[str], flags: int = 0):
+        self._patterns = [re.compile(p, flags) for p in patterns]
+        self._index = {f"m{i}": i for i in range(len(patterns))}
+
+        bounded = [f"(?P<m{i}>{p[2:]})" for i, p in enumerate(patterns) if p.startswith(r"\b")]
+        other = [f"(?P<m{i}>{p})" for i, p in enumerate(patterns) if not p.startswith(r"\b")]
+        branches = other + ([r"\b(?:" + "|".join(bounded) + ")"] if bounded else [])
+        self._combined = re.compile("|".join(branches), flags)
+
+    def count(self, text: str) -> int:
+        total = len(self._patterns)
+        found: set[int] = set()
+        search = self._combined.search
+        pos = 0
+
+        while len(found) < total:
+            m = search(text, pos)
+            if m is None:
+                break
+            start = m.start()
+            found.add(self._index[m.lastgroup])
+            for i, pattern in enumerate(self._patterns):
+                if i not in found and pattern.match(text, start):
+                    found.add(i)
+            pos = start + 1
+
+        return len(found)
+
+
+_CONFRONTATIONAL = MarkerSet(CONFRONTATIONAL_MARKERS, re.IGNORECASE)
+_ENTERTAINMENT = MarkerSet(ENTERTAINMENT_MARKERS)
+_CAPS = re.compile(r"[A-Z]{3,}")
+
+
+@dataclass
+class ThreadFeatures:
+    """Everything the pre-filter and scorers read from a thread's messages."""
+
+    message_count: int = 0
+    lengths: list[int] = field(default_factory=list)
+    lowered: list[str] = field(default_factory=list)
+    lower_text: str = ""  # all bodies joined with spaces, lowercased
+
+    english_hits: int = 0
+    deleted_count: int = 0
+    unique_words: int = 0
+    alternations: int = 0
+    scores: list[int] = field(default_factory=list)
+
+    confrontational_hits: int = 0  # sum over messages of distinct markers matched
+    entertainment_hits: int = 0
+    caps_messages: int = 0  # messages with a run of 3+ capitals
+    reference_messages: int = 0  # messages quoting or addressing the other side
+
+    @property
+    def avg_length(self) -> float:
+        return sum(self.lengths) / max(1, self.message_count)
+
+    @property
+    def score_range(self) -> int | None:
+        """Spread between the best and worst message score, if 2+ are known."""
+        if len(self.scores) < 2:
+            return None
+        return max(self.scores) - min(self.scores)
+
+
+def extract_features(thread: RawThread) -> ThreadFeatures:
+    """Compute a thread's features in one pass over its messages."""
+    f = ThreadFeatures(message_count=len(thread.messages))
+    words: set[str] = set()
+    previous_author = None
+
+    for i, msg in enumerate(thread.messages):
+        body = msg.body
+        lower = body.lower()
+        f.lengths.append(len(body))
+        f.lowered.append(lower)
+        words.update(lower.split())
+
+        if body in ("[deleted]", "[removed]", "") or msg.author_id == "[deleted]":
+            f.deleted_count += 1
+        if i and msg.author_id != previous_author:
+            f.alternations += 1
+        previous_author = msg.author_id
+        if msg.score is not None:
+            f.scores.append(msg.score)
+
+        f.confrontational_hits += _CONFRONTATIONAL.count(lower)
+        f.entertainment_hits += _ENTERTAINMENT.count(body)
+        if _CAPS.search(body):
+            f.caps_messages += 1
+        if ">" in body or "you said" in lower or "your" in lower or "@" in body:
+            f.reference_messages += 1
+
+    f.lower_text = " ".join(f.lowered)
+    f.english_hits = sum(1 for w in ENGLISH_MARKERS if f" {w} " in f.lower_text)
+    f.unique_words = len(words)
+    return f
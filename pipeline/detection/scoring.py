@@ -3,47 +3,22 @@ Pre-LLM scoring to filter out non-arguments and boring content.
 
 score_argumentness(): How much does this look like an argument?
 score_entertainment(): How entertaining is this argument?
+score_threads(): Both scores for a batch of threads.
 """
 
-import re
+from typing import Optional
+
+# Marker lists live with the feature extractor; re-exported here
+from pipeline.detection.features import (
+    CONFRONTATIONAL_MARKERS,
+    ENTERTAINMENT_MARKERS,
+    ThreadFeatures,
+    extract_features,
+)
 from pipeline.models import RawThread
 
-# Confrontational markers
-CONFRONTATIONAL_MARKERS = [
-    r"\bactually\b",
-    r"\bwrong\b",
-    r"\byou clearly\b",
-    r"\bthat's not\b",
-    r"\byou('re| are) (wrong|mistaken|confused|ignorant)\b",
-    r"\bnonsense\b",
-    r"\bridiculous\b",
-    r"\bidiotic\b",
-    r"\bstupid\b",
-    r"\bno offense\b",
-    r"\blmao\b",
-    r"\bwhat\?\b",
-    r"\bare you serious\b",
-    r"\byou (don't|dont) (know|understand)\b",
-    r"\bimagine (thinking|believing)\b",
-]
-
-# Entertainment indicators
-ENTERTAINMENT_MARKERS = [
-    r"!{2,}",  # Multiple exclamation marks
-    r"\?{2,}",  # Multiple question marks
-    r"[A-Z]{4,}",  # CAPS shouting
-    r"\blmao\b",
-    r"\bbruh\b",
-    r"\bsir\b.*\bthis is\b",
-    r"\btouched grass\b",
-    r"\bcope\b",
-    r"\bseeth(e|ing)\b",
-    r"\bpeak\b",
-    r"\btake the L\b",
-]
-
-
-def score_argumentness(thread: RawThread) -> int:
+
+def score_argumentness(thread: RawThread, features: Optional[ThreadFeatures] = None) -> int:
     """
     Score how much a thread looks like a genuine argument (0-100).
 
@@ -54,36 +29,23 @@ def score_argumentness(thread: RawThread) -> int:
     - Direct quoting / referencing
     """
     score = 0
-    messages = thread.messages
-
-    if len(messages) < 4:
+    if len(thread.messages) < 4:
         return 0
 
-    # 1. Confrontational markers (up to 40 points)
-    marker_count = 0
-    for msg in messages:
-        text = msg.body.lower()
-        for pattern in CONFRONTATIONAL_MARKERS:
-            if re.search(pattern, text, re.IGNORECASE):
-                marker_count += 1
+    f = features or extract_features(thread)
 
-    score += min(40, marker_count * 5)
+    # 1. Confrontational markers (up to 40 points)
+    score += min(40, f.confrontational_hits * 5)
 
     # 2. Alternation quality (up to 25 points)
     # How often do authors alternate? (sign of back-and-forth)
-    alternations = 0
-    for i in range(1, len(messages)):
-        if messages[i].author_id != messages[i - 1].author_id:
-            alternations += 1
-
-    alternation_ratio = alternations / max(1, len(messages) - 1)
+    alternation_ratio = f.alternations / max(1, f.message_count - 1)
     score += int(alternation_ratio * 25)
 
     # 3. Score disparity (up to 15 points)
     # Controversial comments (some upvoted, some downvoted) signal arguments
-    scores = [m.score for m in messages if m.score is not None]
-    if len(scores) >= 2:
-        score_range = max(scores) - min(scores)
+    score_range = f.score_range
+    if score_range is not None:
         if score_range > 20:
             score += 15
         elif score_range > 10:
@@ -93,7 +55,7 @@ def score_argumentness(thread: RawThread) -> int:
 
     # 4. Message length consistency (up to 10 points)
     # Arguments tend to have longer messages (people explaining their positions)
-    avg_length = sum(len(m.body) for m in messages) / max(1, len(messages))
+    avg_length = f.avg_length
     if avg_length > 100:
         score += 10
     elif avg_length > 50:
@@ -101,22 +63,12 @@ def score_argumentness(thread: RawThread) -> int:
 
     # 5. Direct references (up to 10 points)
     # Quoting or directly referencing the other person
-    ref_count = 0
-    for msg in messages:
-        body_lower = msg.body.lower()
-        if (
-            ">" in msg.body
-            or "you said" in body_lower
-            or "your" in body_lower
-            or "@" in msg.body
-        ):
-            ref_count += 1
-    score += min(10, ref_count * 3)
+    score += min(10, f.reference_messages * 3)
 
     return min(100, score)
 
 
-def score_entertainment(thread: RawThread) -> int:
+def score_entertainment(thread: RawThread, features: Optional[ThreadFeatures] = None) -> int:
     """
     Score how entertaining an argument is (0-100).
 
@@ -128,20 +80,14 @@ def score_entertainment(thread: RawThread) -> int:
     - Sweet spot length (6-10 messages)
     """
     score = 0
-    messages = thread.messages
+    f = features or extract_features(thread)
 
     # 1. Entertainment markers (up to 30 points)
-    marker_count = 0
-    for msg in messages:
-        for pattern in ENTERTAINMENT_MARKERS:
-            if re.search(pattern, msg.body):
-                marker_count += 1
-
-    score += min(30, marker_count * 4)
+    score += min(30, f.entertainment_hits * 4)
 
     # 2. Escalation arc (up to 25 points)
     # Messages getting longer or more heated over time
-    lengths = [len(m.body) for m in messages]
+    lengths = f.lengths
     if len(lengths) >= 4:
         first_half_avg = sum(lengths[: len(lengths) // 2]) / max(
             1, len(lengths) // 2
@@ -158,25 +104,32 @@ def score_entertainment(thread: RawThread) -> int:
 
     # 3. Length bonus (up to 15 points)
     # Longer arguments = more investment from both sides = likely more entertaining
-    msg_count = len(messages)
+    msg_count = f.message_count
     if msg_count >= 6:
         score += 15
     elif msg_count >= 4:
         score += 10
 
     # 4. Caps usage / emphasis (up to 15 points)
-    caps_count = sum(
-        1 for m in messages if re.search(r"[A-Z]{3,}", m.body)
-    )
-    score += min(15, caps_count * 4)
+    score += min(15, f.caps_messages * 4)
 
     # 5. Topic variety bonus (up to 10 points)
     # If the argument drifts topics, it's often more entertaining
-    all_text = " ".join(m.body for m in messages)
-    unique_words = len(set(all_text.lower().split()))
+    unique_words = f.unique_words
     if unique_words > 200:
         score += 10
     elif unique_words > 100:
         score += 5
 
     return min(100, score)
+
+
+def score_threads(threads: list[RawThread]) -> tuple[list[int], list[int]]:
+    """Score a batch of threads: (argumentness scores, entertainment scores)."""
+    argumentness: list[int] = []
+    entertainment: list[int] = []
+    for thread in threads:
+        features = extract_features(thread)
+        argumentness.append(score_argumentness(thread, features))
+        entertainment.append(score_entertainment(thread, features))
+    return argumentness, entertainment
@@ -0,0 +1,68 @@
+"""
+Training examples for the approval classifier, as the classifier sees them.
+
+At scrape time the classifier scores raw scraped threads, so that is what
+it has to be trained on: the arguments table only holds the LLM-cleaned,
+anonymised messages. Every enriched thread is kept here as raw JSON under
+its fingerprint. Threads the post-filter rejected are labelled right away;
+the others get their label from the review status of the stored argument
+with the same fingerprint when the model is trained.
+"""
+
+import time
+from typing import Optional
+
+from pipeline.models import RawThread
+from pipeline.state import open_state_db
+
+
+class TrainingStore:
+    """On-disk fingerprint -> (raw thread, post-filter outcome)."""
+
+    def __init__(self, db_name: str = "approval_training"):
+        self._conn = open_state_db(db_name)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS examples (
+                fingerprint TEXT PRIMARY KEY,
+                thread_json TEXT NOT NULL,
+                post_filter_passed INTEGER NOT NULL,
+                recorded_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def record(self, examples: list[tuple[str, RawThread, bool]]) -> None:
+        """Keep (fingerprint, raw thread, passed post-filter) for enriched threads."""
+        now = time.time()
+        self._conn.executemany(
+            """
+            INSERT INTO examples (fingerprint, thread_json, post_filter_passed, recorded_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(fingerprint) DO UPDATE SET
+                thread_json = excluded.thread_json,
+                post_filter_passed = excluded.post_filter_passed,
+                recorded_at = excluded.recorded_at
+            """,
+            [(fp, thread.model_dump_json(), int(passed), now) for fp, thread, passed in examples],
+        )
+        self._conn.commit()
+
+    def labeled(self, review_status: dict[str, str]) -> list[tuple[RawThread, int, str]]:
+        """(raw thread, label, outcome) for every example with a known outcome:
+        post-filter rejections, and arguments reviewed as approved/rejected
+        (`review_status` maps fingerprints to those statuses)."""
+        examples = []
+        for fingerprint, data, passed in self._conn.execute(
+            "SELECT fingerprint, thread_json, post_filter_passed FROM examples"
+        ):
+            outcome: Optional[str] = "post_filter" if not passed else review_status.get(fingerprint)
+            if outcome is None:
+                continue
+            label = 1 if outcome == "approved" else 0
+            examples.append((RawThread.model_validate_json(data), label, outcome))
+        return examples
+
+    def fingerprints(self) -> set[str]:
+        return {row[0] for row in self._conn.execute("SELECT fingerprint FROM examples")}
@@ -2,16 +2,20 @@
 ThreadBeef Content Pipeline CLI.
 
 Usage:
-  python main.py scrape reddit [--subreddits r/cooking,r/gaming] [--limit 5] [--dry-run]
-  python main.py scrape hn [--limit 5] [--dry-run]
-  python main.py scrape all [--limit 5] [--dry-run]
+  python main.py scrape reddit [--subreddits r/cooking,r/gaming] [--limit 5] [--reddit-workers 8] [--full-rescrape] [--dry-run]
+  python main.py scrape hn [--limit 5] [--full-rescrape] [--dry-run]
+  python main.py scrape youtube [--video-ids id1,id2] [--auto-discover] [--refresh-search] [--dry-run]
+  python main.py scrape all [--limit 5] [--source-timeout 3600] [--cpu-workers 0] [--process-every 100] [--no-cache] [--pack 5] [--batch-api] [--dry-run]
+  python main.py batch-resume [--poll-interval 60]
   python main.py process [--batch-size 10] [--provider claude|openai]
+  python main.py train-filter [--recall 0.95] [--epochs 10] [--min-holdout-positives 20] [--include-stored]
   python main.py stats
 """
 
 import sys
 import os
 import argparse
+from functools import partial
 from rich.console import Console
 from rich.table import Table
 from dotenv import load_dotenv
@@ -21,16 +25,27 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 load_dotenv()
 
-from pipeline.config import RedditConfig, HNConfig, YouTubeConfig, LLMConfig
+from pipeline.config import RedditConfig, HNConfig, YouTubeConfig, LLMConfig, DedupeConfig
 from pipeline.scrapers.reddit import scrape_reddit
+from pipeline.scrapers.reddit_state import PostStateStore
 from pipeline.scrapers.hackernews import scrape_hackernews
 from pipeline.scrapers.youtube import scrape_youtube
-from pipeline.detection.scoring import score_argumentness, score_entertainment
-from pipeline.processing.content_filter import pre_filter, post_filter
-from pipeline.processing.llm_client import get_llm_client
-from pipeline.processing.enrichment import batch_enrich
-from pipeline.output.inserter import insert_batch
-from pipeline.db import get_stats
+from pipeline.detection.training_data import TrainingStore
+from pipeline.processing.content_filter import (
+    load_approval_model, post_filter, screen_floor, screen_thread,
+)
+from pipeline.processing.chain_state import ChainStateStore
+from pipeline.processing.dedupe import NearDuplicateIndex, skip_known, thread_fingerprint
+from pipeline.processing.llm_client import get_llm_client, llm_client_class
+from pipeline.processing.llm_cache import ResponseCache
+from pipeline.processing.enrichment import (
+    batch_enrich, submit_enrichment_batch, collect_enrichment_batch,
+)
+from pipeline.processing.batch_api import BatchJobStore
+from pipeline.output.inserter import insert_processed, update_processed
+from pipeline.db import get_stats, get_fingerprints, get_labeled_arguments, get_statuses
+from pipeline.orchestrator import ScrapeOrchestrator
+from pipeline.cpu_stage import configure_cpu_stage
 
 console = Console()
 
@@ -39,7 +54,8 @@ def generate_trending_queries(llm_config) -> list[str]:
     """Use the LLM to generate trending YouTube search queries for finding arguments."""
     import json
     try:
-        client = get_llm_client()
+        # Never cached: the point is to get fresh topics each run
+        client = get_llm_client(use_cache=False)
         response = client.complete(
             system="You generate YouTube search queries designed to find videos with heated, entertaining comment section arguments. Return ONLY a JSON array of 5-8 search query strings. Focus on current events, trending debates, viral controversies, and polarizing topics people are arguing about right now. Make queries specific enough to find argumentative content but broad enough to return results.",
             user="Generate YouTube search queries for finding videos with entertaining comment section arguments. Focus on whatever people are likely arguing about right now — trending topics, recent controversies, viral debates. Return ONLY a JSON array of strings.",
@@ -58,6 +74,47 @@ def generate_trending_queries(llm_config) -> list[str]:
     return []
 
 
+def discover_youtube_videos(args, youtube_config, llm_config) -> list[str]:
+    """Find debate videos via the YouTube Search API (static + trending queries)."""
+    import asyncio
+    import httpx
+    from pipeline.config import YOUTUBE_SEARCH_QUERIES
+    from pipeline.scrapers.youtube import _search_debate_videos
+    from pipeline.scrapers.youtube_quota import QuotaAccountant
+    from pipeline.scrapers.youtube_search_cache import SearchCache
+
+    # Generate trending queries via LLM
+    all_queries = list(YOUTUBE_SEARCH_QUERIES)
+    if not args.no_trending:
+        trending = generate_trending_queries(llm_config)
+        if trending:
+            console.print(f"  [magenta]Generated {len(trending)} trending queries:[/magenta]")
+            for q in trending:
+                console.print(f"    [dim]• {q}[/dim]")
+            all_queries.extend(trending)
+
+    search_cache = SearchCache(
+        youtube_config.search_cache_ttl_hours * 3600,
+        refresh=args.refresh_search,
+    )
+
+    async def discover():
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            return await _search_debate_videos(
+                client,
+                youtube_config.api_key,
+                all_queries,
+                quota=QuotaAccountant(youtube_config.daily_quota),
+                cache=search_cache,
+                concurrency=youtube_config.search_concurrency,
+            )
+
+    discovered = asyncio.run(discover())
+    console.print(f"  [cyan]Auto-discovered {len(discovered)} videos from {len(all_queries)} queries[/cyan]")
+    console.print(f"  [dim]Search cache: {search_cache.summary()}[/dim]")
+    return discovered
+
+
 def cmd_scrape(args):
     """Scrape platforms for argument threads."""
     reddit_config = RedditConfig()
@@ -65,88 +122,135 @@ def cmd_scrape(args):
     youtube_config = YouTubeConfig()
     llm_config = LLMConfig()
 
-    threads = []
+    if args.pack_size:
+        llm_config.pack_size = args.pack_size
+
+    # Checked before scraping, which can take a while
+    client_class = llm_client_class()
+    if args.batch_api and not client_class.supports_batch:
+        console.print(f"[red]--batch-api: {client_class.__name__} has no batch API support[/red]")
+        return
 
+    # Chain detection and screening go to worker processes with --cpu-workers
+    cpu_stage = configure_cpu_stage(args.cpu_workers)
+    try:
+        _scrape(args, cpu_stage, reddit_config, hn_config, youtube_config, llm_config)
+    finally:
+        cpu_stage.shutdown()
+
+
+def _scrape(args, cpu_stage, reddit_config, hn_config, youtube_config, llm_config):
+    # Sources run concurrently; each hands its threads to the orchestrator's queue
+    # as it finds them, and stops when the orchestrator cancels it
+    orchestrator = ScrapeOrchestrator(timeout=args.source_timeout)
+
+    post_state = None
     if args.source in ("reddit", "all"):
         subreddits = args.subreddits.split(",") if args.subreddits else None
-        reddit_threads = scrape_reddit(
-            config=reddit_config, subreddits=subreddits, limit=args.limit
+        post_state = PostStateStore(
+            0 if args.full_rescrape else reddit_config.min_new_comments
         )
-        threads.extend(reddit_threads)
+        orchestrator.add("reddit", lambda emit, cancel: scrape_reddit(
+            config=reddit_config,
+            subreddits=subreddits,
+            limit=args.limit,
+            workers=args.reddit_workers,
+            full_rescrape=args.full_rescrape,
+            state=post_state,
+            on_thread=emit,
+            cancel=cancel,
+        ))
 
     if args.source in ("hn", "all"):
-        hn_threads = scrape_hackernews(config=hn_config, limit=args.limit)
-        threads.extend(hn_threads)
+        orchestrator.add("hn", lambda emit, cancel: scrape_hackernews(
+            config=hn_config,
+            limit=args.limit,
+            full_rescrape=args.full_rescrape,
+            on_thread=emit,
+            cancel=cancel,
+        ))
 
     if args.source in ("youtube", "all"):
-        video_ids = args.video_ids.split(",") if args.video_ids else []
-
-        # Auto-discover debate videos via Search API
-        if args.auto_discover and youtube_config.api_key:
-            from pipeline.config import YOUTUBE_SEARCH_QUERIES
-            from pipeline.scrapers.youtube import _search_debate_videos
-            import httpx
-
-            # Generate trending queries via LLM
-            all_queries = list(YOUTUBE_SEARCH_QUERIES)
-            if not args.no_trending:
-                trending = generate_trending_queries(llm_config)
-                if trending:
-                    console.print(f"  [magenta]Generated {len(trending)} trending queries:[/magenta]")
-                    for q in trending:
-                        console.print(f"    [dim]• {q}[/dim]")
-                    all_queries.extend(trending)
-
-            async def discover():
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    return await _search_debate_videos(
-                        client, youtube_config.api_key, all_queries
-                    )
-
-            import asyncio
-            discovered = asyncio.run(discover())
-            console.print(f"  [cyan]Auto-discovered {len(discovered)} videos from {len(all_queries)} queries[/cyan]")
-            video_ids.extend(discovered)
-
-        youtube_threads = scrape_youtube(
-            config=youtube_config, video_ids=video_ids, limit=args.limit
-        )
-        threads.extend(youtube_threads)
+        def youtube_source(emit, cancel):
+            video_ids = args.video_ids.split(",") if args.video_ids else []
+
+            # Auto-discover debate videos via Search API
+            if args.auto_discover and youtube_config.api_key:
+                video_ids.extend(discover_youtube_videos(args, youtube_config, llm_config))
+
+            return scrape_youtube(
+                config=youtube_config,
+                video_ids=video_ids,
+                limit=args.limit,
+                on_thread=emit,
+                cancel=cancel,
+            )
 
+        orchestrator.add("youtube", youtube_source)
+
+    # Threads are processed in batches as they arrive, while the sources keep
+    # scraping. A provider batch job is submitted once, after they finish:
+    # waiting on one mid-scrape would hold up the queue for hours.
+    batch_size = None if args.batch_api else args.process_every
+    unfinished: set[str] = set()
+    batch: list = []
+    delivered = 0
+    for thread in orchestrator.run():
+        batch.append(thread)
+        delivered += 1
+        if batch_size and len(batch) >= batch_size:
+            console.print(f"\n[bold]Processing {len(batch)} threads while scraping continues...[/bold]")
+            unfinished |= _process_threads(args, batch, cpu_stage, llm_config)
+            batch = []
+    orchestrator.print_summary()
+
+    if batch or not delivered:
+        unfinished |= _process_threads(args, batch, cpu_stage, llm_config)
+
+    # Scraped Reddit posts are skipped next run only once their threads made it
+    # through; a dry run or a failed enrichment leaves them to be scraped again.
+    # (Posts are recorded only after all their threads reached the queue, so
+    # a timed-out source's delivered posts count too.)
+    if post_state is not None and not args.dry_run:
+        saved = post_state.commit(unfinished)
+        console.print(f"  [dim]Saved scrape state for {saved} Reddit posts[/dim]")
+
+
+def _process_threads(args, threads, cpu_stage, llm_config) -> set[str]:
+    """Filter, enrich and store scraped threads. Returns the URLs of threads
+    whose enrichment failed."""
     if not threads:
         console.print("[yellow]No threads found.[/yellow]")
-        return
+        return set()
 
-    # Pre-filter
-    console.print(f"\n[bold]Pre-filtering {len(threads)} threads...[/bold]")
-    filtered = []
-    for thread in threads:
-        passed, reason = pre_filter(thread)
-        if not passed:
-            console.print(f"  [dim]Rejected: {reason}[/dim]")
-            continue
+    approval_model = load_approval_model(llm_config)
 
-        # Score argumentness and entertainment
-        arg_score = score_argumentness(thread)
-        ent_score = score_entertainment(thread)
+    # Pre-filter and score; large batches are spread over the CPU stage's workers
+    console.print(f"\n[bold]Pre-filtering {len(threads)} threads...[/bold]")
+    if approval_model is not None:
+        console.print(
+            f"  [dim]Using trained approval model (threshold {approval_model.threshold:.3f}) "
+            f"on top of the score thresholds[/dim]"
+        )
+    screenings = cpu_stage.map(partial(screen_thread, config=llm_config), threads)
 
-        if arg_score < llm_config.argumentness_threshold:
-            console.print(
-                f"  [dim]Low argumentness ({arg_score}): "
-                f"{thread.participant_a} vs {thread.participant_b}[/dim]"
-            )
+    filtered = []
+    for thread, screening in zip(threads, screenings):
+        if screening.arg_score is None:
+            console.print(f"  [dim]Rejected: {screening.reason}[/dim]")
             continue
 
-        if ent_score < llm_config.entertainment_pre_threshold:
+        if not screening.passed:
             console.print(
-                f"  [dim]Low entertainment ({ent_score}): "
+                f"  [dim]{screening.reason}: "
                 f"{thread.participant_a} vs {thread.participant_b}[/dim]"
             )
             continue
 
         filtered.append(thread)
+        approval = f"p={screening.approval:.2f}, " if screening.approval is not None else ""
         console.print(
-            f"  [green]Passed[/green] (arg={arg_score}, ent={ent_score}): "
+            f"  [green]Passed[/green] ({approval}arg={screening.arg_score}, ent={screening.ent_score}): "
             f"{thread.participant_a} vs {thread.participant_b}"
         )
 
@@ -154,41 +258,177 @@ def cmd_scrape(args):
         f"\n[bold]{len(filtered)}/{len(threads)} threads passed pre-filter[/bold]"
     )
 
+    if args.record_threads and filtered:
+        with open(args.record_threads, "a") as fh:
+            for thread in filtered:
+                fh.write(thread.model_dump_json() + "\n")
+        console.print(f"  [dim]Recorded {len(filtered)} threads to {args.record_threads}[/dim]")
+
     if args.dry_run:
         console.print("[yellow]Dry run — skipping LLM processing and DB insertion.[/yellow]")
-        return
+        return set()
 
     if not filtered:
-        return
+        return set()
+
+    # Exact duplicates of arguments already in the DB
+    known = get_fingerprints()
+    before = len(filtered)
+    filtered = skip_known(filtered, known)
+    if len(filtered) < before:
+        console.print(
+            f"  [dim]{before - len(filtered)} already-inserted threads skipped "
+            f"({len(known):,} fingerprints known)[/dim]"
+        )
+    if not filtered:
+        return set()
+
+    # Known chains: skip the unchanged, re-enrich (and later update) the grown
+    dedupe_config = DedupeConfig()
+    chain_state = ChainStateStore(dedupe_config.min_chain_growth)
+    fresh: list = []
+    grown: list = []
+    updates: dict[str, int | None] = {}  # fingerprint -> beef number to update
+    for thread in filtered:
+        check = chain_state.check(thread)
+        if check.status == "new":
+            fresh.append(thread)
+        elif check.status == "grown":
+            grown.append(thread)
+            updates[thread_fingerprint(thread)] = check.beef_number
+            console.print(
+                f"  [cyan]Chain grew by {check.grown_by}:[/cyan] "
+                f"{thread.participant_a} vs {thread.participant_b}"
+            )
+        else:
+            console.print(
+                f"  [dim]Unchanged since last enrichment: "
+                f"{thread.participant_a} vs {thread.participant_b}[/dim]"
+            )
+    console.print(f"  [dim]Chain state: {chain_state.summary()}[/dim]")
+
+    # A reviewer's rejection stands however much the chain grows: don't pay to re-enrich it
+    statuses = get_statuses([n for n in updates.values() if n is not None])
+    still_open = []
+    for thread in grown:
+        fingerprint = thread_fingerprint(thread)
+        if statuses.get(updates[fingerprint]) == "rejected":
+            del updates[fingerprint]
+        else:
+            still_open.append(thread)
+    if len(still_open) < len(grown):
+        console.print(
+            f"  [dim]{len(grown) - len(still_open)} grown chains skipped (already rejected)[/dim]"
+        )
+    grown = still_open
+
+    # Near-duplicate filter: each copy dropped here is an enrichment call saved.
+    # Grown chains skip it, since they nearly duplicate their own older version.
+    if dedupe_config.enabled and fresh:
+        console.print(f"\n[bold]Checking {len(fresh)} threads for near-duplicates...[/bold]")
+        dedupe_index = NearDuplicateIndex(dedupe_config)
+        fresh = dedupe_index.filter(fresh)
+        console.print(f"  [dim]{dedupe_index.summary()}[/dim]")
+
+    filtered = fresh + grown
+    if not filtered:
+        return set()
 
     # LLM enrichment
-    llm_client = get_llm_client()
-    enriched = batch_enrich(
-        llm_client, filtered, batch_size=llm_config.batch_size
-    )
+    llm_client = get_llm_client(use_cache=False if args.no_cache else None)
+    if args.batch_api:
+        # Provider batch job: cheaper and outside the rate limits, but slow.
+        # If this run is interrupted, `main.py batch-resume` picks the job up.
+        store = BatchJobStore()
+        job_id = submit_enrichment_batch(llm_client, filtered, store, updates, llm_config)
+        enriched, filtered, updates = collect_enrichment_batch(
+            llm_client, store, job_id, args.poll_interval
+        )
+    else:
+        enriched = batch_enrich(llm_client, filtered, llm_config)
+
+    store_enriched(enriched, filtered, updates, chain_state, llm_config)
+    done = {arg.fingerprint for arg in enriched}
+    return {t.url for t in filtered if thread_fingerprint(t) not in done}
+
+
+def store_enriched(enriched, threads, updates, chain_state, llm_config):
+    """Record enriched chains, post-filter, and insert (or update) the survivors."""
+    # Whatever the verdict, these chains needn't be enriched again until they grow
+    threads_by_fingerprint = {thread_fingerprint(t): t for t in threads}
+    for arg in enriched:
+        chain_state.record(threads_by_fingerprint[arg.fingerprint])
+
+    # Likewise their near-duplicates; grown chains were never checked against the index
+    dedupe_config = DedupeConfig()
+    if dedupe_config.enabled:
+        NearDuplicateIndex(dedupe_config).add([
+            threads_by_fingerprint[arg.fingerprint]
+            for arg in enriched
+            if arg.fingerprint not in updates
+        ])
 
     # Post-filter
     console.print(f"\n[bold]Post-filtering {len(enriched)} enriched arguments...[/bold]")
     final = []
+    examples = []
     for arg in enriched:
         passed, reason = post_filter(arg, llm_config.entertainment_threshold)
+        examples.append((arg.fingerprint, threads_by_fingerprint[arg.fingerprint], passed))
         if passed:
             final.append(arg)
             console.print(f"  [green]✓[/green] {arg.title}")
         else:
             console.print(f"  [dim]Rejected: {reason}[/dim]")
 
+    # The raw threads and their outcomes train the approval model (train-filter)
+    TrainingStore().record(examples)
+
     console.print(
         f"\n[bold]{len(final)}/{len(enriched)} arguments passed post-filter[/bold]"
     )
 
-    # Insert into DB
+    # Insert new arguments into the DB; update the ones whose chain grew
     if final:
-        beef_numbers = insert_batch(final)
+        inserted = updated = 0
+        for arg in final:
+            beef_number = updates.get(arg.fingerprint)
+            if beef_number is not None:
+                result = update_processed(beef_number, arg)
+                updated += result is not None
+            else:
+                result = insert_processed(arg)
+                inserted += result is not None
+            if result is not None:
+                chain_state.record(threads_by_fingerprint[arg.fingerprint], result)
+
         console.print(
             f"\n[bold green]Pipeline complete! "
-            f"Inserted {len(beef_numbers)} arguments as pending_review.[/bold green]"
+            f"Inserted {inserted} arguments as pending_review, "
+            f"updated {updated} grown arguments (back to pending_review).[/bold green]"
+        )
+
+
+def cmd_batch_resume(args):
+    """Collect enrichment batch jobs left waiting by an interrupted scrape."""
+    store = BatchJobStore()
+    jobs = store.open_jobs("enrich")
+    if not jobs:
+        console.print("[dim]No enrichment batch jobs waiting.[/dim]")
+        return
+
+    llm_config = LLMConfig()
+    chain_state = ChainStateStore(DedupeConfig().min_chain_growth)
+    for job_id, provider in jobs:
+        console.print(f"\n[bold]Resuming batch {job_id} ({provider})...[/bold]")
+        client = get_llm_client(provider=provider)
+        if not client.supports_batch:
+            console.print(f"  [red]{type(client).__name__} has no batch API support, skipped[/red]")
+            continue
+        enriched, threads, updates = collect_enrichment_batch(
+            client, store, job_id, args.poll_interval
         )
+        store_enriched(enriched, threads, updates, chain_state, llm_config)
 
 
 def cmd_process(args):
@@ -197,6 +437,109 @@ def cmd_process(args):
     console.print("Use 'scrape' command which includes processing inline.")
 
 
+def cmd_train_filter(args):
+    """Train the pre-LLM approval classifier on recorded raw threads."""
+    import random
+    from pipeline.detection.classifier import (
+        MODEL_PATH, ApprovalModel, featurize, threshold_at_recall, evaluate,
+    )
+    from pipeline.models import RawMessage, RawThread
+
+    rows = get_labeled_arguments()
+    store = TrainingStore()
+    examples = store.labeled({r["fingerprint"]: r["status"] for r in rows if r["fingerprint"]})
+    threads = [thread for thread, _, _ in examples]
+    labels = [label for _, label, _ in examples]
+    outcomes = [outcome for _, _, outcome in examples]
+
+    # Arguments enriched before raw threads were recorded only exist as
+    # LLM-cleaned messages, which the model never sees at scrape time
+    if args.include_stored:
+        recorded = store.fingerprints()
+        for row in rows:
+            if row["fingerprint"] in recorded:
+                continue
+            messages = [
+                RawMessage(author_id=m["author"], body=m["body"], score=m.get("score"))
+                for m in row["messages"]
+            ]
+            if not messages:
+                continue
+            threads.append(RawThread(
+                platform=row["platform"],
+                source=row["platform_source"],
+                url=row["original_url"],
+                title=row["title"],
+                messages=messages,
+                participant_a="a",
+                participant_b="b",
+            ))
+            labels.append(1 if row["status"] == "approved" else 0)
+            outcomes.append(row["status"] + " (stored)")
+
+    # The model only screens threads that clear the score thresholds, so it
+    # is trained, and its threshold picked, on those alone
+    llm_config = LLMConfig()
+    floor = [screen_floor(t, llm_config).passed for t in threads]
+    if not all(floor):
+        console.print(f"[dim]{floor.count(False)} threads below the score thresholds left out[/dim]")
+        threads, labels, outcomes = (
+            [x for x, keep in zip(column, floor) if keep] for column in (threads, labels, outcomes)
+        )
+
+    approved = sum(labels)
+    counts = ", ".join(f"{outcomes.count(o)} {o}" for o in sorted(set(outcomes)))
+    console.print(f"[bold]{len(labels)} labelled threads[/bold] ({counts or 'none'})")
+    if approved < 10 or len(labels) - approved < 10:
+        console.print("[yellow]Need at least 10 approved and 10 rejected threads to train.[/yellow]")
+        return
+
+    vectors = [featurize(t) for t in threads]
+
+    # Offline evaluation on a held-out split
+    order = list(range(len(labels)))
+    random.Random(0).shuffle(order)
+    cut = int(len(order) * (1 - args.holdout))
+    train, test = order[:cut], order[cut:]
+
+    test_labels = [labels[i] for i in test]
+    if sum(test_labels) < args.min_holdout_positives:
+        console.print(
+            f"[yellow]Only {sum(test_labels)} approved threads held out; need at least "
+            f"{args.min_holdout_positives} to pick a threshold for {args.recall:.0%} recall. "
+            f"No model saved.[/yellow]"
+        )
+        return
+
+    model = ApprovalModel()
+    model.fit([vectors[i] for i in train], [labels[i] for i in train], epochs=args.epochs)
+    probs = [model.predict_vector(vectors[i]) for i in test]
+    threshold = threshold_at_recall(probs, test_labels, args.recall)
+    report = evaluate(probs, test_labels, threshold)
+
+    table = Table(title=f"Held-out evaluation (target recall {args.recall:.0%})")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green", justify="right")
+    table.add_row("Held-out threads", str(report["threads"]))
+    table.add_row("Approved", str(report["approved"]))
+    table.add_row("Threshold", f"{threshold:.3f}")
+    table.add_row("Passed to LLM", str(report["passed"]))
+    table.add_row("Recall", f"{report['recall']:.1%}")
+    table.add_row("Precision (baseline)", f"{report['precision']:.1%} ({report['baseline_precision']:.1%})")
+    saved = report["llm_calls_saved"]
+    table.add_row(
+        "LLM calls saved",
+        f"{saved} enrich + {saved} review ({saved / max(1, report['threads']):.0%} of threads)",
+    )
+    console.print(table)
+
+    # Final model on all data, gated at the held-out threshold
+    model = ApprovalModel(threshold=threshold)
+    model.fit(vectors, labels, epochs=args.epochs)
+    model.save()
+    console.print(f"[green]Saved approval model to {MODEL_PATH}[/green]")
+
+
 def cmd_stats(args):
     """Show pipeline statistics."""
     stats = get_stats()
@@ -217,6 +560,16 @@ def cmd_stats(args):
         for category, count in stats["approved_by_category"].items():
             table.add_row(f"  {category}", str(count))
 
+    cache = ResponseCache().stats()
+    lookups = cache["hits"] + cache["misses"]
+    table.add_row("", "")
+    table.add_row("[bold]LLM Response Cache[/bold]", "")
+    table.add_row("  entries", f"{cache['entries']:,} ({cache['bytes'] / 1e6:.1f} MB)")
+    table.add_row("  hits", f"{cache['hits']:,} ({cache['hits'] / max(1, lookups):.0%})")
+    table.add_row("  misses", f"{cache['misses']:,}")
+    table.add_row("  coalesced in flight", f"{cache['coalesced']:,}")
+    table.add_row("  tokens saved", f"{cache['saved_tokens']:,}")
+
     console.print(table)
 
 
@@ -239,6 +592,18 @@ def main():
         type=str,
         help="Comma-separated subreddit names (Reddit only)",
     )
+    scrape_parser.add_argument(
+        "--reddit-workers",
+        type=int,
+        dest="reddit_workers",
+        help="Scrape subreddits and posts concurrently on N workers (Reddit only)",
+    )
+    scrape_parser.add_argument(
+        "--full-rescrape",
+        action="store_true",
+        dest="full_rescrape",
+        help="Ignore incremental state: re-scrape every Reddit post and refetch every HN item",
+    )
     scrape_parser.add_argument(
         "--video-ids",
         type=str,
@@ -253,6 +618,64 @@ def main():
         action="store_true",
         help="Use YouTube Search API to find debate videos automatically",
     )
+    scrape_parser.add_argument(
+        "--refresh-search",
+        action="store_true",
+        dest="refresh_search",
+        help="Bypass the YouTube search cache and re-run every discovery query",
+    )
+    scrape_parser.add_argument(
+        "--source-timeout",
+        type=float,
+        default=3600.0,
+        dest="source_timeout",
+        help="Give up on a source that hasn't finished after this many seconds (default: 3600)",
+    )
+    scrape_parser.add_argument(
+        "--cpu-workers",
+        type=int,
+        dest="cpu_workers",
+        help="Run chain detection and scoring on N worker processes (0 = one per core)",
+    )
+    scrape_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        dest="no_cache",
+        help="Bypass the on-disk LLM response cache (same as LLM_CACHE=0)",
+    )
+    scrape_parser.add_argument(
+        "--process-every",
+        type=int,
+        default=100,
+        dest="process_every",
+        help="Filter, enrich and store threads in batches of N as sources deliver "
+        "them (default: 100; with --batch-api, everything goes in one job at the end)",
+    )
+    scrape_parser.add_argument(
+        "--pack",
+        type=int,
+        dest="pack_size",
+        help="Enrich up to N threads per LLM request, sized to fit max_tokens",
+    )
+    scrape_parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        dest="batch_api",
+        help="Enrich through the provider's batch API (cheaper, can take hours)",
+    )
+    scrape_parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=60.0,
+        dest="poll_interval",
+        help="Seconds between batch job status checks (default: 60)",
+    )
+    scrape_parser.add_argument(
+        "--record-threads",
+        dest="record_threads",
+        help="Append threads that pass the pre-filter to this JSON-lines file "
+        "(input for `benchmark.py prompts --threads-file`)",
+    )
     scrape_parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -273,6 +696,43 @@ def main():
     process_parser.add_argument("--provider", choices=["claude", "openai"])
     process_parser.set_defaults(func=cmd_process)
 
+    # train-filter
+    train_parser = subparsers.add_parser(
+        "train-filter", help="Train the pre-LLM approval classifier from reviewed arguments"
+    )
+    train_parser.add_argument(
+        "--recall",
+        type=float,
+        default=LLMConfig().approval_target_recall,
+        help="Share of approvable threads the filter must keep (default: %(default)s)",
+    )
+    train_parser.add_argument("--epochs", type=int, default=10)
+    train_parser.add_argument(
+        "--holdout", type=float, default=0.2, help="Share of data held out for evaluation"
+    )
+    train_parser.add_argument(
+        "--min-holdout-positives",
+        type=int,
+        default=20,
+        dest="min_holdout_positives",
+        help="Approved threads the holdout needs before a threshold is set (default: %(default)s)",
+    )
+    train_parser.add_argument(
+        "--include-stored",
+        action="store_true",
+        dest="include_stored",
+        help="Also train on reviewed arguments with no recorded raw thread "
+        "(LLM-cleaned messages, so they differ from what is scored at scrape time)",
+    )
+    train_parser.set_defaults(func=cmd_train_filter)
+
+    # batch-resume
+    resume_parser = subparsers.add_parser(
+        "batch-resume", help="Finish enrichment batch jobs from an interrupted scrape"
+    )
+    resume_parser.add_argument("--poll-interval", type=float, default=60.0, dest="poll_interval")
+    resume_parser.set_defaults(func=cmd_batch_resume)
+
     # stats
     stats_parser = subparsers.add_parser("stats", help="Show pipeline statistics")
     stats_parser.set_defaults(func=cmd_stats)
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 class RawMessage(BaseModel):
     """A single message from a thread, before processing."""
 
+    message_id: Optional[str] = None  # Platform comment id, when known
     author_id: str
     body: str
     timestamp: Optional[str] = None
@@ -56,3 +57,4 @@ class ProcessedArgument(BaseModel):
     entertainment_score: Optional[float] = Field(default=None, ge=1.0, le=10.0)
     nsfw_level: Optional[str] = None  # "mild" | "spicy" | "nuclear"
     status: str = "pending_review"
+    fingerprint: Optional[str] = None  # Source thread fingerprint, for dedupe
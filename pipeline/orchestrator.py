@@ -0,0 +1,193 @@
+"""
+Concurrent scrape orchestration across platforms.
+
+Each source scraper (Reddit, HN, YouTube) is I/O-bound against its own
+hosts, so they run side by side in background threads and hand their
+RawThreads to one shared queue as soon as each is found. Failures, wall
+time and running thread counts are tracked per source; a source that
+errors or stalls past the timeout is reported and cancelled without
+holding up the others, and the threads it delivered so far are kept.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from pipeline.models import RawThread
+
+console = Console()
+
+_DONE = object()
+
+# A source gets emit(thread) and a cancel event; its return value is ignored
+Source = Callable[[Callable[[RawThread], None], threading.Event], object]
+
+
+class SourceCancelled(BaseException):
+    """Raised by emit() once the orchestrator has stopped waiting for a source.
+    A BaseException, like asyncio.CancelledError, so the scrapers' per-item
+    `except Exception` handlers don't swallow it."""
+
+
+@dataclass
+class SourceReport:
+    """Outcome of one source scraper."""
+
+    name: str
+    status: str = "running"  # "running" | "ok" | "failed" | "timed out"
+    threads: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class ScrapeOrchestrator:
+    """Runs source scrapers concurrently and funnels their threads into a queue."""
+
+    def __init__(self, timeout: Optional[float] = None, progress_seconds: float = 30.0):
+        self.timeout = timeout
+        self.progress_seconds = progress_seconds
+        self.reports: dict[str, SourceReport] = {}
+        self._jobs: dict[str, Source] = {}
+        self._queue: queue.Queue = queue.Queue()
+        self._cancel = threading.Event()
+        # Held around every put and around cancelling, so nothing is queued
+        # after run() has drained the queue for the last time
+        self._lock = threading.Lock()
+
+    def add(self, name: str, scrape: Source) -> None:
+        """Register a source. `scrape(emit, cancel)` passes each thread to
+        emit() as it is found and should return soon after `cancel` is set
+        (emit() raises SourceCancelled by then)."""
+        self._jobs[name] = scrape
+        self.reports[name] = SourceReport(name)
+
+    def _run_job(self, name: str, scrape: Source) -> None:
+        report = self.reports[name]
+        start = time.perf_counter()
+
+        def emit(thread: RawThread) -> None:
+            with self._lock:
+                if self._cancel.is_set():
+                    raise SourceCancelled(name)
+                self._queue.put((name, thread))
+                report.threads += 1
+
+        try:
+            scrape(emit, self._cancel)
+            if not self._cancel.is_set():
+                report.status = "ok"
+        except SourceCancelled:
+            pass
+        except Exception as e:
+            if not self._cancel.is_set():
+                report.status = "failed"
+                report.error = str(e)
+        finally:
+            if not self._cancel.is_set():
+                report.seconds = time.perf_counter() - start
+            with self._lock:
+                self._queue.put((name, _DONE))
+
+    def _finished(self, name: str) -> None:
+        report = self.reports[name]
+        if report.status == "ok":
+            console.print(
+                f"[bold green]✓ {name}[/bold green] finished: "
+                f"{report.threads} threads in {report.seconds:.1f}s"
+            )
+        else:
+            console.print(
+                f"[bold red]✗ {name}[/bold red] failed after "
+                f"{report.seconds:.1f}s: {report.error}"
+            )
+
+    def _print_progress(self, pending: set[str], elapsed: float) -> None:
+        counts = ", ".join(f"{name} {self.reports[name].threads}" for name in sorted(pending))
+        console.print(f"[dim]… {elapsed:.0f}s, threads so far from running sources: {counts}[/dim]")
+
+    def run(self) -> Iterator[RawThread]:
+        """Start every source and yield threads as sources deliver them."""
+        start = time.monotonic()
+        for name, scrape in self._jobs.items():
+            # Daemon threads, so a source stuck in a request can't keep the process alive
+            threading.Thread(
+                target=self._run_job, args=(name, scrape), name=f"scrape-{name}", daemon=True
+            ).start()
+
+        pending = set(self._jobs)
+        last_progress = start
+        while pending:
+            wait = None
+            if self.timeout is not None:
+                wait = self.timeout - (time.monotonic() - start)
+                if wait <= 0:
+                    break
+            wait = min(wait, self.progress_seconds) if wait is not None else self.progress_seconds
+            try:
+                name, item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+
+            now = time.monotonic()
+            if now - last_progress >= self.progress_seconds:
+                self._print_progress(pending, now - start)
+                last_progress = now
+            if item is None:
+                continue
+            if item is _DONE:
+                pending.discard(name)
+                self._finished(name)
+                continue
+            yield item
+
+        if not pending:
+            return
+
+        # Timed out: stop the stragglers, then keep what they had already queued
+        with self._lock:
+            self._cancel.set()
+        while True:
+            try:
+                name, item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                if self.reports[name].status != "running":
+                    pending.discard(name)
+                    self._finished(name)
+                continue
+            yield item
+        for name in pending:
+            report = self.reports[name]
+            report.status = "timed out"
+            report.seconds = time.monotonic() - start
+            console.print(
+                f"[bold red]✗ {name}[/bold red] timed out after {report.seconds:.0f}s "
+                f"with {report.threads} threads, cancelled and continuing without it"
+            )
+
+    def print_summary(self) -> None:
+        table = Table(title="Scrape Summary")
+        table.add_column("Source", style="cyan")
+        table.add_column("Status")
+        table.add_column("Threads", justify="right")
+        table.add_column("Wall time", justify="right")
+        table.add_column("Error", style="dim")
+
+        styles = {"ok": "green", "failed": "red", "timed out": "red"}
+        for report in self.reports.values():
+            style = styles.get(report.status, "yellow")
+            table.add_row(
+                report.name,
+                f"[{style}]{report.status}[/{style}]",
+                str(report.threads),
+                f"{report.seconds:.1f}s",
+                report.error or "",
+            )
+
+        console.print(table)
@@ -31,4 +31,5 @@ def format_for_db(argument: ProcessedArgument) -> dict:
         "entertainment_score": argument.entertainment_score,
         "nsfw_level": argument.nsfw_level,
         "status": argument.status,
+        "fingerprint": argument.fingerprint,
     }
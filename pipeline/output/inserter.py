@@ -3,7 +3,7 @@
 from rich.console import Console
 from pipeline.models import ProcessedArgument
 from pipeline.output.formatter import format_for_db
-from pipeline.db import insert_argument
+from pipeline.db import insert_argument, update_argument
 
 console = Console()
 
@@ -26,6 +26,26 @@ def insert_processed(argument: ProcessedArgument) -> int | None:
         return None
 
 
+def update_processed(beef_number: int, argument: ProcessedArgument) -> int | None:
+    """
+    Overwrite an existing argument with a re-enriched version, which puts it
+    back in pending_review. Returns the beef_number, or None on failure.
+    """
+    data = format_for_db(argument)
+    try:
+        updated = update_argument(beef_number, data)
+        if updated:
+            console.print(
+                f"  [green]Updated beef #{updated}:[/green] {argument.title}"
+            )
+        else:
+            console.print(f"  [yellow]Beef #{beef_number} no longer exists or was rejected[/yellow]")
+        return updated
+    except Exception as e:
+        console.print(f"  [red]Update error: {e}[/red]")
+        return None
+
+
 def insert_batch(arguments: list[ProcessedArgument]) -> list[int]:
     """
     Insert a batch of processed arguments.
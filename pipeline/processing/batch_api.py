@@ -0,0 +1,137 @@
+"""
+Provider batch jobs for bulk LLM work (overnight backfills, big review runs).
+
+Anthropic Message Batches and the OpenAI Batch API take thousands of
+requests at once, finish them within hours at reduced cost, and don't count
+against the interactive rate limits. A submitted job's id and, per request,
+whatever is needed to map its result back (the thread, the argument row)
+are kept in a local store, so a run that is interrupted while waiting can
+be resumed later (`main.py batch-resume`, `auto_review.py --batch-api`).
+
+Only BatchClient subclasses can run jobs; callers check the client's
+supports_batch before starting. The SDKs honour ANTHROPIC_BASE_URL /
+OPENAI_BASE_URL (and KimiClient MOONSHOT_BASE_URL), so jobs can be pointed
+at a local stand-in server; `benchmark.py batch` runs a job end to end
+against an in-process stand-in client.
+"""
+
+import time
+from typing import Optional
+
+from rich.console import Console
+
+from pipeline.processing.llm_client import BatchClient, LLMResponse
+from pipeline.state import open_state_db
+
+console = Console()
+
+
+class BatchJobStore:
+    """Submitted batch jobs and their per-request payloads."""
+
+    def __init__(self, db_name: str = "batch_jobs"):
+        self._conn = open_state_db(db_name)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                status TEXT NOT NULL,
+                submitted_at REAL NOT NULL,
+                closed_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS requests (
+                job_id TEXT NOT NULL,
+                custom_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (job_id, custom_id)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def add(self, job_id: str, kind: str, provider: str, payloads: dict[str, str]) -> None:
+        self._conn.execute(
+            "INSERT INTO jobs (job_id, kind, provider, status, submitted_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, kind, provider, "submitted", time.time()),
+        )
+        self._conn.executemany(
+            "INSERT INTO requests (job_id, custom_id, payload) VALUES (?, ?, ?)",
+            [(job_id, custom_id, payload) for custom_id, payload in payloads.items()],
+        )
+        self._conn.commit()
+
+    def open_jobs(self, kind: str) -> list[tuple[str, str]]:
+        """(job_id, provider) of jobs of this kind whose results weren't collected."""
+        return self._conn.execute(
+            "SELECT job_id, provider FROM jobs WHERE kind = ? AND status = 'submitted' "
+            "ORDER BY submitted_at",
+            (kind,),
+        ).fetchall()
+
+    def payloads(self, job_id: str) -> dict[str, str]:
+        return dict(
+            self._conn.execute(
+                "SELECT custom_id, payload FROM requests WHERE job_id = ?", (job_id,)
+            )
+        )
+
+    def close(self, job_id: str, status: str = "collected") -> None:
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, closed_at = ? WHERE job_id = ?",
+            (status, time.time(), job_id),
+        )
+        self._conn.commit()
+
+
+def submit(
+    client: BatchClient,
+    store: BatchJobStore,
+    kind: str,
+    requests: dict[str, tuple[str, str, str]],
+) -> str:
+    """Submit custom_id -> (system, user, payload) as one job; returns its id."""
+    job_id = client.submit_batch(
+        {custom_id: (system, user) for custom_id, (system, user, _) in requests.items()}
+    )
+    store.add(
+        job_id,
+        kind,
+        client.provider,
+        {custom_id: payload for custom_id, (_, _, payload) in requests.items()},
+    )
+    console.print(
+        f"  [dim]Submitted {kind} batch {job_id} ({len(requests)} requests, "
+        f"{client.provider})[/dim]"
+    )
+    return job_id
+
+
+def wait(
+    client: BatchClient, job_id: str, poll_interval: float = 60.0
+) -> dict[str, Optional[LLMResponse]]:
+    """Poll until the job is finished and return its results by custom id
+    (empty if the provider failed the whole job)."""
+    started = time.monotonic()
+    while True:
+        state = client.batch_state(job_id)
+        if state == "failed":
+            console.print(f"  [red]Batch {job_id} failed[/red]")
+            return {}
+        if state == "done":
+            break
+        console.print(
+            f"  [dim]Batch {job_id} still running "
+            f"({time.monotonic() - started:.0f}s), checking again in {poll_interval:.0f}s...[/dim]"
+        )
+        time.sleep(poll_interval)
+
+    results = client.batch_results(job_id)
+    succeeded = 0
+    for response in results.values():
+        if response is not None:
+            client.usage.add(response)
+            succeeded += 1
+    console.print(f"  [dim]Batch {job_id} done: {succeeded}/{len(results)} succeeded[/dim]")
+    return results
@@ -0,0 +1,115 @@
+"""
+Persistent state of enriched argument chains, for live threads.
+
+Arguments on hot posts are often still going when we first see them. Each
+enriched chain is remembered by (post URL, participant pair) with its
+message count, last message id and the beef number it was stored as, so
+later scrapes can tell whether a chain actually changed: unchanged chains
+are skipped, and chains that grew are re-enriched and update the stored
+argument instead of inserting a duplicate.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from pipeline.models import RawThread
+from pipeline.state import open_state_db
+
+
+def chain_key(thread: RawThread) -> tuple[str, str, str]:
+    a, b = sorted((thread.participant_a, thread.participant_b))
+    return (thread.url or thread.source, a, b)
+
+
+@dataclass
+class ChainCheck:
+    """How a scraped chain compares to the last enriched version of it."""
+
+    status: str  # "new" | "grown" | "unchanged"
+    beef_number: Optional[int] = None  # Stored argument to update, if any
+    grown_by: int = 0
+
+
+class ChainStateStore:
+    """On-disk (url, participant pair) -> (count, last message id, beef number)."""
+
+    def __init__(self, min_growth: int = 4, db_name: str = "chain_state"):
+        self.min_growth = min_growth
+        self._conn = open_state_db(db_name)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chains (
+                url TEXT NOT NULL,
+                participant_a TEXT NOT NULL,
+                participant_b TEXT NOT NULL,
+                message_count INTEGER NOT NULL,
+                last_message_id TEXT,
+                beef_number INTEGER,
+                enriched_at REAL NOT NULL,
+                PRIMARY KEY (url, participant_a, participant_b)
+            )
+            """
+        )
+        self._conn.commit()
+
+        self.new = 0
+        self.grown = 0
+        self.unchanged = 0
+
+    def check(self, thread: RawThread) -> ChainCheck:
+        """
+        Compare a chain against its stored state.
+
+        A known chain counts as grown when it gained at least `min_growth`
+        messages, or when the message it previously ended on is no longer
+        part of it (deleted, or the chain took another branch). Only message
+        ids are compared, so edits to a message's body go unnoticed.
+        """
+        row = self._conn.execute(
+            """
+            SELECT message_count, last_message_id, beef_number FROM chains
+            WHERE url = ? AND participant_a = ? AND participant_b = ?
+            """,
+            chain_key(thread),
+        ).fetchone()
+
+        if row is None:
+            self.new += 1
+            return ChainCheck("new")
+
+        count, last_id, beef_number = row
+        grown_by = len(thread.messages) - count
+        ids = {m.message_id for m in thread.messages}
+        if grown_by >= self.min_growth or (last_id is not None and last_id not in ids):
+            self.grown += 1
+            return ChainCheck("grown", beef_number, grown_by)
+
+        self.unchanged += 1
+        return ChainCheck("unchanged", beef_number, grown_by)
+
+    def record(self, thread: RawThread, beef_number: Optional[int] = None) -> None:
+        """Remember the chain as enriched now (keeping its beef number if
+        `beef_number` is None)."""
+        last_id = thread.messages[-1].message_id if thread.messages else None
+        self._conn.execute(
+            """
+            INSERT INTO chains (
+                url, participant_a, participant_b,
+                message_count, last_message_id, beef_number, enriched_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url, participant_a, participant_b) DO UPDATE SET
+                message_count = excluded.message_count,
+                last_message_id = excluded.last_message_id,
+                beef_number = COALESCE(excluded.beef_number, chains.beef_number),
+                enriched_at = excluded.enriched_at
+            """,
+            (*chain_key(thread), len(thread.messages), last_id, beef_number, time.time()),
+        )
+        self._conn.commit()
+
+    def summary(self) -> str:
+        return (
+            f"{self.new} new, {self.grown} grown (re-enriching), "
+            f"{self.unchanged} unchanged (skipped)"
+        )
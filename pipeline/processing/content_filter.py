@@ -5,11 +5,17 @@ No content censorship — slurs and edgy content are tagged with NSFW intensity
 levels (mild/spicy/nuclear) instead of rejected. Only structural quality checks.
 """
 
-import re
+from dataclasses import dataclass
+from typing import Optional
+
+from pipeline.config import LLMConfig
+from pipeline.detection.classifier import ApprovalModel
+from pipeline.detection.features import ThreadFeatures, extract_features
+from pipeline.detection.scoring import score_argumentness, score_entertainment
 from pipeline.models import RawThread, ProcessedArgument
 
 
-def pre_filter(thread: RawThread) -> tuple[bool, str]:
+def pre_filter(thread: RawThread, features: Optional[ThreadFeatures] = None) -> tuple[bool, str]:
     """
     Pre-filter before LLM processing.
     Only structural quality checks — no content censorship.
@@ -23,32 +29,97 @@ def pre_filter(thread: RawThread) -> tuple[bool, str]:
 
     # No upper message cap — arguments run as long as they naturally go
 
+    f = features or extract_features(thread)
+
     # Min average length 20 chars
-    avg_length = sum(len(m.body) for m in messages) / max(1, len(messages))
+    avg_length = f.avg_length
     if avg_length < 20:
         return False, f"Messages too short (avg {avg_length:.0f} chars)"
 
     # Basic English check — look for common English words
-    all_text = " ".join(m.body for m in messages)
-    english_markers = ["the", "is", "are", "was", "have", "that", "this", "with"]
-    lower_text = all_text.lower()
-    english_hits = sum(1 for w in english_markers if f" {w} " in lower_text)
-    if english_hits < 2:
+    if f.english_hits < 2:
         return False, "Likely not English"
 
     # Check for deleted content
-    deleted_count = sum(
-        1
-        for m in messages
-        if m.body in ("[deleted]", "[removed]", "")
-        or m.author_id == "[deleted]"
-    )
+    deleted_count = f.deleted_count
     if deleted_count > len(messages) * 0.3:
         return False, f"Too many deleted messages ({deleted_count})"
 
     return True, "ok"
 
 
+@dataclass
+class Screening:
+    """Outcome of screening one scraped thread before enrichment."""
+
+    passed: bool
+    reason: str
+    arg_score: Optional[int] = None  # None when the pre-filter rejected it
+    ent_score: Optional[int] = None
+    approval: Optional[float] = None  # Approval model probability, if one is used
+
+
+# Loaded once per process: screen_thread() also runs in CPU-stage workers
+_approval_model: Optional[ApprovalModel] = None
+_approval_model_loaded = False
+
+
+def load_approval_model(config: LLMConfig) -> Optional[ApprovalModel]:
+    """The trained approval model if enabled and present (cached per process)."""
+    global _approval_model, _approval_model_loaded
+    if not config.use_approval_model:
+        return None
+    if not _approval_model_loaded:
+        _approval_model = ApprovalModel.load()
+        _approval_model_loaded = True
+    return _approval_model
+
+
+def screen_floor(
+    thread: RawThread, config: LLMConfig, features: Optional[ThreadFeatures] = None
+) -> Screening:
+    """Pre-filter and score a thread, and gate it on the hand-tuned score
+    thresholds: the floor every thread must clear, model or not."""
+    # One pass over the messages feeds the pre-filter and both scorers
+    features = features or extract_features(thread)
+
+    passed, reason = pre_filter(thread, features)
+    if not passed:
+        return Screening(False, reason)
+
+    arg_score = score_argumentness(thread, features)
+    ent_score = score_entertainment(thread, features)
+
+    if arg_score < config.argumentness_threshold:
+        return Screening(False, f"Low argumentness ({arg_score})", arg_score, ent_score)
+
+    if ent_score < config.entertainment_pre_threshold:
+        return Screening(False, f"Low entertainment ({ent_score})", arg_score, ent_score)
+
+    return Screening(True, "ok", arg_score, ent_score)
+
+
+def screen_thread(thread: RawThread, config: LLMConfig) -> Screening:
+    """
+    Screen a thread on the score thresholds, then, if an approval model
+    has been trained, also on the model's probability. The model only ever
+    sees (and is trained on) threads that clear the thresholds, so it can
+    tighten the filter but never let through what the thresholds reject.
+    """
+    features = extract_features(thread)
+    screening = screen_floor(thread, config, features)
+    if not screening.passed:
+        return screening
+
+    model = load_approval_model(config)
+    if model is not None:
+        screening.approval = model.predict(thread, features)
+        if screening.approval < model.threshold:
+            screening.passed = False
+            screening.reason = f"Unlikely to be approved (p={screening.approval:.2f})"
+    return screening
+
+
 def post_filter(
     argument: ProcessedArgument,
     entertainment_threshold: float = 5.5,
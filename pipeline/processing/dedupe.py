@@ -0,0 +1,231 @@
+"""
+Duplicate detection before LLM enrichment.
+
+The same fight often shows up more than once: in hot and top for the same
+post, as overlapping chains, reposted across subreddits, or simply on the
+next run over the same posts. Each copy would cost an enrichment call.
+
+Exact repeats are caught by thread_fingerprint() (platform, URL, participant
+pair, first and last message), which is stored with every inserted argument.
+Near-duplicates are caught by MinHash signatures over word shingles of the
+messages, with the signature's bands of enriched threads indexed on disk so
+later runs see earlier threads too; a thread whose estimated Jaccard similarity to an
+indexed one meets the threshold is dropped.
+"""
+
+import hashlib
+import random
+import re
+import struct
+import time
+from typing import Optional
+
+from rich.console import Console
+
+from pipeline.config import DedupeConfig
+from pipeline.models import RawThread
+from pipeline.state import open_state_db
+
+console = Console()
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD = re.compile(r"\w+")
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def thread_fingerprint(thread: RawThread) -> str:
+    """Stable content fingerprint: platform, URL, sorted participant pair,
+    and hashes of the first and last messages."""
+    a, b = sorted((thread.participant_a, thread.participant_b))
+    first = thread.messages[0].body.strip() if thread.messages else ""
+    last = thread.messages[-1].body.strip() if thread.messages else ""
+    parts = [thread.platform, thread.url or "", a, b, _digest(first), _digest(last)]
+    return _digest("\x1f".join(parts))
+
+
+def skip_known(threads: list[RawThread], known: set[str]) -> list[RawThread]:
+    """Drop threads whose fingerprint is in `known` (adding the survivors,
+    so repeats within the batch are dropped too)."""
+    kept: list[RawThread] = []
+    for thread in threads:
+        fingerprint = thread_fingerprint(thread)
+        if fingerprint in known:
+            console.print(
+                f"  [dim]Known thread (fingerprint match): "
+                f"{thread.participant_a} vs {thread.participant_b}[/dim]"
+            )
+            continue
+        known.add(fingerprint)
+        kept.append(thread)
+    return kept
+
+
+def thread_shingles(thread: RawThread, size: int = 5) -> set[int]:
+    """Hashed word shingles over all message bodies, case-insensitive."""
+    words = _WORD.findall(" ".join(m.body for m in thread.messages).lower())
+    if len(words) <= size:
+        return {_hash64(" ".join(words).encode())}
+    return {
+        _hash64(" ".join(words[i : i + size]).encode())
+        for i in range(len(words) - size + 1)
+    }
+
+
+class MinHasher:
+    """Fixed family of `num_perm` hash permutations (seeded, so stable across runs)."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, shingles: set[int]) -> tuple[int, ...]:
+        if not shingles:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(
+            min(((a * x + b) % _PRIME) & _MAX_HASH for x in shingles)
+            for a, b in self._params
+        )
+
+
+def estimate_similarity(sig_a: tuple[int, ...], sig_b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity: share of matching signature slots."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def _label(thread: RawThread) -> str:
+    a, b = sorted((thread.participant_a, thread.participant_b))
+    return f"{thread.platform} {thread.url or thread.source} {a} vs {b}"
+
+
+class NearDuplicateIndex:
+    """Persistent LSH index of MinHash signatures for previously seen threads."""
+
+    def __init__(self, config: DedupeConfig, db_name: str = "near_duplicates"):
+        if config.num_perm % config.bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.config = config
+        self.rows = config.num_perm // config.bands
+        self.hasher = MinHasher(config.num_perm)
+
+        self._conn = open_state_db(db_name)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS signatures (
+                id INTEGER PRIMARY KEY,
+                label TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                added_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                signature_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS lsh_buckets_lookup ON lsh_buckets (band, bucket);
+            """
+        )
+        self._conn.commit()
+
+        self.checked = 0
+        self.dropped = 0
+
+    def _buckets(self, signature: tuple[int, ...]) -> list[int]:
+        """One bucket id per band (signed, to fit SQLite INTEGER)."""
+        rows = self.rows
+        buckets = []
+        for band in range(self.config.bands):
+            chunk = struct.pack(f">{rows}I", *signature[band * rows : (band + 1) * rows])
+            buckets.append(_hash64(chunk) - (1 << 63))
+        return buckets
+
+    def find(self, signature: tuple[int, ...]) -> Optional[tuple[str, float]]:
+        """Most similar indexed thread at or above the threshold, if any."""
+        candidates: set[int] = set()
+        for band, bucket in enumerate(self._buckets(signature)):
+            candidates.update(
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT signature_id FROM lsh_buckets WHERE band = ? AND bucket = ?",
+                    (band, bucket),
+                )
+            )
+
+        best: Optional[tuple[str, float]] = None
+        fmt = f">{self.config.num_perm}I"
+        for signature_id in candidates:
+            label, blob = self._conn.execute(
+                "SELECT label, signature FROM signatures WHERE id = ?", (signature_id,)
+            ).fetchone()
+            similarity = estimate_similarity(signature, struct.unpack(fmt, blob))
+            if similarity >= self.config.similarity_threshold and (
+                best is None or similarity > best[1]
+            ):
+                best = (label, similarity)
+        return best
+
+    def _insert(self, label: str, signature: tuple[int, ...]) -> None:
+        blob = struct.pack(f">{self.config.num_perm}I", *signature)
+        cur = self._conn.execute(
+            "INSERT INTO signatures (label, signature, added_at) VALUES (?, ?, ?)",
+            (label, blob, time.time()),
+        )
+        self._conn.executemany(
+            "INSERT INTO lsh_buckets (band, bucket, signature_id) VALUES (?, ?, ?)",
+            [(band, bucket, cur.lastrowid) for band, bucket in enumerate(self._buckets(signature))],
+        )
+
+    def _signature(self, thread: RawThread) -> tuple[int, ...]:
+        return self.hasher.signature(thread_shingles(thread, self.config.shingle_size))
+
+    def filter(self, threads: list[RawThread]) -> list[RawThread]:
+        """
+        Drop threads that nearly duplicate an indexed thread (or an earlier
+        thread in this batch) and return the rest. Nothing is indexed here:
+        survivors are only add()ed once they have been enriched, so a run
+        that fails before then doesn't drop them as duplicates of themselves.
+        """
+        kept: list[RawThread] = []
+        batch: list[tuple[str, tuple[int, ...]]] = []
+        for thread in threads:
+            self.checked += 1
+            signature = self._signature(thread)
+            match = self.find(signature)
+            for label, other in batch:
+                similarity = estimate_similarity(signature, other)
+                if similarity >= self.config.similarity_threshold and (
+                    match is None or similarity > match[1]
+                ):
+                    match = (label, similarity)
+            if match:
+                self.dropped += 1
+                console.print(
+                    f"  [dim]Near-duplicate ({match[1]:.2f}) of {match[0]}: "
+                    f"{thread.participant_a} vs {thread.participant_b}[/dim]"
+                )
+                continue
+            batch.append((_label(thread), signature))
+            kept.append(thread)
+        return kept
+
+    def add(self, threads: list[RawThread]) -> None:
+        """Index threads that have been enriched, so later runs skip their copies."""
+        for thread in threads:
+            self._insert(_label(thread), self._signature(thread))
+        self._conn.commit()
+
+    def summary(self) -> str:
+        return (
+            f"{self.dropped}/{self.checked} near-duplicates dropped, "
+            f"{self.dropped} LLM calls saved"
+        )
@@ -2,13 +2,20 @@
 LLM-based enrichment: scoring, categorization, anonymization, and more.
 """
 
+import asyncio
 import json
 import time
-from typing import Optional
+from collections import deque
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Optional
 from rich.console import Console
 
+from pipeline.config import LLMConfig
 from pipeline.models import RawThread, ProcessedArgument, ProcessedMessage
-from pipeline.processing.llm_client import LLMClient
+from pipeline.ratelimit import AsyncRateLimiter
+from pipeline.processing import batch_api
+from pipeline.processing.dedupe import thread_fingerprint
+from pipeline.processing.llm_client import BatchClient, LLMClient, LLMResponse, estimate_tokens
 
 console = Console()
 
@@ -44,46 +51,153 @@ Rules:
 Return ONLY valid JSON, no markdown code fences."""
 
 
-MAX_MESSAGES_FOR_ENRICHMENT = 15
-MAX_RETRIES = 2
+PACKED_ENRICHMENT_SYSTEM_PROMPT = ENRICHMENT_SYSTEM_PROMPT + """
+
+You will be given SEVERAL threads, each starting with a line "=== Thread <index> ===".
+Analyze each thread independently. Return ONLY a JSON array with exactly one object
+per thread, in any order: the object described above plus an "index" field holding
+that thread's index."""
 
 
-def _build_enrichment_prompt(thread: RawThread) -> str:
-    """Build the user prompt, truncating long threads to avoid output token limits."""
+MAX_RETRIES = 2
+
+# Output-size model for an enrichment reply: fixed fields (title, blurb,
+# names, zingers, scores), per-message JSON scaffolding, and the echoed
+# bodies themselves (cleaned, so roughly the same length)
+_OUTPUT_OVERHEAD = 300
+_OUTPUT_PER_MESSAGE = 30
+_OUTPUT_PER_BODY_TOKEN = 1.1
+
+# Stands in for the middle of a trimmed message in the prompt. The model
+# echoes it, and the cut text is put back in its place before storing
+TRIM_MARKER = "[… trimmed …]"
+
+
+@dataclass
+class EnrichmentPrompt:
+    """A thread's user prompt, sized to the input budget."""
+
+    text: str
+    shown: int  # Messages included
+    trimmed: int  # Included messages whose body was cut down
+    expected_output: int  # Predicted reply length in tokens
+    cuts: list[str] = field(default_factory=list)  # Text cut from those bodies, in order
+
+    @property
+    def max_tokens(self) -> int:
+        """Output limit for this prompt: the expected reply plus headroom."""
+        return max(512, int(self.expected_output * 1.5))
+
+
+def _trim_body(body: str, cap: int) -> tuple[str, Optional[str]]:
+    """Cut a long body down to about `cap` tokens, keeping its start and end
+    around TRIM_MARKER. Returns (prompt copy, cut text or None)."""
+    tokens = estimate_tokens(body)
+    if tokens <= cap:
+        return body, None
+    keep = int(len(body) * cap / tokens)
+    head = body[: keep * 2 // 3].rsplit(" ", 1)[0]
+    tail = body[len(body) - keep // 3 :].split(" ", 1)[-1]
+    return f"{head} {TRIM_MARKER} {tail}", body[len(head) : len(body) - len(tail)].strip()
+
+
+def _priority(count: int) -> list[int]:
+    """Message indices in the order they earn a place in the prompt: the
+    opening exchange, how it ended, the midpoint, then inward from both ends."""
+    order: list[int] = []
+    for i in (0, 1, count - 1, count - 2, count // 2):
+        if 0 <= i < count and i not in order:
+            order.append(i)
+    rest = sorted(
+        (i for i in range(count) if i not in order),
+        key=lambda i: (min(i, count - 1 - i), i),
+    )
+    return order + rest
+
+
+def _build_enrichment_prompt(
+    thread: RawThread,
+    budget: int = 800,
+    message_cap: int = 150,
+) -> EnrichmentPrompt:
+    """
+    Build the user prompt within a token budget for the messages.
+
+    Bodies longer than `message_cap` tokens are trimmed in the middle (in
+    the prompt only: the cut text is kept for _to_argument to put back);
+    then messages are added in _priority() order while they fit `budget`
+    (the first four always do). Omitted stretches are marked in place.
+    """
     messages = thread.messages
-    truncated = False
-
-    if len(messages) > MAX_MESSAGES_FOR_ENRICHMENT:
-        # Keep first 6, last 6, and 3 from the middle for context
-        head = messages[:6]
-        tail = messages[-6:]
-        middle_start = len(messages) // 2 - 1
-        middle = messages[middle_start : middle_start + 3]
-        messages = head + middle + tail
-        truncated = True
-
-    messages_text = []
-    for msg in messages:
-        messages_text.append(
-            f"[{msg.author_id}] (score: {msg.score}): {msg.body}"
+    lines: list[str] = []
+    costs: list[int] = []
+    bodies: list[int] = []
+    trimmed: dict[int, str] = {}
+    for i, msg in enumerate(messages):
+        body, cut = _trim_body(msg.body, message_cap)
+        if cut is not None:
+            trimmed[i] = cut
+        line = f"[{msg.author_id}] (score: {msg.score}): {body}"
+        lines.append(line)
+        costs.append(estimate_tokens(line))
+        bodies.append(estimate_tokens(body))
+
+    chosen: set[int] = set()
+    spent = 0
+    for i in _priority(len(messages)):
+        if spent + costs[i] > budget and len(chosen) >= 4:
+            continue
+        chosen.add(i)
+        spent += costs[i]
+
+    shown: list[str] = []
+    previous = -1
+    for i in sorted(chosen):
+        if i > previous + 1:
+            shown.append(f"(... {i - previous - 1} messages omitted ...)")
+        shown.append(lines[i])
+        previous = i
+    if previous < len(messages) - 1:
+        shown.append(f"(... {len(messages) - 1 - previous} messages omitted ...)")
+
+    notes = []
+    if len(chosen) < len(messages):
+        notes.append(
+            f"Thread has {len(messages)} total messages. Showing {len(chosen)}; "
+            f"omitted stretches are marked."
         )
-
-    truncation_note = ""
-    if truncated:
-        truncation_note = (
-            f"\n\n(Thread has {len(thread.messages)} total messages. "
-            f"Showing {len(messages)} representative messages — first 6, "
-            f"3 from middle, last 6. Include ALL shown messages in your output.)"
+    cuts = [trimmed[i] for i in sorted(chosen) if i in trimmed]
+    if cuts:
+        notes.append(
+            f"Long messages were cut in the middle at {TRIM_MARKER}: keep that marker "
+            f"in their body and do not fill in or guess the missing text."
         )
+    note = ""
+    if notes:
+        note = f"\n\n({' '.join(notes)} Include ALL shown messages in your output.)"
 
-    return f"""Platform: {thread.platform}
+    text = f"""Platform: {thread.platform}
 Source: {thread.source}
 Thread title: {thread.title or "N/A"}
 Participant A: {thread.participant_a}
 Participant B: {thread.participant_b}
 
 Messages:
-{chr(10).join(messages_text)}{truncation_note}"""
+{chr(10).join(shown)}{note}"""
+
+    expected = (
+        _OUTPUT_OVERHEAD
+        + _OUTPUT_PER_MESSAGE * len(chosen)
+        + int(_OUTPUT_PER_BODY_TOKEN * sum(bodies[i] for i in chosen))
+    )
+    return EnrichmentPrompt(text, len(chosen), len(cuts), expected, cuts)
+
+
+def _build_packed_prompt(prompts: list[EnrichmentPrompt]) -> str:
+    """One user prompt holding several threads, headed by their pack index."""
+    return "\n\n".join(
+        f"=== Thread {i} ===\n{prompt.text}" for i, prompt in enumerate(prompts)
+    )
 
 
 def _parse_llm_response(response: str) -> dict:
@@ -97,106 +211,444 @@ def _parse_llm_response(response: str) -> dict:
     return json.loads(response)
 
 
+def _parse_packed_response(response: str, count: int) -> dict[int, dict]:
+    """Per-index results from a packed response; missing or malformed
+    items are simply absent."""
+    data = _parse_llm_response(response)
+    if isinstance(data, dict):
+        data = data.get("results") or data.get("threads") or []
+    items: dict[int, dict] = {}
+    for item in data if isinstance(data, list) else []:
+        if isinstance(item, dict) and isinstance(item.get("index"), int) and 0 <= item["index"] < count:
+            items.setdefault(item["index"], item)
+    return items
+
+
+def _restore_trimmed(bodies: list[str], cuts: list[str]) -> list[str]:
+    """Put the text cut from trimmed messages back in place of the markers
+    the model echoed, so stored messages are never truncated."""
+    marked = [i for i, body in enumerate(bodies) if TRIM_MARKER in body]
+    if len(marked) != len(cuts):
+        raise ValueError(f"{len(cuts)} trimmed messages, {len(marked)} echoed with the marker")
+    bodies = list(bodies)
+    for i, cut in zip(marked, cuts):
+        bodies[i] = bodies[i].replace(TRIM_MARKER, cut, 1)
+    return bodies
+
+
+def _to_argument(
+    thread: RawThread, data: dict, cuts: Optional[list[str]] = None
+) -> ProcessedArgument:
+    """Build a ProcessedArgument from the LLM's parsed JSON for a thread.
+    `cuts` is the prompt's EnrichmentPrompt.cuts."""
+    bodies = [m["body"] for m in data["messages"]]
+    if cuts:
+        bodies = _restore_trimmed(bodies, cuts)
+    processed_messages = [
+        ProcessedMessage(
+            author=m["author"],
+            body=body,
+            timestamp=str(m.get("timestamp") or ""),
+            score=m.get("score"),
+            quoted_text=m.get("quoted_text"),
+        )
+        for m, body in zip(data["messages"], bodies)
+    ]
+
+    return ProcessedArgument(
+        platform=thread.platform,
+        platform_source=thread.source,
+        original_url=thread.url,
+        title=data["title"][:80],
+        context_blurb=(data.get("context_blurb") or "")[:120] or None,
+        topic_drift=data.get("topic_drift"),
+        category=data["category"],
+        heat_rating=max(1, min(5, data["heat_rating"])),
+        user_a_display_name=data["user_a_display_name"],
+        user_b_display_name=data["user_b_display_name"],
+        user_a_zinger=data.get("user_a_zinger"),
+        user_b_zinger=data.get("user_b_zinger"),
+        messages=processed_messages,
+        entertainment_score=data["entertainment_score"],
+        nsfw_level=data.get("nsfw_level"),
+        fingerprint=thread_fingerprint(thread),
+    )
+
+
+def _retry_message(attempt: int, error: Exception) -> Optional[str]:
+    """Console line for a failed attempt; None once the retries are used up."""
+    if attempt < MAX_RETRIES - 1:
+        kind = "JSON error" if isinstance(error, json.JSONDecodeError) else str(error)
+        return f"    [yellow]Retry {attempt + 1} ({kind})[/yellow]"
+    if isinstance(error, json.JSONDecodeError):
+        console.print(f"  [red]JSON parse error after {MAX_RETRIES} attempts: {error}[/red]")
+    else:
+        console.print(f"  [red]Enrichment error after {MAX_RETRIES} attempts: {error}[/red]")
+    return None
+
+
 def enrich_thread(
     client: LLMClient,
     thread: RawThread,
+    config: Optional[LLMConfig] = None,
 ) -> Optional[ProcessedArgument]:
     """Enrich a single thread using the LLM, with retry on failure."""
-    user_prompt = _build_enrichment_prompt(thread)
+    config = config or LLMConfig()
+    prompt = _build_enrichment_prompt(thread, config.prompt_token_budget, config.message_token_cap)
 
     for attempt in range(MAX_RETRIES):
         try:
-            response = client.complete(ENRICHMENT_SYSTEM_PROMPT, user_prompt)
-            data = _parse_llm_response(response)
-
-            # Build ProcessedArgument
-            processed_messages = [
-                ProcessedMessage(
-                    author=m["author"],
-                    body=m["body"],
-                    timestamp=str(m.get("timestamp") or ""),
-                    score=m.get("score"),
-                    quoted_text=m.get("quoted_text"),
-                )
-                for m in data["messages"]
-            ]
-
-            return ProcessedArgument(
-                platform=thread.platform,
-                platform_source=thread.source,
-                original_url=thread.url,
-                title=data["title"][:80],
-                context_blurb=(data.get("context_blurb") or "")[:120] or None,
-                topic_drift=data.get("topic_drift"),
-                category=data["category"],
-                heat_rating=max(1, min(5, data["heat_rating"])),
-                user_a_display_name=data["user_a_display_name"],
-                user_b_display_name=data["user_b_display_name"],
-                user_a_zinger=data.get("user_a_zinger"),
-                user_b_zinger=data.get("user_b_zinger"),
-                messages=processed_messages,
-                entertainment_score=data["entertainment_score"],
-                nsfw_level=data.get("nsfw_level"),
+            # Retries skip the cache, which may hold the bad response, and
+            # lift the output limit in case the reply was cut off; the cache
+            # key ignores the limit, so the good reply replaces the bad one
+            response = client.complete(
+                ENRICHMENT_SYSTEM_PROMPT,
+                prompt.text,
+                use_cache=attempt == 0,
+                max_tokens=min(prompt.max_tokens, client.max_tokens) if attempt == 0 else None,
             )
-
-        except json.JSONDecodeError as e:
-            if attempt < MAX_RETRIES - 1:
-                console.print(f"    [yellow]Retry {attempt + 1} (JSON error)[/yellow]")
-                time.sleep(1)
-            else:
-                console.print(f"  [red]JSON parse error after {MAX_RETRIES} attempts: {e}[/red]")
-                return None
+            return _to_argument(thread, _parse_llm_response(response), prompt.cuts)
         except Exception as e:
-            if attempt < MAX_RETRIES - 1:
-                console.print(f"    [yellow]Retry {attempt + 1} ({e})[/yellow]")
-                time.sleep(1)
-            else:
-                console.print(f"  [red]Enrichment error after {MAX_RETRIES} attempts: {e}[/red]")
+            retry = _retry_message(attempt, e)
+            if retry is None:
                 return None
+            console.print(retry)
+            time.sleep(1)
 
     return None
 
 
+class PackPlanner:
+    """
+    Sizes packs of threads for one request each, so the expected output
+    stays within the client's max_tokens.
+
+    A thread's output is predicted as `ratio` x its prompt's expected output.
+    The ratio is learned from the output tokens packed requests actually
+    used, and backs off sharply when a pack's reply comes back unusable
+    (usually truncated).
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        max_pack: int,
+        prompt_for: Callable[[RawThread], EnrichmentPrompt],
+        headroom: float = 0.75,
+    ):
+        self.budget = max_tokens * headroom
+        self.max_pack = max(1, max_pack)
+        self.prompt_for = prompt_for
+        self.ratio = 1.0
+
+    def expected_output(self, thread: RawThread) -> int:
+        return int(self.ratio * self.prompt_for(thread).expected_output)
+
+    def take(self, queue: deque) -> list[RawThread]:
+        """Pop the next pack off the queue (always at least one thread)."""
+        pack = [queue.popleft()]
+        total = self.expected_output(pack[0])
+        while queue and len(pack) < self.max_pack:
+            expected = self.expected_output(queue[0])
+            if total + expected > self.budget:
+                break
+            pack.append(queue.popleft())
+            total += expected
+        return pack
+
+    def observe(self, pack: list[RawThread], output_tokens: int) -> None:
+        expected = sum(self.prompt_for(t).expected_output for t in pack)
+        self.ratio = 0.7 * self.ratio + 0.3 * (output_tokens / expected)
+
+    def overflowed(self) -> None:
+        self.ratio *= 1.5
+
+
+class EnrichmentEngine:
+    """
+    Enriches threads concurrently under a provider's rate limits.
+
+    At most `concurrency` requests are in flight. Each request first takes
+    one unit from a requests/min bucket and an estimate of its tokens from a
+    tokens/min bucket (prompt size plus the prompt's expected output);
+    once the provider reports actual usage the difference is settled, so a
+    run paces itself to whichever limit binds first.
+
+    With max_pack > 1, several threads share a request (see PackPlanner);
+    items missing from a packed reply are retried one thread per request.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        concurrency: int = 16,
+        requests_per_minute: int = 50,
+        tokens_per_minute: int = 50_000,
+        max_pack: int = 1,
+        prompt_budget: int = 800,
+        message_cap: int = 150,
+    ):
+        self.client = client
+        self.prompt_budget = prompt_budget
+        self.message_cap = message_cap
+        self._prompts: dict[int, EnrichmentPrompt] = {}
+        self.concurrency = max(1, concurrency)
+        self.requests = AsyncRateLimiter(requests_per_minute)
+        self.tokens = AsyncRateLimiter(tokens_per_minute)
+        self.throttled_seconds = 0.0
+        self.tokens_used = 0
+        self.cached = 0
+        self.planner = PackPlanner(client.max_tokens, max_pack, self.prompt)
+        self.calls = 0
+        self.packed_retries = 0
+
+    def prompt(self, thread: RawThread) -> EnrichmentPrompt:
+        """The thread's budgeted prompt (built once per run)."""
+        key = id(thread)
+        if key not in self._prompts:
+            self._prompts[key] = _build_enrichment_prompt(
+                thread, self.prompt_budget, self.message_cap
+            )
+        return self._prompts[key]
+
+    async def _complete(
+        self,
+        system: str,
+        user: str,
+        expected_output: int,
+        max_tokens: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> LLMResponse:
+        estimate = estimate_tokens(system) + estimate_tokens(user) + expected_output
+
+        async def throttle():
+            self.calls += 1
+            self.throttled_seconds += await self.requests.acquire()
+            self.throttled_seconds += await self.tokens.acquire(estimate)
+
+        response = await self.client.acomplete(
+            system, user, use_cache=use_cache, throttle=throttle, max_tokens=max_tokens
+        )
+        if response.cached:
+            self.cached += 1
+        elif response.total_tokens:
+            self.tokens.charge(response.total_tokens - estimate)
+            self.tokens_used += response.total_tokens
+        return response
+
+    async def enrich(self, thread: RawThread) -> Optional[ProcessedArgument]:
+        """Async enrich_thread(): same prompt, parsing and retries."""
+        prompt = self.prompt(thread)
+
+        for attempt in range(MAX_RETRIES):
+            try:
+                response = await self._complete(
+                    ENRICHMENT_SYSTEM_PROMPT,
+                    prompt.text,
+                    expected_output=prompt.expected_output,
+                    max_tokens=(
+                        min(prompt.max_tokens, self.client.max_tokens) if attempt == 0 else None
+                    ),
+                    use_cache=attempt == 0,
+                )
+                return _to_argument(thread, _parse_llm_response(response.text), prompt.cuts)
+            except Exception as e:
+                retry = _retry_message(attempt, e)
+                if retry is None:
+                    return None
+                console.print(retry)
+                await asyncio.sleep(1)
+
+        return None
+
+    async def enrich_pack(
+        self, pack: list[RawThread]
+    ) -> list[tuple[RawThread, Optional[ProcessedArgument]]]:
+        """Enrich several threads in one request, retrying failed items singly."""
+        if len(pack) == 1:
+            return [(pack[0], await self.enrich(pack[0]))]
+
+        items: dict[int, dict] = {}
+        try:
+            response = await self._complete(
+                PACKED_ENRICHMENT_SYSTEM_PROMPT,
+                _build_packed_prompt([self.prompt(t) for t in pack]),
+                expected_output=sum(self.planner.expected_output(t) for t in pack),
+            )
+            items = _parse_packed_response(response.text, len(pack))
+            if not response.cached:
+                self.planner.observe(pack, response.output_tokens)
+        except Exception as e:
+            console.print(f"    [yellow]Packed request for {len(pack)} threads failed ({e})[/yellow]")
+        if len(items) < len(pack):
+            self.planner.overflowed()
+
+        results: list[tuple[RawThread, Optional[ProcessedArgument]]] = []
+        for i, thread in enumerate(pack):
+            try:
+                results.append((thread, _to_argument(thread, items[i], self.prompt(thread).cuts)))
+            except Exception:
+                # Missing or malformed item: this thread alone gets its own request
+                self.packed_retries += 1
+                results.append((thread, await self.enrich(thread)))
+        return results
+
+    async def stream(
+        self, threads: list[RawThread]
+    ) -> AsyncIterator[tuple[RawThread, Optional[ProcessedArgument]]]:
+        """Yield (thread, argument or None) as each enrichment finishes.
+
+        Packs are formed as requests are launched, so later packs are sized
+        with what earlier replies taught the planner."""
+        queue = deque(threads)
+        running: set[asyncio.Task] = set()
+        try:
+            while queue or running:
+                while queue and len(running) < self.concurrency:
+                    pack = self.planner.take(queue)
+                    running.add(asyncio.create_task(self.enrich_pack(pack)))
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    for pair in task.result():
+                        yield pair
+        finally:
+            for task in running:
+                task.cancel()
+
+
+def engine_for(client: LLMClient, config: Optional[LLMConfig] = None) -> EnrichmentEngine:
+    """An EnrichmentEngine with the configured limits for the client's provider."""
+    config = config or LLMConfig()
+    rpm, tpm = config.rate_limits.get(client.provider, (50, 50_000))
+    return EnrichmentEngine(
+        client,
+        config.max_concurrency,
+        rpm,
+        tpm,
+        config.pack_size,
+        config.prompt_token_budget,
+        config.message_token_cap,
+    )
+
+
 def batch_enrich(
     client: LLMClient,
     threads: list[RawThread],
-    batch_size: int = 10,
-    rate_limit_delay: float = 1.0,
+    config: Optional[LLMConfig] = None,
 ) -> list[ProcessedArgument]:
-    """Process threads in batches with rate limiting."""
-    results: list[ProcessedArgument] = []
-
-    for i in range(0, len(threads), batch_size):
-        batch = threads[i : i + batch_size]
-        console.print(
-            f"\n[bold]Processing batch {i // batch_size + 1} "
-            f"({len(batch)} threads)...[/bold]"
-        )
-
-        for j, thread in enumerate(batch):
-            console.print(
-                f"  [{j + 1}/{len(batch)}] "
-                f"{thread.participant_a} vs {thread.participant_b}..."
-            )
-
-            result = enrich_thread(client, thread)
+    """Enrich threads concurrently, in completion order."""
+    engine = engine_for(client, config)
+    rpm, tpm = engine.requests.rate, engine.tokens.rate
+    console.print(
+        f"\n[bold]Enriching {len(threads)} threads "
+        f"({engine.concurrency} in flight, {rpm:,.0f} req/min, {tpm:,.0f} tokens/min)...[/bold]"
+    )
+
+    async def collect() -> list[ProcessedArgument]:
+        results: list[ProcessedArgument] = []
+        done = 0
+        async for thread, result in engine.stream(threads):
+            done += 1
+            label = f"  [{done}/{len(threads)}] {thread.participant_a} vs {thread.participant_b}"
             if result:
                 results.append(result)
                 console.print(
-                    f"    [green]✓[/green] Score: {result.entertainment_score}, "
+                    f"{label} [green]✓[/green] Score: {result.entertainment_score}, "
                     f"Category: {result.category}"
                 )
             else:
-                console.print(f"    [dim]Skipped[/dim]")
+                console.print(f"{label} [dim]Skipped[/dim]")
+        return results
+
+    started = time.monotonic()
+    results = asyncio.run(collect())
+    elapsed = time.monotonic() - started
+
+    rate = len(threads) / elapsed * 60 if elapsed > 0 else 0.0
+    console.print(
+        f"\n[bold]Enriched {len(results)}/{len(threads)} threads[/bold] "
+        f"in {elapsed:.1f}s ({rate:.1f} threads/min, {engine.tokens_used:,} tokens, "
+        f"{engine.cached} from cache, {engine.throttled_seconds:.1f}s throttled)"
+    )
+    if engine.planner.max_pack > 1:
+        console.print(
+            f"  [dim]{engine.calls} requests for {len(threads)} threads "
+            f"({len(threads) / max(1, engine.calls):.1f} per request), "
+            f"{engine.packed_retries} packed items retried singly[/dim]"
+        )
+    console.print(f"  [dim]LLM usage: {client.usage.summary()}[/dim]")
+    return results
 
-            # Rate limiting between individual calls
-            if j < len(batch) - 1:
-                time.sleep(rate_limit_delay)
 
-        # Extra delay between batches
-        if i + batch_size < len(threads):
-            console.print("[dim]Waiting between batches...[/dim]")
-            time.sleep(rate_limit_delay * 2)
+def submit_enrichment_batch(
+    client: BatchClient,
+    threads: list[RawThread],
+    store: batch_api.BatchJobStore,
+    updates: Optional[dict[str, Optional[int]]] = None,
+    config: Optional[LLMConfig] = None,
+) -> str:
+    """
+    Submit every thread's enrichment prompt as one provider batch job.
+    `updates` (fingerprint -> beef number) and the text cut from trimmed
+    messages ride along, so a resumed job still knows which arguments to
+    update rather than insert, and can restore their full messages.
+    """
+    updates = updates or {}
+    config = config or LLMConfig()
+    requests = {}
+    for i, thread in enumerate(threads):
+        prompt = _build_enrichment_prompt(
+            thread, config.prompt_token_budget, config.message_token_cap
+        )
+        requests[f"t{i}"] = (
+            ENRICHMENT_SYSTEM_PROMPT,
+            prompt.text,
+            json.dumps({
+                "thread": thread.model_dump(mode="json"),
+                "update": updates.get(thread_fingerprint(thread)),
+                "cuts": prompt.cuts,
+            }),
+        )
+    return batch_api.submit(client, store, "enrich", requests)
+
+
+def collect_enrichment_batch(
+    client: BatchClient,
+    store: batch_api.BatchJobStore,
+    job_id: str,
+    poll_interval: float = 60.0,
+) -> tuple[list[ProcessedArgument], list[RawThread], dict[str, Optional[int]]]:
+    """
+    Wait for an enrichment job and parse its results.
+    Returns (arguments, the job's threads, fingerprint -> beef number to update).
+    Results that fail to parse are skipped; batch mode does not retry.
+    """
+    responses = batch_api.wait(client, job_id, poll_interval)
 
-    console.print(f"\n[bold]Enriched {len(results)}/{len(threads)} threads[/bold]")
-    return results
+    results: list[ProcessedArgument] = []
+    threads: list[RawThread] = []
+    updates: dict[str, Optional[int]] = {}
+    for custom_id, payload in store.payloads(job_id).items():
+        data = json.loads(payload)
+        thread = RawThread.model_validate(data["thread"])
+        threads.append(thread)
+        if data["update"] is not None:
+            updates[thread_fingerprint(thread)] = data["update"]
+
+        response = responses.get(custom_id)
+        if response is None:
+            continue
+        try:
+            results.append(
+                _to_argument(thread, _parse_llm_response(response.text), data.get("cuts"))
+            )
+        except Exception as e:
+            console.print(
+                f"  [red]Unusable batch result for {thread.participant_a} vs "
+                f"{thread.participant_b}: {e}[/red]"
+            )
+
+    store.close(job_id)
+    console.print(f"\n[bold]Enriched {len(results)}/{len(threads)} threads (batch {job_id})[/bold]")
+    console.print(f"  [dim]LLM usage: {client.usage.summary()}[/dim]")
+    return results, threads, updates
@@ -0,0 +1,155 @@
+"""
+Content-addressed cache of LLM responses.
+
+Reruns after a crash or a threshold tweak, and re-reviews of the same
+pending argument, send byte-identical prompts. Responses are stored on disk
+under a hash of (provider, model, max_tokens, system prompt, user prompt),
+so an identical request is answered locally instead of paying the provider
+again. Entries unused for `max_age_days` are dropped, and the least recently
+used ones go once the cache outgrows `max_mb`.
+
+Hit/miss/saved-token counters are kept in the same database so
+`main.py stats` can report them across runs.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Optional
+
+from pipeline.state import open_state_db
+
+# Evict every this many writes (and on open)
+_EVICT_EVERY = 100
+
+
+def cache_key(provider: str, model: str, max_tokens: int, system: str, user: str) -> str:
+    parts = [provider, model, str(max_tokens), system, user]
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response store with size and age eviction."""
+
+    def __init__(
+        self,
+        max_mb: float = 256,
+        max_age_days: float = 30,
+        db_name: str = "llm_cache",
+    ):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_age = max_age_days * 86400
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self._conn = open_state_db(db_name)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                input_tokens INTEGER NOT NULL,
+                output_tokens INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                used_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at);
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """
+        )
+        self.evict()
+
+    def get(self, key: str) -> Optional[tuple[str, int, int]]:
+        """(text, input_tokens, output_tokens) for a cached response, counting
+        the lookup as a hit or miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, input_tokens, output_tokens FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self._bump(misses=1)
+            else:
+                self._conn.execute(
+                    "UPDATE responses SET used_at = ? WHERE key = ?", (time.time(), key)
+                )
+                self._bump(hits=1, saved_tokens=row[1] + row[2])
+            self._conn.commit()
+        return row
+
+    def put(self, key: str, text: str, input_tokens: int, output_tokens: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (key, text, input_tokens, output_tokens, size, created_at, used_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, text, input_tokens, output_tokens, len(text.encode()), now, now),
+            )
+            self._conn.commit()
+            self._writes += 1
+        if self._writes % _EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under
+        the size cap. Returns how many were removed."""
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM responses WHERE used_at < ?", (time.time() - self.max_age,)
+            ).rowcount
+
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                doomed = []
+                for key, size in self._conn.execute(
+                    "SELECT key, size FROM responses ORDER BY used_at"
+                ):
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+                removed += len(doomed)
+
+            self._conn.commit()
+        return removed
+
+    def _bump(self, **deltas: int) -> None:
+        for name, delta in deltas.items():
+            self._conn.execute(
+                """
+                INSERT INTO counters (name, value) VALUES (?, ?)
+                ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+                """,
+                (name, delta),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM counters"))
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "coalesced": counters.get("coalesced", 0),
+            "saved_tokens": counters.get("saved_tokens", 0),
+        }
+
+    def record_coalesced(self, saved_tokens: int) -> None:
+        """Count a request answered by an identical one already in flight."""
+        with self._lock:
+            self._bump(coalesced=1, saved_tokens=saved_tokens)
+            self._conn.commit()
@@ -2,25 +2,267 @@
 LLM client abstraction with Claude and OpenAI implementations.
 """
 
+import asyncio
+import hashlib
+import json
 import os
+import re
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional
 from dotenv import load_dotenv
 
+from pipeline.config import LLMConfig
+from pipeline.processing.llm_cache import ResponseCache, cache_key
+
 load_dotenv()
 
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count: one per word or punctuation mark, plus
+    one per further 6 characters of long runs (URLs, code, usernames)."""
+    return sum(1 + (len(token) - 1) // 6 for token in _TOKEN.findall(text))
+
+
+_prefix_tokens = lru_cache(maxsize=32)(estimate_tokens)
+
+
+def min_cacheable_tokens(provider: str, model: str) -> int:
+    """Shortest prompt prefix the provider will cache for `model`, in tokens
+    (0 where no minimum is documented). Shorter prefixes are always sent,
+    and billed, as uncached input."""
+    if provider == "claude":
+        if "haiku-4" in model or "opus-4-5" in model:
+            return 4096
+        return 2048 if "haiku" in model else 1024
+    if provider == "openai":
+        return 1024
+    return 0
+
+
+@dataclass
+class LLMResponse:
+    """Response text plus the token usage the provider reported."""
+
+    text: str
+    input_tokens: int = 0  # All input tokens, including prompt-cache reads and writes
+    output_tokens: int = 0
+    cached: bool = False  # Served from the response cache or an identical in-flight call
+    cached_input_tokens: int = 0  # Input read from the provider's prompt cache
+    cache_write_tokens: int = 0  # Input written to the prompt cache (Claude)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+
+@dataclass
+class UsageTotals:
+    """Provider-reported usage summed over a client's calls."""
+
+    calls: int = 0
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    cache_write_tokens: int = 0
+    output_tokens: int = 0
+    # Requests whose system prompt is shorter than the model will cache
+    short_prefix_requests: int = 0
+    min_cacheable_tokens: int = 0
+
+    def add(self, response: LLMResponse) -> None:
+        self.calls += 1
+        self.input_tokens += response.input_tokens
+        self.cached_input_tokens += response.cached_input_tokens
+        self.cache_write_tokens += response.cache_write_tokens
+        self.output_tokens += response.output_tokens
+
+    def summary(self) -> str:
+        share = self.cached_input_tokens / self.input_tokens if self.input_tokens else 0.0
+        text = (
+            f"{self.calls} calls, {self.input_tokens:,} input tokens "
+            f"({self.cached_input_tokens:,} = {share:.0%} from prompt cache), "
+            f"{self.output_tokens:,} output tokens"
+        )
+        if self.short_prefix_requests:
+            text += (
+                f"; system prompt under the model's {self.min_cacheable_tokens:,}-token "
+                f"caching minimum on {self.short_prefix_requests} requests"
+            )
+        return text
+
 
 class LLMClient(ABC):
-    """Abstract base class for LLM clients."""
+    """Abstract base class for LLM clients.
+
+    complete()/acomplete() consult the response cache (when one is attached)
+    before calling the provider through the subclass's _complete/_acomplete.
+
+    System prompts are static, so requests are laid out with the system
+    prompt as a fixed prefix the provider can cache (an explicit cache
+    breakpoint for Claude; automatic prefix caching for OpenAI/Kimi).
+    Providers only cache prefixes of a minimum length (min_cacheable_tokens);
+    requests under it are counted in `usage`, and cached_input_tokens is
+    what was actually read from the cache.
+    """
+
+    provider: str = ""
+    model: str = ""
+    max_tokens: int = 4096
+    cache: Optional[ResponseCache] = None
+    prompt_caching: bool = True
+    supports_batch: bool = False  # Provider batch jobs (BatchClient subclasses)
+
+    @property
+    def usage(self) -> UsageTotals:
+        """Usage of the provider calls made so far (response-cache hits excluded)."""
+        if getattr(self, "_usage", None) is None:
+            self._usage = UsageTotals()
+        return self._usage
+
+    def _check_prefix(self, system: str) -> None:
+        """Count a request whose system prompt is too short to be cached."""
+        minimum = min_cacheable_tokens(self.provider, self.model)
+        if self.prompt_caching and _prefix_tokens(system) < minimum:
+            self.usage.short_prefix_requests += 1
+            self.usage.min_cacheable_tokens = minimum
+
+    def _cache_key(self, system: str, user: str) -> str:
+        # A per-call max_tokens is left out on purpose: it only caps the reply,
+        # and a reply that was cut short and failed to parse must be replaced
+        # by the (higher-limit) retry under the same key, not left in place
+        return cache_key(self.provider, self.model, self.max_tokens, system, user)
+
+    def complete(
+        self,
+        system: str,
+        user: str,
+        use_cache: bool = True,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Send a completion request and return the response text.
+
+        With use_cache=False the cache is not read, but the fresh response
+        still replaces whatever was stored (e.g. when retrying bad output).
+        max_tokens overrides the client's default output limit for this call
+        (it is not part of the cache key).
+        """
+        key = self._cache_key(system, user) if self.cache else None
+        if key and use_cache:
+            hit = self.cache.get(key)
+            if hit:
+                return hit[0]
+
+        response = self._complete(system, user, max_tokens)
+        self.usage.add(response)
+        if key:
+            self.cache.put(key, response.text, response.input_tokens, response.output_tokens)
+        return response.text
+
+    async def acomplete(
+        self,
+        system: str,
+        user: str,
+        use_cache: bool = True,
+        throttle: Optional[Callable[[], Awaitable[None]]] = None,
+        max_tokens: Optional[int] = None,
+    ) -> LLMResponse:
+        """Async completion, with usage (for rate limiting by tokens/min).
+
+        Identical requests already in flight are awaited rather than sent
+        again. `throttle` is awaited only right before a real provider call,
+        so cache hits never wait on rate limits.
+        """
+        key = self._cache_key(system, user) if self.cache else None
+        if key and use_cache:
+            inflight = self._inflight()
+            if key in inflight:
+                response = await asyncio.shield(inflight[key])
+                self.cache.record_coalesced(response.total_tokens)
+                return replace(response, cached=True)
+            hit = self.cache.get(key)
+            if hit:
+                return LLMResponse(*hit, cached=True)
+
+        future = None
+        if key:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight()[key] = future
+        try:
+            if throttle is not None:
+                await throttle()
+            response = await self._acomplete(system, user, max_tokens)
+            self.usage.add(response)
+        except BaseException as e:
+            if future is not None:
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    future.exception()  # Retrieved here; waiters re-raise it themselves
+            raise
+        finally:
+            if key and self._inflight().get(key) is future:
+                del self._inflight()[key]
+
+        if key:
+            self.cache.put(key, response.text, response.input_tokens, response.output_tokens)
+            future.set_result(response)
+        return response
+
+    def _inflight(self) -> dict[str, asyncio.Future]:
+        if getattr(self, "_pending", None) is None:
+            self._pending: dict[str, asyncio.Future] = {}
+        return self._pending
+
+    @abstractmethod
+    def _complete(self, system: str, user: str, max_tokens: Optional[int] = None) -> LLMResponse:
+        ...
 
     @abstractmethod
-    def complete(self, system: str, user: str) -> str:
-        """Send a completion request and return the response text."""
+    async def _acomplete(
+        self, system: str, user: str, max_tokens: Optional[int] = None
+    ) -> LLMResponse:
         ...
 
+    def _async_client(self, factory):
+        """The async SDK client for the running event loop (created on first use;
+        a client's connection pool can't be reused across loops)."""
+        loop = asyncio.get_running_loop()
+        cached = getattr(self, "_aclient", None)
+        if cached is None or cached[0] is not loop:
+            self._aclient = (loop, factory())
+        return self._aclient[1]
+
+
+class BatchClient(LLMClient):
+    """LLM client that can also run provider batch jobs (see
+    processing/batch_api.py). Requests map a custom id to (system, user);
+    states are "running", "done" or "failed"."""
+
+    supports_batch = True
+
+    @abstractmethod
+    def submit_batch(self, requests: dict[str, tuple[str, str]]) -> str:
+        ...
+
+    @abstractmethod
+    def batch_state(self, job_id: str) -> str:
+        ...
 
-class ClaudeClient(LLMClient):
+    @abstractmethod
+    def batch_results(self, job_id: str) -> dict[str, Optional[LLMResponse]]:
+        """Responses by custom id; None for requests that did not succeed."""
+        ...
+
+
+class ClaudeClient(BatchClient):
     """Anthropic Claude client."""
 
+    provider = "claude"
+
     def __init__(self, model: str = "claude-haiku-4-5-20251001"):
         import anthropic
 
@@ -29,71 +271,250 @@ class ClaudeClient(LLMClient):
         )
         self.model = model
 
-    def complete(self, system: str, user: str) -> str:
-        response = self.client.messages.create(
+    def _request(self, system: str, user: str, max_tokens: Optional[int] = None) -> dict:
+        self._check_prefix(system)
+        if self.prompt_caching:
+            # Cache breakpoint after the system prompt: later calls read it
+            # from the cache (prompts under the model's minimum length are
+            # simply not cached)
+            system = [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+        return dict(
             model=self.model,
-            max_tokens=4096,
+            max_tokens=max_tokens or self.max_tokens,
             system=system,
             messages=[{"role": "user", "content": user}],
         )
-        return response.content[0].text
 
+    @staticmethod
+    def _response(response) -> LLMResponse:
+        usage = response.usage
+        cache_read = usage.cache_read_input_tokens or 0
+        cache_write = usage.cache_creation_input_tokens or 0
+        return LLMResponse(
+            text=response.content[0].text,
+            # Anthropic's input_tokens counts only the uncached remainder
+            input_tokens=usage.input_tokens + cache_read + cache_write,
+            output_tokens=usage.output_tokens,
+            cached_input_tokens=cache_read,
+            cache_write_tokens=cache_write,
+        )
+
+    def _complete(self, system: str, user: str, max_tokens: Optional[int] = None) -> LLMResponse:
+        request = self._request(system, user, max_tokens)
+        return self._response(self.client.messages.create(**request))
+
+    async def _acomplete(
+        self, system: str, user: str, max_tokens: Optional[int] = None
+    ) -> LLMResponse:
+        import anthropic
+
+        client = self._async_client(
+            lambda: anthropic.AsyncAnthropic(api_key=os.environ["ANTHROPIC_API_KEY"])
+        )
+        request = self._request(system, user, max_tokens)
+        return self._response(await client.messages.create(**request))
+
+    def submit_batch(self, requests: dict[str, tuple[str, str]]) -> str:
+        batch = self.client.messages.batches.create(
+            requests=[
+                {"custom_id": custom_id, "params": self._request(system, user)}
+                for custom_id, (system, user) in requests.items()
+            ]
+        )
+        return batch.id
+
+    def batch_state(self, job_id: str) -> str:
+        batch = self.client.messages.batches.retrieve(job_id)
+        return "done" if batch.processing_status == "ended" else "running"
 
-class OpenAIClient(LLMClient):
+    def batch_results(self, job_id: str) -> dict[str, Optional[LLMResponse]]:
+        # Errored, canceled and expired requests come back as None
+        return {
+            entry.custom_id: (
+                self._response(entry.result.message)
+                if entry.result.type == "succeeded"
+                else None
+            )
+            for entry in self.client.messages.batches.results(job_id)
+        }
+
+
+class OpenAIClient(BatchClient):
     """OpenAI client."""
 
+    provider = "openai"
+
     def __init__(self, model: str = "gpt-4o"):
         from openai import OpenAI
 
         self.client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
         self.model = model
 
-    def complete(self, system: str, user: str) -> str:
-        response = self.client.chat.completions.create(
+    def _request(self, system: str, user: str, max_tokens: Optional[int] = None) -> dict:
+        self._check_prefix(system)
+        # Static system message first so consecutive calls share a prefix
+        request = dict(
             model=self.model,
             messages=[
                 {"role": "system", "content": system},
                 {"role": "user", "content": user},
             ],
-            max_tokens=4096,
+            max_tokens=max_tokens or self.max_tokens,
+        )
+        hint = self._cache_hint(system) if self.prompt_caching else {}
+        if hint:
+            request["extra_body"] = hint
+        return request
+
+    def _cache_hint(self, system: str) -> dict:
+        """Route calls sharing a system prompt to the same prompt cache."""
+        return {"prompt_cache_key": hashlib.sha256(system.encode()).hexdigest()[:32]}
+
+    @staticmethod
+    def _response(response) -> LLMResponse:
+        usage = response.usage
+        if usage is None:
+            return LLMResponse(text=response.choices[0].message.content or "")
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None)
+        if cached is None:
+            # Moonshot reports it at the top level
+            cached = getattr(usage, "cached_tokens", None)
+        return LLMResponse(
+            text=response.choices[0].message.content or "",
+            input_tokens=usage.prompt_tokens,
+            output_tokens=usage.completion_tokens,
+            cached_input_tokens=cached or 0,
+        )
+
+    def _new_async_client(self):
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(api_key=os.environ["OPENAI_API_KEY"])
+
+    def _complete(self, system: str, user: str, max_tokens: Optional[int] = None) -> LLMResponse:
+        request = self._request(system, user, max_tokens)
+        return self._response(self.client.chat.completions.create(**request))
+
+    async def _acomplete(
+        self, system: str, user: str, max_tokens: Optional[int] = None
+    ) -> LLMResponse:
+        client = self._async_client(self._new_async_client)
+        request = self._request(system, user, max_tokens)
+        return self._response(await client.chat.completions.create(**request))
+
+    def _batch_body(self, system: str, user: str) -> dict:
+        # Batch lines are raw request bodies: extra_body fields go in directly
+        request = self._request(system, user)
+        request.update(request.pop("extra_body", {}))
+        return request
+
+    def submit_batch(self, requests: dict[str, tuple[str, str]]) -> str:
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._batch_body(system, user),
+            })
+            for custom_id, (system, user) in requests.items()
+        ]
+        upload = self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
         )
-        return response.choices[0].message.content or ""
+        return batch.id
 
+    def batch_state(self, job_id: str) -> str:
+        status = self.client.batches.retrieve(job_id).status
+        if status == "failed":
+            return "failed"
+        # Expired and cancelled batches still hand back what they finished
+        if status in ("completed", "expired", "cancelled"):
+            return "done"
+        return "running"
 
-class KimiClient(LLMClient):
+    def batch_results(self, job_id: str) -> dict[str, Optional[LLMResponse]]:
+        from openai.types.chat import ChatCompletion
+
+        batch = self.client.batches.retrieve(job_id)
+        results: dict[str, Optional[LLMResponse]] = {}
+        if not batch.output_file_id:
+            return results
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            response = row.get("response") or {}
+            results[row["custom_id"]] = (
+                self._response(ChatCompletion.model_validate(response["body"]))
+                if response.get("status_code") == 200
+                else None
+            )
+        return results
+
+
+class KimiClient(OpenAIClient):
     """Moonshot Kimi client (OpenAI-compatible API)."""
 
+    provider = "kimi"
+    max_tokens = 8192
+    base_url = "https://api.moonshot.ai/v1"
+
     def __init__(self, model: str = "kimi-k2.5"):
         from openai import OpenAI
 
+        self.base_url = os.getenv("MOONSHOT_BASE_URL", self.base_url)
         self.client = OpenAI(
             api_key=os.environ["MOONSHOT_API_KEY"],
-            base_url="https://api.moonshot.ai/v1",
+            base_url=self.base_url,
         )
         self.model = model
 
-    def complete(self, system: str, user: str) -> str:
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-            max_tokens=8192,
-        )
-        return response.choices[0].message.content or ""
+    def _new_async_client(self):
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(api_key=os.environ["MOONSHOT_API_KEY"], base_url=self.base_url)
 
+    def _cache_hint(self, system: str) -> dict:
+        # Moonshot caches shared prefixes automatically and takes no routing key
+        return {}
 
-def get_llm_client() -> LLMClient:
-    """Factory: create LLM client based on LLM_PROVIDER env var."""
-    provider = os.getenv("LLM_PROVIDER", "claude").lower()
 
+def llm_client_class(provider: Optional[str] = None) -> type[LLMClient]:
+    """The client class get_llm_client() creates for LLM_PROVIDER (or
+    `provider`), for capability checks before any client is set up."""
+    provider = (provider or os.getenv("LLM_PROVIDER", "claude")).lower()
+    return {"openai": OpenAIClient, "kimi": KimiClient}.get(provider, ClaudeClient)
+
+
+def get_llm_client(
+    use_cache: Optional[bool] = None, provider: Optional[str] = None
+) -> LLMClient:
+    """Factory: create LLM client based on LLM_PROVIDER env var (or `provider`).
+
+    The response cache is attached unless use_cache is False (or, when
+    use_cache is None, LLM_CACHE=0 is set).
+    """
+    provider = (provider or os.getenv("LLM_PROVIDER", "claude")).lower()
+
+    client: LLMClient
     if provider == "openai":
         model = os.getenv("OPENAI_MODEL", "gpt-4o")
-        return OpenAIClient(model=model)
+        client = OpenAIClient(model=model)
     elif provider == "kimi":
         model = os.getenv("KIMI_MODEL", "kimi-k2.5")
-        return KimiClient(model=model)
+        client = KimiClient(model=model)
     else:
         model = os.getenv("CLAUDE_MODEL", "claude-haiku-4-5-20251001")
-        return ClaudeClient(model=model)
+        client = ClaudeClient(model=model)
+
+    config = LLMConfig()
+    client.prompt_caching = config.prompt_caching
+    if use_cache if use_cache is not None else config.cache_responses:
+        client.cache = ResponseCache(config.cache_max_mb, config.cache_max_age_days)
+    return client
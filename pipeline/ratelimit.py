@@ -0,0 +1,88 @@
+"""
+Token-bucket rate limiting shared across scraper workers and LLM calls.
+"""
+
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe token bucket: `rate` requests per `per` seconds.
+
+    The bucket starts full so a short run can burst up to `burst` requests
+    before settling into the steady rate.
+    """
+
+    def __init__(self, rate: float, per: float = 60.0, burst: int | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.per = per
+        self.capacity = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate / self.per)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available. Returns seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                deficit = tokens - self._tokens
+                delay = deficit * self.per / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class AsyncRateLimiter:
+    """Token bucket for coroutines on one event loop: `rate` units per `per` seconds.
+
+    Like RateLimiter, but acquire() awaits instead of blocking the thread.
+    Costs that are only known afterwards (LLM tokens) can be settled with
+    charge(), which may leave the bucket in debt so later callers wait.
+    """
+
+    def __init__(self, rate: float, per: float = 60.0, burst: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.per = per
+        self.capacity = float(burst if burst is not None else max(1, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate / self.per)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait until `tokens` are available. Returns seconds spent waiting."""
+        # A single request larger than the bucket would otherwise never fit
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return waited
+            delay = (tokens - self._tokens) * self.per / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def charge(self, tokens: float) -> None:
+        """Take (or, if negative, give back) tokens without waiting."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - tokens)
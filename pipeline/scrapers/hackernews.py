@@ -1,148 +1,364 @@
 """Hacker News scraper using the Firebase API."""
 
 import asyncio
-from typing import Optional
+import threading
+import time
+from typing import Callable, Optional
 import httpx
 from rich.console import Console
 
 from pipeline.config import HNConfig
 from pipeline.models import RawMessage, RawThread
+from pipeline.cpu_stage import get_cpu_stage
 from pipeline.detection.argument_finder import find_argument_chains
+from pipeline.scrapers.hn_cache import ItemCache, load_changed_ids
 
 console = Console()
 
 
-async def _fetch_item(client: httpx.AsyncClient, item_id: int, base_url: str) -> Optional[dict]:
-    """Fetch a single HN item by ID."""
-    try:
-        resp = await client.get(f"{base_url}/item/{item_id}.json")
-        resp.raise_for_status()
-        return resp.json()
-    except Exception:
-        return None
-
-
-async def _fetch_comment_tree(
-    client: httpx.AsyncClient,
-    item_id: int,
-    base_url: str,
-    depth: int = 0,
-    max_depth: int = 20,
-) -> list[dict]:
-    """Recursively fetch a comment tree from HN API."""
-    if depth > max_depth:
-        return []
-
-    item = await _fetch_item(client, item_id, base_url)
-    if not item or item.get("type") != "comment" or item.get("dead") or item.get("deleted"):
-        return []
-
-    result = [
-        {
-            "id": str(item["id"]),
-            "parent_id": str(item.get("parent", "")),
-            "author": item.get("by", "[deleted]"),
-            "body": item.get("text", ""),
-            "score": None,  # HN comments don't expose scores
-            "timestamp": str(item.get("time", "")),
-            "depth": depth,
-        }
-    ]
-
-    kids = item.get("kids", [])
-    # Fetch child comments concurrently (limit concurrency)
-    tasks = [
-        _fetch_comment_tree(client, kid_id, base_url, depth + 1, max_depth)
-        for kid_id in kids[:10]  # Limit to first 10 children per level
-    ]
-    children = await asyncio.gather(*tasks)
-    for child_list in children:
-        result.extend(child_list)
-
-    return result
+class HNCrawler:
+    """Bounded-concurrency crawler for HN items.
+
+    Every request goes through one global semaphore plus a per-host
+    semaphore, and item fetches stop once the run's item or time budget
+    is spent (callers then work with whatever partial trees they have).
+    With an ItemCache, comments that have not changed since the last run
+    are served from disk and cost no requests.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        config: HNConfig,
+        cache: ItemCache | None = None,
+    ):
+        self.client = client
+        self.config = config
+        self.cache = cache
+        self._global = asyncio.Semaphore(config.max_concurrency)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self._deadline = time.monotonic() + config.time_budget_seconds
+        self.items_fetched = 0
+
+    def budget_left(self) -> bool:
+        """True while both the item and the time budget have room."""
+        return (
+            self.items_fetched < self.config.item_budget
+            and time.monotonic() < self._deadline
+        )
+
+    async def get_json(self, url: str):
+        """GET a JSON document under the global and per-host limits."""
+        host = httpx.URL(url).host
+        host_limit = self._hosts.setdefault(
+            host, asyncio.Semaphore(self.config.max_connections_per_host)
+        )
+        async with self._global, host_limit:
+            resp = await self.client.get(url)
+            resp.raise_for_status()
+            return resp.json()
+
+    async def load_updates(self) -> None:
+        """Mark items from the `updates` feed as stale in the cache."""
+        if not self.cache:
+            return
+        source = self.config.updates_url or f"{self.config.base_url}/updates.json"
+        try:
+            if source.startswith(("http://", "https://")):
+                data = await self.get_json(source)
+                self.cache.changed_ids = set(data.get("items", []))
+            else:
+                self.cache.changed_ids = load_changed_ids(source)
+        except Exception as e:
+            console.print(f"  [yellow]Could not load HN updates feed: {e}[/yellow]")
+
+    async def fetch_item(self, item_id: int, use_cache: bool = False) -> Optional[dict]:
+        """Fetch a single HN item by ID, or None once the budget is spent.
+
+        With `use_cache`, a trusted cached copy is returned without a request.
+        """
+        if use_cache and self.cache:
+            cached = self.cache.lookup(item_id)
+            if cached is not None:
+                return cached
+        if not self.budget_left():
+            return None
+        self.items_fetched += 1
+        try:
+            item = await self.get_json(f"{self.config.base_url}/item/{item_id}.json")
+        except Exception:
+            return None
+        if item and self.cache:
+            self.cache.put(item)
+        return item
+
+    async def fetch_comment_tree(
+        self,
+        kids: list[int],
+        max_depth: int = 20,
+        depth: int = 0,
+    ) -> tuple[list[dict], int]:
+        """Fetch the comment tree under a story (or, from `depth`, under a
+        comment), one level at a time.
+
+        Returns the flat comment list and how many comments were not in
+        the cache before this call.
+        """
+        result: list[dict] = []
+        new_comments = 0
+        frontier = [(kid_id, depth) for kid_id in kids]
+
+        while frontier:
+            if self.cache:
+                new_comments += sum(
+                    1 for kid_id, _ in frontier if self.cache.get(kid_id) is None
+                )
+            items = await asyncio.gather(
+                *(self.fetch_item(kid_id, use_cache=True) for kid_id, _ in frontier)
+            )
+            next_frontier: list[tuple[int, int]] = []
+
+            for (_, depth), item in zip(frontier, items):
+                if (
+                    not item
+                    or item.get("type") != "comment"
+                    or item.get("dead")
+                    or item.get("deleted")
+                ):
+                    continue
+
+                result.append(
+                    {
+                        "id": str(item["id"]),
+                        "parent_id": str(item.get("parent", "")),
+                        "author": item.get("by", "[deleted]"),
+                        "body": item.get("text", ""),
+                        "score": None,  # HN comments don't expose scores
+                        "timestamp": str(item.get("time", "")),
+                        "depth": depth,
+                    }
+                )
+                if depth < max_depth:
+                    next_frontier.extend(
+                        (kid_id, depth + 1) for kid_id in item.get("kids", [])
+                    )
+
+            frontier = next_frontier
+
+        return result, new_comments
+
+    async def crawl_story(self, story: dict, previous: Optional[dict]) -> list[dict]:
+        """Rebuild a story's comment tree, reusing cached comments.
+
+        Cached comments are trusted unless the updates feed lists them. If
+        that finds fewer new comments than the story's `descendants` grew
+        by, some changed parents were missed; unsettled comments are then
+        refetched until the difference is accounted for.
+        """
+        comment_tree, new_comments = await self.fetch_comment_tree(story["kids"])
+        if previous is not None and self.cache:
+            missing = (
+                story.get("descendants", 0) - previous.get("descendants", 0) - new_comments
+            )
+            if missing > 0:
+                comment_tree += await self.refresh_parents(comment_tree, missing)
+        return comment_tree
+
+    async def refresh_parents(self, comment_tree: list[dict], missing: int) -> list[dict]:
+        """Refetch unsettled cached comments, newest first, and crawl any
+        replies they gained, until `missing` new comments have turned up.
+        Comments fetched during this run are never refetched."""
+        known = {c["id"] for c in comment_tree}
+        candidates = sorted(
+            (c for c in comment_tree if self.cache.unsettled(int(c["id"]))),
+            key=lambda c: int(c["id"]),
+            reverse=True,
+        )
+        found: list[dict] = []
+        step = self.config.max_concurrency
+        start = 0
+        while start < len(candidates) and missing > 0 and self.budget_left():
+            # Each refetch that turns up replies brings at least one, so
+            # never refetch more parents at once than comments still missing
+            chunk = candidates[start : start + min(step, missing)]
+            start += len(chunk)
+            items = await asyncio.gather(*(self.fetch_item(int(c["id"])) for c in chunk))
+            for comment, item in zip(chunk, items):
+                new_kids = [k for k in (item or {}).get("kids", []) if str(k) not in known]
+                if not new_kids:
+                    continue
+                replies, _ = await self.fetch_comment_tree(
+                    new_kids, depth=comment["depth"] + 1
+                )
+                replies = [r for r in replies if r["id"] not in known]
+                known.update(r["id"] for r in replies)
+                found.extend(replies)
+                missing -= len(replies)
+        return found
+
+    async def fetch_story_ids(self, limit: int | None = None) -> list[int]:
+        """Merge story ids across story types, dropping duplicates."""
+        stories_limit = limit or self.config.stories_per_type
+        seen: set[int] = set()
+        merged: list[int] = []
+
+        for story_type in self.config.story_types:
+            console.print(f"  [dim]Fetching {story_type}...[/dim]")
+            try:
+                story_ids = await self.get_json(
+                    f"{self.config.base_url}/{story_type}.json"
+                )
+            except Exception as e:
+                console.print(f"  [red]Error fetching {story_type}: {e}[/red]")
+                continue
+
+            for story_id in story_ids[:stories_limit]:
+                if story_id not in seen:
+                    seen.add(story_id)
+                    merged.append(story_id)
+
+        return merged
+
+
+def _chains_to_threads(story: dict, comment_tree: list[dict], config: HNConfig) -> list[RawThread]:
+    """Find argument chains in a story's comments and wrap them as RawThreads."""
+    threads: list[RawThread] = []
+
+    chains = find_argument_chains(
+        comment_tree,
+        min_per_side=config.min_messages_per_side,
+    )
+
+    for chain in chains:
+        messages = [
+            RawMessage(
+                message_id=msg["id"],
+                author_id=msg["author"],
+                body=msg["body"],
+                timestamp=msg["timestamp"],
+                score=msg["score"],
+            )
+            for msg in chain["messages"]
+        ]
+
+        threads.append(
+            RawThread(
+                platform="hackernews",
+                source="HN",
+                url=f"https://news.ycombinator.com/item?id={story['id']}",
+                title=story.get("title"),
+                messages=messages,
+                participant_a=chain["participant_a"],
+                participant_b=chain["participant_b"],
+            )
+        )
+
+        console.print(
+            f"  [green]Found chain:[/green] {chain['participant_a']} vs {chain['participant_b']} "
+            f"({len(messages)} messages)"
+        )
+
+    return threads
 
 
 async def _scrape_stories(
     config: HNConfig,
     limit: int | None = None,
+    cache: ItemCache | None = None,
+    on_thread: Callable[[RawThread], None] | None = None,
+    cancel: threading.Event | None = None,
 ) -> list[RawThread]:
-    """Scrape HN stories for argument chains."""
+    """Scrape HN stories for argument chains.
+
+    Stories are crawled concurrently, comment-heavy ones (by `descendants`)
+    first, so the shared item budget goes where arguments are likeliest.
+    Each story's threads go to `on_thread` as soon as it is done; no new
+    story is started once `cancel` is set.
+    """
     threads: list[RawThread] = []
+    start = time.monotonic()
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for story_type in config.story_types:
-            console.print(f"  [dim]Fetching {story_type}...[/dim]")
+    limits = httpx.Limits(
+        max_connections=config.max_concurrency,
+        max_keepalive_connections=config.max_concurrency,
+    )
+    async with httpx.AsyncClient(timeout=30.0, limits=limits) as client:
+        crawler = HNCrawler(client, config, cache)
+        await crawler.load_updates()
 
-            try:
-                resp = await client.get(f"{config.base_url}/{story_type}.json")
-                resp.raise_for_status()
-                story_ids = resp.json()
-            except Exception as e:
-                console.print(f"  [red]Error fetching {story_type}: {e}[/red]")
-                continue
+        story_ids = await crawler.fetch_story_ids(limit)
+        previous = {sid: cache.get(sid) for sid in story_ids} if cache else {}
+        stories = await asyncio.gather(*(crawler.fetch_item(sid) for sid in story_ids))
+        stories = sorted(
+            (s for s in stories if s and s.get("kids")),
+            key=lambda s: s.get("descendants", 0),
+            reverse=True,
+        )
+        console.print(
+            f"  [dim]Crawling {len(stories)} stories "
+            f"({len(story_ids)} unique ids across {', '.join(config.story_types)})...[/dim]"
+        )
 
-            stories_limit = limit or config.stories_per_type
+        queue: asyncio.Queue[tuple[int, dict]] = asyncio.Queue()
+        for rank, story in enumerate(stories):
+            queue.put_nowait((rank, story))
+        results: dict[int, list[RawThread]] = {}
 
-            for story_id in story_ids[:stories_limit]:
-                story = await _fetch_item(client, story_id, config.base_url)
-                if not story or not story.get("kids"):
+        async def worker():
+            while not queue.empty():
+                if cancel is not None and cancel.is_set():
+                    return
+                rank, story = queue.get_nowait()
+                if not crawler.budget_left():
                     continue
-
-                # Fetch comment trees for this story
-                comment_tree: list[dict] = []
-                tasks = [
-                    _fetch_comment_tree(client, kid_id, config.base_url)
-                    for kid_id in story["kids"][:15]
-                ]
-                results = await asyncio.gather(*tasks)
-                for tree in results:
-                    comment_tree.extend(tree)
-
-                # Find argument chains
-                chains = find_argument_chains(
-                    comment_tree,
-                    min_per_side=config.min_messages_per_side,
+                comment_tree = await crawler.crawl_story(story, previous.get(story["id"]))
+                results[rank] = await get_cpu_stage().arun(
+                    _chains_to_threads, story, comment_tree, config, size=len(comment_tree)
                 )
+                if on_thread:
+                    for thread in results[rank]:
+                        on_thread(thread)
 
-                for chain in chains:
-                    messages = [
-                        RawMessage(
-                            author_id=msg["author"],
-                            body=msg["body"],
-                            timestamp=msg["timestamp"],
-                            score=msg["score"],
-                        )
-                        for msg in chain["messages"]
-                    ]
-
-                    threads.append(
-                        RawThread(
-                            platform="hackernews",
-                            source="HN",
-                            url=f"https://news.ycombinator.com/item?id={story_id}",
-                            title=story.get("title"),
-                            messages=messages,
-                            participant_a=chain["participant_a"],
-                            participant_b=chain["participant_b"],
-                        )
-                    )
+        await asyncio.gather(
+            *(worker() for _ in range(min(config.max_concurrent_stories, len(stories))))
+        )
 
-                    console.print(
-                        f"  [green]Found chain:[/green] {chain['participant_a']} vs {chain['participant_b']} "
-                        f"({len(messages)} messages)"
-                    )
+        for rank in sorted(results):
+            threads.extend(results[rank])
 
+    cache_note = ""
+    if cancel is not None and cancel.is_set():
+        return threads  # Abandoned by the orchestrator: leave the cache as it was
+    if cache:
+        cache.flush()
+        cache_note = f", {cache.hits} served from cache"
+    console.print(
+        f"  [dim]Fetched {crawler.items_fetched} items{cache_note} in "
+        f"{time.monotonic() - start:.1f}s[/dim]"
+    )
     return threads
 
 
 def scrape_hackernews(
     config: HNConfig | None = None,
     limit: int | None = None,
+    full_rescrape: bool = False,
+    on_thread: Callable[[RawThread], None] | None = None,
+    cancel: threading.Event | None = None,
 ) -> list[RawThread]:
-    """Main entry point: scrape Hacker News for argument threads."""
+    """Main entry point: scrape Hacker News for argument threads.
+
+    Unless `full_rescrape` is set, unchanged items come from the local cache.
+    Threads are also passed to `on_thread` story by story; the crawl stops
+    early once `cancel` is set.
+    """
     config = config or HNConfig()
     console.print("[bold cyan]Scraping Hacker News[/bold cyan]")
 
-    threads = asyncio.run(_scrape_stories(config, limit))
+    cache = None
+    if config.use_item_cache and not full_rescrape:
+        cache = ItemCache(config.settle_after_seconds)
+
+    threads = asyncio.run(_scrape_stories(config, limit, cache, on_thread, cancel))
     console.print(f"\n[bold]Total HN threads found: {len(threads)}[/bold]")
     return threads
@@ -0,0 +1,107 @@
+"""
+Persistent HN item cache for incremental recrawls.
+
+HN items barely change once a thread cools down, so fetched items are kept
+on disk (item JSON + fetch time). Which cached items are stale is decided
+from the Firebase `updates` feed of recently changed item ids, or from a
+local JSON file standing in for it. The feed only covers the last few
+minutes, so comments fetched while their thread was still live are also
+flagged as unsettled for the crawler's targeted refresh.
+"""
+
+import json
+import os
+import time
+from typing import Optional
+
+from pipeline.state import open_state_db
+
+
+def load_changed_ids(source: str) -> set[int]:
+    """Read the changed-item ids from a local updates.json stand-in."""
+    if not source or not os.path.exists(source):
+        return set()
+    with open(source) as f:
+        data = json.load(f)
+    return set(data.get("items", []))
+
+
+class ItemCache:
+    """On-disk item id -> (item JSON, fetched_at) store."""
+
+    def __init__(self, settle_after_seconds: float, db_name: str = "hn_items"):
+        self.settle_after_seconds = settle_after_seconds
+        self.changed_ids: set[int] = set()
+        self._conn = open_state_db(db_name)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS hn_items (
+                item_id INTEGER PRIMARY KEY,
+                item_json TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._pending: dict[int, tuple[str, float]] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def _row(self, item_id: int) -> Optional[tuple[str, float]]:
+        if item_id in self._pending:
+            return self._pending[item_id]
+        return self._conn.execute(
+            "SELECT item_json, fetched_at FROM hn_items WHERE item_id = ?", (item_id,)
+        ).fetchone()
+
+    def get(self, item_id: int) -> Optional[dict]:
+        """Return the cached item JSON, if any, regardless of staleness."""
+        row = self._row(item_id)
+        return json.loads(row[0]) if row else None
+
+    def unsettled(self, item_id: int) -> bool:
+        """True if the cached copy is from an earlier run and was fetched
+        within `settle_after_seconds` of the item's creation, so it may
+        have gained replies since."""
+        if item_id in self._pending:
+            return False
+        row = self._row(item_id)
+        if row is None:
+            return False
+        data, fetched_at = row
+        return fetched_at - json.loads(data).get("time", 0) < self.settle_after_seconds
+
+    def lookup(self, item_id: int) -> Optional[dict]:
+        """Return a cached item that can be trusted, or None to refetch.
+        Items in the updates feed are stale unless fetched this run."""
+        if item_id in self.changed_ids:
+            self.misses += 1
+            return None
+        item = self.get(item_id)
+        if item is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return item
+
+    def put(self, item: dict) -> None:
+        self._pending[item["id"]] = (json.dumps(item), time.time())
+        self.changed_ids.discard(item["id"])
+
+    def flush(self) -> None:
+        """Write items fetched this run to disk."""
+        if not self._pending:
+            return
+        self._conn.executemany(
+            """
+            INSERT INTO hn_items (item_id, item_json, fetched_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(item_id) DO UPDATE SET
+                item_json = excluded.item_json,
+                fetched_at = excluded.fetched_at
+            """,
+            [(item_id, data, at) for item_id, (data, at) in self._pending.items()],
+        )
+        self._conn.commit()
+        self._pending = {}
@@ -1,31 +1,64 @@
 """Reddit scraper using PRAW."""
 
 import os
-from typing import Generator
+import threading
+from typing import Callable, Generator
 import praw
 from rich.console import Console
 from dotenv import load_dotenv
 
 from pipeline.config import RedditConfig
 from pipeline.models import RawMessage, RawThread
+from pipeline.cpu_stage import get_cpu_stage
 from pipeline.detection.argument_finder import find_argument_chains
+from pipeline.scrapers.reddit_expansion import ExpansionPlanner
+from pipeline.scrapers.reddit_state import PostStateStore
 
 load_dotenv()
 console = Console()
 
 
-def get_reddit_client() -> praw.Reddit:
-    """Create a PRAW Reddit client from env vars."""
+def load_reddit_credentials() -> list[tuple[str, str]]:
+    """Return every configured (client_id, client_secret) OAuth app pair.
+
+    The primary app comes from REDDIT_CLIENT_ID / REDDIT_CLIENT_SECRET.
+    Extra apps can be listed in REDDIT_EXTRA_CREDENTIALS as
+    comma-separated "client_id:client_secret" entries.
+    """
+    credentials = [
+        (os.environ["REDDIT_CLIENT_ID"], os.environ["REDDIT_CLIENT_SECRET"])
+    ]
+    for entry in os.environ.get("REDDIT_EXTRA_CREDENTIALS", "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        client_id, _, client_secret = entry.partition(":")
+        if client_id and client_secret:
+            credentials.append((client_id, client_secret))
+    return credentials
+
+
+def get_reddit_client(
+    credential: tuple[str, str] | None = None,
+    **kwargs,
+) -> praw.Reddit:
+    """Create a PRAW Reddit client from env vars (or an explicit credential)."""
+    client_id, client_secret = credential or (
+        os.environ["REDDIT_CLIENT_ID"],
+        os.environ["REDDIT_CLIENT_SECRET"],
+    )
     return praw.Reddit(
-        client_id=os.environ["REDDIT_CLIENT_ID"],
-        client_secret=os.environ["REDDIT_CLIENT_SECRET"],
+        client_id=client_id,
+        client_secret=client_secret,
         user_agent=os.environ.get("REDDIT_USER_AGENT", "threadbeef-scraper/1.0"),
+        **kwargs,
     )
 
 
 def _comment_to_raw(comment) -> RawMessage:
     """Convert a PRAW comment to a RawMessage."""
     return RawMessage(
+        message_id=comment.id,
         author_id=str(comment.author) if comment.author else "[deleted]",
         body=comment.body,
         timestamp=str(comment.created_utc),
@@ -34,29 +67,73 @@ def _comment_to_raw(comment) -> RawMessage:
     )
 
 
-def _extract_comment_tree(comment, depth: int = 0, max_depth: int = 20) -> list[dict]:
-    """Recursively extract comment tree as flat list with parent info."""
-    if depth > max_depth:
-        return []
-
-    result = [
-        {
-            "id": comment.id,
-            "parent_id": comment.parent_id,
-            "author": str(comment.author) if comment.author else "[deleted]",
-            "body": comment.body,
-            "score": comment.score,
-            "timestamp": str(comment.created_utc),
-            "depth": depth,
-        }
-    ]
+def _fetch_posts(sub, sort_mode: str, posts_limit: int):
+    """Return the listing generator for one sort mode of a subreddit."""
+    if sort_mode == "hot":
+        return sub.hot(limit=posts_limit)
+    if sort_mode == "top":
+        return sub.top(limit=posts_limit, time_filter="week")
+    return sub.controversial(limit=posts_limit, time_filter="week")
+
+
+def _chains_to_threads(
+    comment_tree: list[dict],
+    subreddit_name: str,
+    url: str,
+    title: str,
+    config: RedditConfig,
+) -> list[RawThread]:
+    """Find argument chains in a post's comments and wrap them as RawThreads."""
+    chains = find_argument_chains(
+        comment_tree,
+        min_per_side=config.min_messages_per_side,
+    )
+
+    threads: list[RawThread] = []
+    for chain in chains:
+        messages = [
+            RawMessage(
+                message_id=msg["id"],
+                author_id=msg["author"],
+                body=msg["body"],
+                timestamp=msg["timestamp"],
+                score=msg["score"],
+            )
+            for msg in chain["messages"]
+        ]
+
+        threads.append(
+            RawThread(
+                platform="reddit",
+                source=f"r/{subreddit_name}",
+                url=url,
+                title=title,
+                messages=messages,
+                participant_a=chain["participant_a"],
+                participant_b=chain["participant_b"],
+            )
+        )
+    return threads
 
-    if hasattr(comment, "replies"):
-        comment.replies.replace_more(limit=0)
-        for reply in comment.replies:
-            result.extend(_extract_comment_tree(reply, depth + 1, max_depth))
 
-    return result
+def _scrape_post(post, subreddit_name: str, config: RedditConfig) -> list[RawThread]:
+    """Load one post's comment forest and extract its argument chains."""
+    planner = ExpansionPlanner(
+        budget=config.more_comments_budget,
+        top_level_limit=config.top_level_more_limit,
+    )
+    comment_tree = planner.expand(post)
+
+    # Chain detection is CPU-bound: large trees go to the process pool
+    return get_cpu_stage().run(
+        _chains_to_threads,
+        comment_tree,
+        subreddit_name,
+        f"https://reddit.com{post.permalink}",
+        post.title,
+        config,
+        size=len(comment_tree),
+    )
 
 
 def scrape_subreddit(
@@ -64,8 +141,15 @@ def scrape_subreddit(
     subreddit_name: str,
     config: RedditConfig,
     limit: int | None = None,
+    state: PostStateStore | None = None,
+    cancel: threading.Event | None = None,
 ) -> Generator[RawThread, None, None]:
-    """Scrape a subreddit for argument chains."""
+    """Scrape a subreddit for argument chains.
+
+    When a PostStateStore is given, posts already handled this run or
+    without enough new comments since the last run are skipped. Stops
+    before the next post once `cancel` is set.
+    """
     sub = reddit.subreddit(subreddit_name)
     posts_limit = limit or config.posts_per_subreddit
 
@@ -74,64 +158,66 @@ def scrape_subreddit(
             f"  [dim]Fetching {sort_mode} posts from r/{subreddit_name}...[/dim]"
         )
 
-        if sort_mode == "hot":
-            posts = sub.hot(limit=posts_limit)
-        elif sort_mode == "top":
-            posts = sub.top(limit=posts_limit, time_filter="week")
-        else:
-            posts = sub.controversial(limit=posts_limit, time_filter="week")
-
-        for post in posts:
-            post.comments.replace_more(limit=3)
-            comment_tree = []
-            for top_level in post.comments:
-                comment_tree.extend(_extract_comment_tree(top_level))
-
-            # Find argument chains in this post's comments
-            chains = find_argument_chains(
-                comment_tree,
-                min_per_side=config.min_messages_per_side,
-            )
-
-            for chain in chains:
-                messages = [
-                    RawMessage(
-                        author_id=msg["author"],
-                        body=msg["body"],
-                        timestamp=msg["timestamp"],
-                        score=msg["score"],
-                    )
-                    for msg in chain["messages"]
-                ]
-
-                yield RawThread(
-                    platform="reddit",
-                    source=f"r/{subreddit_name}",
-                    url=f"https://reddit.com{post.permalink}",
-                    title=post.title,
-                    messages=messages,
-                    participant_a=chain["participant_a"],
-                    participant_b=chain["participant_b"],
-                )
+        for post in _fetch_posts(sub, sort_mode, posts_limit):
+            if cancel is not None and cancel.is_set():
+                return
+            if state and not state.claim(post.id, post.num_comments):
+                continue
+            threads = _scrape_post(post, subreddit_name, config)
+            yield from threads
+            if state:
+                state.record(post.id, post.num_comments, {t.url for t in threads})
 
 
 def scrape_reddit(
     config: RedditConfig | None = None,
     subreddits: list[str] | None = None,
     limit: int | None = None,
+    workers: int | None = None,
+    full_rescrape: bool = False,
+    state: PostStateStore | None = None,
+    on_thread: Callable[[RawThread], None] | None = None,
+    cancel: threading.Event | None = None,
 ) -> list[RawThread]:
-    """Main entry point: scrape Reddit for argument threads."""
+    """Main entry point: scrape Reddit for argument threads.
+
+    With more than one worker, subreddits and posts are fanned out over a
+    thread pool (see reddit_pool.scrape_reddit_parallel). Unless
+    `full_rescrape` is set, posts that barely changed since the last run
+    are skipped. Scraped posts are recorded in `state` for the caller to
+    commit once their threads have been processed.
+
+    Each thread is also passed to `on_thread` as soon as its post is done,
+    and the scrape stops early once `cancel` is set.
+    """
     config = config or RedditConfig()
-    reddit = get_reddit_client()
     targets = subreddits or config.subreddits
+    workers = workers or config.workers
+    if state is None:
+        state = PostStateStore(0 if full_rescrape else config.min_new_comments)
+
+    if workers > 1:
+        from pipeline.scrapers.reddit_pool import scrape_reddit_parallel
+
+        threads = scrape_reddit_parallel(
+            config, targets, limit, workers, state, on_thread, cancel
+        )
+        console.print(f"[dim]Posts: {state.summary()}[/dim]")
+        return threads
+
+    reddit = get_reddit_client()
 
     threads: list[RawThread] = []
 
     for sub_name in targets:
+        if cancel is not None and cancel.is_set():
+            break
         console.print(f"[bold cyan]Scraping r/{sub_name}[/bold cyan]")
         try:
-            for thread in scrape_subreddit(reddit, sub_name, config, limit):
+            for thread in scrape_subreddit(reddit, sub_name, config, limit, state, cancel):
                 threads.append(thread)
+                if on_thread:
+                    on_thread(thread)
                 console.print(
                     f"  [green]Found chain:[/green] {thread.participant_a} vs {thread.participant_b} "
                     f"({len(thread.messages)} messages)"
@@ -139,5 +225,6 @@ def scrape_reddit(
         except Exception as e:
             console.print(f"  [red]Error scraping r/{sub_name}: {e}[/red]")
 
+    console.print(f"[dim]Posts: {state.summary()}[/dim]")
     console.print(f"\n[bold]Total threads found: {len(threads)}[/bold]")
     return threads
@@ -0,0 +1,132 @@
+"""
+Budget-aware MoreComments expansion for Reddit comment forests.
+
+Reddit truncates deep or wide comment trees behind MoreComments stubs
+("load more" / "continue this thread"), and each one costs an API request
+to resolve. Long two-person fights live at exactly those depths, so rather
+than resolving stubs blindly, the planner spends a per-post request budget
+on stubs whose ancestors already show an alternating two-author exchange,
+most promising first. Top-level fan-out gets its own small allowance and
+never touches the budget.
+"""
+
+import heapq
+import itertools
+import math
+
+from praw.models import MoreComments
+
+
+def _bare_id(fullname: str) -> str:
+    """Strip the Reddit type prefix ("t1_", "t3_") from a fullname."""
+    return fullname.split("_", 1)[1] if "_" in fullname else fullname
+
+
+def _comment_record(comment, depth: int) -> dict:
+    return {
+        "id": comment.id,
+        "parent_id": _bare_id(comment.parent_id),
+        "author": str(comment.author) if comment.author else "[deleted]",
+        "body": comment.body,
+        "score": comment.score,
+        "timestamp": str(comment.created_utc),
+        "depth": depth,
+    }
+
+
+def chain_promise(parent_id: str, records: dict[str, dict], hidden_count: int = 0) -> float:
+    """Cheap estimate of how likely a stub under `parent_id` continues a fight.
+
+    Walks up from the parent while the path stays within two authors and
+    scores the length of the alternating exchange found. Returns 0.0 when
+    the ancestors are not a two-author exchange with at least one
+    back-and-forth (A -> B -> A).
+    """
+    pair: set[str] = set()
+    alternations = 0
+    length = 0
+    prev = None
+
+    node = records.get(parent_id)
+    while node is not None and node["author"] != "[deleted]":
+        author = node["author"]
+        if author not in pair:
+            if len(pair) == 2:
+                break
+            pair.add(author)
+        if prev is not None and author != prev:
+            alternations += 1
+        prev = author
+        length += 1
+        node = records.get(node["parent_id"])
+
+    if len(pair) < 2 or alternations < 2:
+        return 0.0
+
+    # Alternation dominates; larger hidden batches break ties.
+    return alternations + 0.25 * length + 0.1 * math.log1p(hidden_count)
+
+
+class ExpansionPlanner:
+    """Resolves MoreComments stubs under a per-post request budget."""
+
+    def __init__(self, budget: int, top_level_limit: int = 3):
+        self.budget = budget
+        self.top_level_limit = top_level_limit
+        self.records: dict[str, dict] = {}
+        self.requests = 0
+        self._top_level: list[MoreComments] = []
+        self._queue: list[tuple[float, int, MoreComments]] = []
+        self._deferred: list[MoreComments] = []
+        self._tiebreak = itertools.count()
+
+    def _walk(self, items) -> None:
+        """Record every comment under `items` and collect their stubs."""
+        stack = [item for item in reversed(list(items))]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, MoreComments):
+                if item.parent_id.startswith("t3_"):
+                    self._top_level.append(item)
+                else:
+                    self._deferred.append(item)
+                continue
+            if item.id in self.records:
+                continue
+            parent = self.records.get(_bare_id(item.parent_id))
+            depth = parent["depth"] + 1 if parent else 0
+            self.records[item.id] = _comment_record(item, depth)
+            stack.extend(reversed(list(item.replies)))
+
+    def _schedule_deferred(self) -> None:
+        """Score newly found nested stubs; unpromising ones are dropped."""
+        for more in self._deferred:
+            promise = chain_promise(_bare_id(more.parent_id), self.records, more.count)
+            if promise > 0:
+                heapq.heappush(self._queue, (-promise, next(self._tiebreak), more))
+        self._deferred = []
+
+    def _resolve(self, more: MoreComments) -> None:
+        self.requests += 1
+        self._walk(more.comments(update=True))
+
+    def expand(self, post) -> list[dict]:
+        """Return the post's flat comment tree after planned expansion."""
+        self._walk(post.comments)
+
+        # Generic top-level fan-out: biggest batches first, fixed allowance
+        self._top_level.sort(key=lambda m: m.count, reverse=True)
+        for more in self._top_level[: self.top_level_limit]:
+            self._resolve(more)
+        self._top_level = []
+        self._schedule_deferred()
+
+        spent = 0
+        while self._queue and spent < self.budget:
+            _, _, more = heapq.heappop(self._queue)
+            self._resolve(more)
+            spent += 1
+            self._top_level = []
+            self._schedule_deferred()
+
+        return list(self.records.values())
@@ -0,0 +1,241 @@
+"""
+Concurrent Reddit scraping over a worker pool.
+
+Subreddit listings and individual posts are fanned out across threads.
+Every worker owns its own PRAW client (PRAW is not thread-safe), clients
+are assigned round-robin from the configured OAuth app credentials, and
+every HTTP request draws from its credential's own requests-per-minute
+budget, however many workers share that credential.
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable
+
+import prawcore
+from rich.console import Console
+from rich.table import Table
+
+from pipeline.config import RedditConfig
+from pipeline.models import RawThread
+from pipeline.ratelimit import RateLimiter
+from pipeline.scrapers.reddit import (
+    _fetch_posts,
+    _scrape_post,
+    get_reddit_client,
+    load_reddit_credentials,
+)
+from pipeline.scrapers.reddit_state import PostStateStore
+
+console = Console()
+
+
+@dataclass
+class WorkerStats:
+    """Per-worker counters for the end-of-run timing summary."""
+
+    name: str
+    credential: str
+    tasks: int = 0
+    threads: int = 0
+    requests: int = 0
+    busy_seconds: float = 0.0
+    throttled_seconds: float = 0.0
+
+
+class _BudgetedRequestor(prawcore.Requestor):
+    """PRAW requestor that draws every HTTP request from its credential's budget."""
+
+    def __init__(self, *args, limiter: RateLimiter, stats: WorkerStats, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._limiter = limiter
+        self._stats = stats
+
+    def request(self, *args, **kwargs):
+        self._stats.throttled_seconds += self._limiter.acquire()
+        self._stats.requests += 1
+        return super().request(*args, **kwargs)
+
+
+class _ClientPool:
+    """Hands each worker thread its own PRAW client, rotating credentials."""
+
+    def __init__(self, credentials: list[tuple[str, str]], requests_per_minute: int):
+        self._credentials = itertools.cycle(credentials)
+        # One bucket per OAuth app: Reddit enforces the limit per client id
+        self._limiters = {
+            client_id: RateLimiter(requests_per_minute, per=60.0)
+            for client_id, _ in credentials
+        }
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats: list[WorkerStats] = []
+
+    def get(self):
+        """Return (reddit, stats) for the calling worker thread."""
+        if not hasattr(self._local, "reddit"):
+            with self._lock:
+                client_id, client_secret = next(self._credentials)
+                stats = WorkerStats(
+                    name=threading.current_thread().name,
+                    credential=f"…{client_id[-4:]}",
+                )
+                self.stats.append(stats)
+            self._local.stats = stats
+            self._local.reddit = get_reddit_client(
+                (client_id, client_secret),
+                requestor_class=_BudgetedRequestor,
+                requestor_kwargs={"limiter": self._limiters[client_id], "stats": stats},
+            )
+        return self._local.reddit, self._local.stats
+
+
+def _list_posts(
+    pool: _ClientPool,
+    subreddit_name: str,
+    sort_mode: str,
+    posts_limit: int,
+    state: PostStateStore,
+) -> list[tuple[str, int]]:
+    """Fetch one listing and return (post id, num_comments) for posts to scrape."""
+    reddit, stats = pool.get()
+    start = time.perf_counter()
+    try:
+        console.print(
+            f"  [dim]Fetching {sort_mode} posts from r/{subreddit_name}...[/dim]"
+        )
+        sub = reddit.subreddit(subreddit_name)
+        return [
+            (post.id, post.num_comments)
+            for post in _fetch_posts(sub, sort_mode, posts_limit)
+            if state.claim(post.id, post.num_comments)
+        ]
+    finally:
+        stats.tasks += 1
+        stats.busy_seconds += time.perf_counter() - start
+
+
+def _scrape_post_task(
+    pool: _ClientPool,
+    subreddit_name: str,
+    post_id: str,
+    config: RedditConfig,
+) -> list[RawThread]:
+    """Load one post on this worker's client and extract its chains."""
+    reddit, stats = pool.get()
+    start = time.perf_counter()
+    try:
+        threads = _scrape_post(reddit.submission(id=post_id), subreddit_name, config)
+        stats.threads += len(threads)
+        return threads
+    finally:
+        stats.tasks += 1
+        stats.busy_seconds += time.perf_counter() - start
+
+
+def _print_worker_summary(stats: list[WorkerStats], wall_seconds: float) -> None:
+    table = Table(title=f"Reddit workers ({wall_seconds:.1f}s wall)")
+    table.add_column("Worker", style="cyan")
+    table.add_column("Credential")
+    table.add_column("Tasks", justify="right")
+    table.add_column("Requests", justify="right")
+    table.add_column("Chains", justify="right")
+    table.add_column("Busy", justify="right")
+    table.add_column("Throttled", justify="right")
+    table.add_column("Utilization", justify="right")
+
+    for s in sorted(stats, key=lambda s: s.name):
+        utilization = s.busy_seconds / wall_seconds if wall_seconds else 0.0
+        table.add_row(
+            s.name,
+            s.credential,
+            str(s.tasks),
+            str(s.requests),
+            str(s.threads),
+            f"{s.busy_seconds:.1f}s",
+            f"{s.throttled_seconds:.1f}s",
+            f"{utilization:.0%}",
+        )
+
+    console.print(table)
+
+
+def scrape_reddit_parallel(
+    config: RedditConfig,
+    subreddits: list[str],
+    limit: int | None,
+    workers: int,
+    state: PostStateStore,
+    on_thread: Callable[[RawThread], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> list[RawThread]:
+    """Scrape subreddits concurrently on `workers` threads.
+
+    Threads go to `on_thread` post by post as results come in; once
+    `cancel` is set, queued work is dropped and no new posts are started.
+    """
+    credentials = load_reddit_credentials()
+    pool = _ClientPool(credentials, config.requests_per_minute)
+    posts_limit = limit or config.posts_per_subreddit
+
+    console.print(
+        f"[bold cyan]Scraping {len(subreddits)} subreddits on {workers} workers "
+        f"({len(credentials)} credential(s), "
+        f"{config.requests_per_minute} req/min each)[/bold cyan]"
+    )
+
+    threads: list[RawThread] = []
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reddit") as executor:
+        # future -> (subreddit, post id and comment count, or None for a listing)
+        running = {
+            executor.submit(
+                _list_posts, pool, sub_name, sort_mode, posts_limit, state
+            ): (sub_name, None)
+            for sub_name in subreddits
+            for sort_mode in config.sort_modes
+        }
+        try:
+            while running and not (cancel is not None and cancel.is_set()):
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    sub_name, post = running.pop(future)
+                    if post is None:
+                        try:
+                            posts = future.result()
+                        except Exception as e:
+                            console.print(f"  [red]Error listing r/{sub_name}: {e}[/red]")
+                            continue
+                        for post_id, num_comments in posts:
+                            task = executor.submit(
+                                _scrape_post_task, pool, sub_name, post_id, config
+                            )
+                            running[task] = (sub_name, (post_id, num_comments))
+                        continue
+
+                    try:
+                        post_threads = future.result()
+                    except Exception as e:
+                        console.print(f"  [red]Error scraping post in r/{sub_name}: {e}[/red]")
+                        continue
+                    for thread in post_threads:
+                        threads.append(thread)
+                        console.print(
+                            f"  [green]Found chain:[/green] {thread.participant_a} vs {thread.participant_b} "
+                            f"({len(thread.messages)} messages, {thread.source})"
+                        )
+                        if on_thread:
+                            on_thread(thread)
+                    post_id, num_comments = post
+                    state.record(post_id, num_comments, {t.url for t in post_threads})
+        finally:
+            # Cancelled (or failing): drop the queued posts, let running ones finish
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    _print_worker_summary(pool.stats, time.perf_counter() - start)
+    console.print(f"\n[bold]Total threads found: {len(threads)}[/bold]")
+    return threads
@@ -0,0 +1,99 @@
+"""
+Persistent per-post scrape state for incremental Reddit runs.
+
+Remembers each post's comment count at the time we last scraped it so
+hourly runs only re-download comment forests that actually grew, and
+makes sure a post listed under several sort modes is processed once.
+Scraped posts are only saved once the run has processed their threads
+(commit()), so a dry run or a failed enrichment doesn't mark them done.
+"""
+
+import threading
+import time
+
+from pipeline.state import open_state_db
+
+
+class PostStateStore:
+    """On-disk post id -> (num_comments, last_scraped_at) store."""
+
+    def __init__(self, min_new_comments: int = 10, db_name: str = "reddit_posts"):
+        self.min_new_comments = min_new_comments
+        self._conn = open_state_db(db_name)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reddit_posts (
+                post_id TEXT PRIMARY KEY,
+                num_comments INTEGER NOT NULL,
+                last_scraped_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._claimed: set[str] = set()
+        self._pending: dict[str, tuple[int, set[str]]] = {}
+
+        self.duplicates = 0
+        self.unchanged = 0
+
+    def claim(self, post_id: str, num_comments: int) -> bool:
+        """Return True if this post should be scraped in the current run.
+
+        A post is claimed at most once per run (sort modes overlap) and is
+        skipped when it gained fewer than `min_new_comments` comments since
+        the last scrape.
+        """
+        with self._lock:
+            if post_id in self._claimed:
+                self.duplicates += 1
+                return False
+            self._claimed.add(post_id)
+
+            row = self._conn.execute(
+                "SELECT num_comments FROM reddit_posts WHERE post_id = ?",
+                (post_id,),
+            ).fetchone()
+
+        if row is not None and num_comments - row[0] < self.min_new_comments:
+            with self._lock:
+                self.unchanged += 1
+            return False
+        return True
+
+    def record(self, post_id: str, num_comments: int, urls: set[str]) -> None:
+        """Note that `post_id` was scraped with `num_comments` comments,
+        yielding threads at `urls`. Nothing is saved until commit()."""
+        with self._lock:
+            self._pending[post_id] = (num_comments, urls)
+
+    def commit(self, skip_urls: set[str] = frozenset()) -> int:
+        """Save the recorded posts, except those with a thread at one of
+        `skip_urls` (its enrichment failed, so the post must be rescraped).
+        Returns how many posts were saved."""
+        now = time.time()
+        with self._lock:
+            rows = [
+                (post_id, num_comments, now)
+                for post_id, (num_comments, urls) in self._pending.items()
+                if not urls & skip_urls
+            ]
+            self._conn.executemany(
+                """
+                INSERT INTO reddit_posts (post_id, num_comments, last_scraped_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(post_id) DO UPDATE SET
+                    num_comments = excluded.num_comments,
+                    last_scraped_at = excluded.last_scraped_at
+                """,
+                rows,
+            )
+            self._conn.commit()
+            self._pending.clear()
+        return len(rows)
+
+    def summary(self) -> str:
+        return (
+            f"{len(self._claimed) - self.unchanged} scraped, "
+            f"{self.unchanged} unchanged, {self.duplicates} duplicate listings skipped"
+        )
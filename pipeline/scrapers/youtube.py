@@ -2,19 +2,56 @@
 falls back to yt-dlp when it's exhausted or no API key is set."""
 
 import asyncio
+import heapq
+import threading
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Callable, Optional
 import httpx
 from rich.console import Console
 from yt_dlp import YoutubeDL
 
 from pipeline.config import YouTubeConfig
 from pipeline.models import RawMessage, RawThread
+from pipeline.cpu_stage import get_cpu_stage
 from pipeline.detection.argument_finder import find_argument_chains
+from pipeline.scrapers.youtube_quota import QuotaAccountant, QuotaExceeded
+from pipeline.scrapers.youtube_search_cache import SearchCache
+from pipeline.scrapers.ytdlp_pool import YtDlpPool
 
 console = Console()
 
 API_BASE = "https://www.googleapis.com/youtube/v3"
+VIDEOS_BATCH_SIZE = 50  # videos.list accepts up to 50 ids per call
+
+
+async def _api_get(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    params: dict,
+    quota: QuotaAccountant | None = None,
+) -> dict:
+    """GET an API endpoint, charging the call against the daily quota.
+
+    The units are reserved before calling (and refunded if no response
+    comes back). Raises QuotaExceeded without calling if the remaining
+    quota can't cover the call.
+    """
+    if quota and not quota.reserve(endpoint):
+        raise QuotaExceeded(endpoint)
+
+    try:
+        resp = await client.get(f"{API_BASE}/{endpoint}", params=params)
+    except BaseException:
+        # Connection error, timeout or cancellation: nothing to show the
+        # call was served, so don't hold its units against later calls
+        if quota:
+            quota.refund(endpoint)
+        raise
+    if quota and resp.status_code == 403 and "quotaExceeded" in resp.text:
+        quota.mark_exhausted()
+    resp.raise_for_status()
+    return resp.json()
 
 
 async def _search_debate_videos(
@@ -22,14 +59,27 @@ async def _search_debate_videos(
     api_key: str,
     queries: list[str],
     max_per_query: int = 5,
+    quota: QuotaAccountant | None = None,
+    cache: SearchCache | None = None,
+    concurrency: int = 4,
+    language: str = "en",
 ) -> list[str]:
     """Search YouTube for debate-heavy videos using curated queries.
     Returns deduplicated list of video IDs.
+
+    Queries run concurrently (up to `concurrency` at once); results found
+    in the search cache are reused without spending quota.
     """
-    video_ids: list[str] = []
-    seen: set[str] = set()
+    limit = asyncio.Semaphore(concurrency)
+    quota_skipped = 0
+
+    async def search(query: str) -> list[str]:
+        nonlocal quota_skipped
+        if cache:
+            cached = cache.get(query, language, max_per_query)
+            if cached is not None:
+                return cached
 
-    for query in queries:
         params = {
             "part": "id",
             "q": query,
@@ -37,19 +87,39 @@ async def _search_debate_videos(
             "key": api_key,
             "maxResults": max_per_query,
             "order": "relevance",
-            "relevanceLanguage": "en",
+            "relevanceLanguage": language,
         }
         try:
-            resp = await client.get(f"{API_BASE}/search", params=params)
-            resp.raise_for_status()
-            data = resp.json()
-            for item in data.get("items", []):
-                vid = item["id"]["videoId"]
-                if vid not in seen:
-                    seen.add(vid)
-                    video_ids.append(vid)
+            async with limit:
+                data = await _api_get(client, "search", params, quota)
+        except QuotaExceeded:
+            quota_skipped += 1
+            return []
         except Exception as e:
             console.print(f"  [red]Search error for '{query}': {e}[/red]")
+            return []
+
+        found = [item["id"]["videoId"] for item in data.get("items", [])]
+        if cache:
+            cache.put(query, language, max_per_query, found)
+        return found
+
+    results = await asyncio.gather(*(search(q) for q in queries))
+
+    if quota_skipped:
+        console.print(
+            f"  [yellow]Not enough quota left for search; "
+            f"skipped {quota_skipped} queries[/yellow]"
+        )
+
+    # Merge in query order so discovery order stays deterministic
+    video_ids: list[str] = []
+    seen: set[str] = set()
+    for found in results:
+        for vid in found:
+            if vid not in seen:
+                seen.add(vid)
+                video_ids.append(vid)
 
     return video_ids
 
@@ -59,6 +129,7 @@ async def _fetch_comment_threads(
     video_id: str,
     api_key: str,
     max_results: int = 100,
+    quota: QuotaAccountant | None = None,
 ) -> list[dict]:
     """Fetch top-level comment threads with replies for a video."""
     all_threads: list[dict] = []
@@ -76,9 +147,7 @@ async def _fetch_comment_threads(
         if page_token:
             params["pageToken"] = page_token
 
-        resp = await client.get(f"{API_BASE}/commentThreads", params=params)
-        resp.raise_for_status()
-        data = resp.json()
+        data = await _api_get(client, "commentThreads", params, quota)
 
         items = data.get("items", [])
         all_threads.extend(items)
@@ -94,6 +163,7 @@ async def _fetch_all_replies(
     client: httpx.AsyncClient,
     thread: dict,
     api_key: str,
+    quota: QuotaAccountant | None = None,
 ) -> None:
     """Fetch all replies for a thread using the comments.list endpoint.
 
@@ -121,9 +191,7 @@ async def _fetch_all_replies(
         if page_token:
             params["pageToken"] = page_token
 
-        resp = await client.get(f"{API_BASE}/comments", params=params)
-        resp.raise_for_status()
-        data = resp.json()
+        data = await _api_get(client, "comments", params, quota)
 
         all_replies.extend(data.get("items", []))
         page_token = data.get("nextPageToken")
@@ -134,6 +202,71 @@ async def _fetch_all_replies(
         thread.setdefault("replies", {})["comments"] = all_replies
 
 
+async def _prefetch_comment_counts(
+    client: httpx.AsyncClient,
+    video_ids: list[str],
+    api_key: str,
+    quota: QuotaAccountant | None = None,
+) -> dict[str, int]:
+    """Look up comment counts via videos.list, 50 ids per call.
+
+    Videos with comments disabled (no commentCount) or that no longer
+    exist are left out of the result.
+    """
+    counts: dict[str, int] = {}
+
+    for i in range(0, len(video_ids), VIDEOS_BATCH_SIZE):
+        batch = video_ids[i : i + VIDEOS_BATCH_SIZE]
+        params = {
+            "part": "statistics",
+            "id": ",".join(batch),
+            "key": api_key,
+            "maxResults": VIDEOS_BATCH_SIZE,
+        }
+        data = await _api_get(client, "videos", params, quota)
+        for item in data.get("items", []):
+            comment_count = item.get("statistics", {}).get("commentCount")
+            if comment_count is not None:
+                counts[item["id"]] = int(comment_count)
+
+    return counts
+
+
+def _expected_api_cost(comment_count: int, config: YouTubeConfig) -> int:
+    """Estimate the quota units needed to fetch a video's comments via the API."""
+    threads = min(comment_count, config.max_results_per_video)
+    thread_pages = max(1, -(-threads // 100))
+    reply_pages = int(threads * config.reply_fetch_ratio)
+    return thread_pages + reply_pages
+
+
+def _plan_videos(
+    video_ids: list[str],
+    counts: dict[str, int],
+    remaining: int,
+    config: YouTubeConfig,
+) -> tuple[list[str], set[str]]:
+    """Order videos by comment volume and pick which ones get API quota.
+
+    Returns (ordered video ids, ids to fetch via the API); the rest of
+    the videos go to yt-dlp.
+    """
+    kept = [
+        v for v in video_ids if counts.get(v, 0) >= config.min_video_comments
+    ]
+    kept.sort(key=lambda v: counts[v], reverse=True)
+
+    api_ids: set[str] = set()
+    for video_id in kept:
+        cost = _expected_api_cost(counts[video_id], config)
+        if cost > remaining:
+            continue
+        api_ids.add(video_id)
+        remaining -= cost
+
+    return kept, api_ids
+
+
 def _flatten_threads_to_tree(threads: list[dict]) -> list[dict]:
     """Convert YouTube comment threads into a flat comment tree format
     compatible with find_argument_chains()."""
@@ -237,16 +370,24 @@ def _map_ytdlp_comments(ytdlp_comments: list[dict]) -> list[dict]:
     return comments
 
 
-def _reconstruct_threads(comments: list[dict], min_per_side: int = 3) -> list[dict]:
+def _reconstruct_threads(
+    comments: list[dict],
+    min_per_side: int = 3,
+    max_pair_authors: int | None = None,
+) -> list[dict]:
     """Reconstruct threaded structure from YouTube's flat replies.
 
     YouTube replies are all depth=1 with parent_id pointing to the
     top-level comment. This groups replies by author pairs and
     re-links them chronologically so find_argument_chains() can
     walk them as a proper chain.
-    """
-    from collections import defaultdict
 
+    Replies are indexed by author and each author's replies sorted once;
+    every pair is then a linear merge of two pre-sorted lists. Only the
+    `max_pair_authors` most active qualifying authors per top-level
+    comment are paired, which bounds the quadratic pair count on
+    mega-threads.
+    """
     # Separate top-level comments from replies
     top_level = [c for c in comments if not c["parent_id"]]
     replies_by_parent: dict[str, list[dict]] = defaultdict(list)
@@ -256,24 +397,40 @@ def _reconstruct_threads(comments: list[dict], min_per_side: int = 3) -> list[di
 
     result = list(top_level)  # Keep top-level as-is
 
+    def order(entry: tuple[str, int, dict]) -> tuple[str, int]:
+        # Timestamp, then arrival order (matches a stable sort on timestamp)
+        return entry[0], entry[1]
+
     for top_id, replies in replies_by_parent.items():
-        # Count messages per author
-        author_counts: dict[str, int] = defaultdict(int)
-        for r in replies:
-            author_counts[r["author"]] += 1
+        # Index replies by author, remembering arrival order
+        by_author: dict[str, list[tuple[str, int, dict]]] = defaultdict(list)
+        for idx, r in enumerate(replies):
+            by_author[r["author"]].append((r.get("timestamp", ""), idx, r))
+
+        # Authors with min_per_side messages, in order of first appearance
+        qualifying_authors = [a for a, msgs in by_author.items() if len(msgs) >= min_per_side]
+        if max_pair_authors is not None and len(qualifying_authors) > max_pair_authors:
+            most_active = set(
+                heapq.nlargest(
+                    max_pair_authors,
+                    qualifying_authors,
+                    key=lambda a: len(by_author[a]),
+                )
+            )
+            qualifying_authors = [a for a in qualifying_authors if a in most_active]
 
-        # Find author pairs where both have min_per_side messages
-        qualifying_authors = [a for a, c in author_counts.items() if c >= min_per_side]
+        for author in qualifying_authors:
+            by_author[author].sort(key=order)
 
         paired_ids: set[str] = set()  # Track which replies get re-linked
 
         # For each qualifying pair, reconstruct threading
         for i, author_a in enumerate(qualifying_authors):
             for author_b in qualifying_authors[i + 1:]:
-                pair_msgs = sorted(
-                    [r for r in replies if r["author"] in (author_a, author_b)],
-                    key=lambda r: r.get("timestamp", ""),
-                )
+                pair_msgs = [
+                    entry[2]
+                    for entry in heapq.merge(by_author[author_a], by_author[author_b], key=order)
+                ]
 
                 if len(pair_msgs) < min_per_side * 2:
                     continue
@@ -300,8 +457,11 @@ def _reconstruct_threads(comments: list[dict], min_per_side: int = 3) -> list[di
 
 
 async def _fetch_comments_api(
+    client: httpx.AsyncClient,
     config: YouTubeConfig,
     video_id: str,
+    reply_limit: asyncio.Semaphore,
+    quota: QuotaAccountant | None = None,
 ) -> list[dict] | None:
     """Try fetching comments via YouTube Data API v3.
     Returns comment tree on success, None on quota/auth failure so caller can fallback.
@@ -309,20 +469,28 @@ async def _fetch_comments_api(
     if not config.api_key:
         return None
 
+    async def fetch_replies(ct: dict) -> None:
+        async with reply_limit:
+            await _fetch_all_replies(client, ct, config.api_key, quota)
+
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            comment_threads = await _fetch_comment_threads(
-                client, video_id, config.api_key, config.max_results_per_video
-            )
-            if not comment_threads:
-                return []
+        comment_threads = await _fetch_comment_threads(
+            client, video_id, config.api_key, config.max_results_per_video, quota
+        )
+        if not comment_threads:
+            return []
 
-            for ct in comment_threads:
-                await _fetch_all_replies(client, ct, config.api_key)
+        # Only threads with more replies than were returned inline need
+        # extra pages; those are paged concurrently under reply_limit.
+        await asyncio.gather(*(fetch_replies(ct) for ct in comment_threads))
 
-            return _flatten_threads_to_tree(comment_threads)
+        return _flatten_threads_to_tree(comment_threads)
+    except QuotaExceeded:
+        return None  # Quota spent — signal fallback
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 403:
+            if "commentsDisabled" in e.response.text:
+                return []
             return None  # Quota exhausted — signal fallback
         console.print(f"  [red]API error for {video_id}: {e}[/red]")
         return None
@@ -331,83 +499,199 @@ async def _fetch_comments_api(
         return None
 
 
-def _scrape_videos(
-    config: YouTubeConfig,
-    video_ids: list[str],
-    limit: int | None = None,
-) -> list[RawThread]:
-    """Scrape YouTube video comments for argument chains.
-    Tries YouTube Data API first, falls back to yt-dlp on quota exhaustion.
-    """
+def _chains_to_threads(video_id: str, comment_tree: list[dict], config: YouTubeConfig) -> list[RawThread]:
+    """Reconstruct threading, find argument chains, and wrap them as RawThreads."""
     threads: list[RawThread] = []
-    use_ytdlp = not config.api_key  # Start with yt-dlp if no key
 
-    for video_id in video_ids:
+    comment_tree = _reconstruct_threads(
+        comment_tree, config.min_messages_per_side, config.max_pair_authors
+    )
+
+    chains = find_argument_chains(
+        comment_tree,
+        min_per_side=config.min_messages_per_side,
+    )
+
+    for chain in chains:
+        messages = [
+            RawMessage(
+                message_id=msg["id"],
+                author_id=msg["author"],
+                body=msg["body"],
+                timestamp=msg.get("timestamp", ""),
+                score=msg.get("score"),
+            )
+            for msg in chain["messages"]
+        ]
+
+        threads.append(
+            RawThread(
+                platform="youtube",
+                source="YouTube",
+                url=f"https://www.youtube.com/watch?v={video_id}",
+                title=None,
+                messages=messages,
+                participant_a=chain["participant_a"],
+                participant_b=chain["participant_b"],
+            )
+        )
+
+        console.print(
+            f"  [green]Found chain:[/green] {chain['participant_a']} vs {chain['participant_b']} "
+            f"({len(messages)} messages)"
+        )
+
+    return threads
+
+
+class _YouTubeEngine:
+    """Scrapes many videos on one event loop with one pooled HTTP client.
+
+    Videos run `video_concurrency` at a time. Before fetching, the quota
+    planner drops videos with disabled or tiny comment sections and
+    reserves API quota for the videos with the most comments; the rest
+    use yt-dlp. The first API failure flips the whole engine to yt-dlp
+    for the rest of the run, matching the sequential scraper's fallback.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        config: YouTubeConfig,
+        quota: QuotaAccountant,
+    ):
+        self.client = client
+        self.config = config
+        self.quota = quota
+        self.use_ytdlp = not config.api_key  # Start with yt-dlp if no key
+        self.api_ids: set[str] = set()
+        self.video_limit = asyncio.Semaphore(config.video_concurrency)
+        self.reply_limit = asyncio.Semaphore(config.reply_concurrency)
+        self.ytdlp = YtDlpPool(
+            max_concurrent=config.ytdlp_concurrency,
+            timeout=config.ytdlp_timeout_seconds,
+            max_comments=config.max_comments,
+        )
+
+    async def plan(self, video_ids: list[str]) -> list[str]:
+        """Prefetch comment counts and decide which videos get API quota."""
+        if self.use_ytdlp or not self.quota.can_afford("videos"):
+            return video_ids
+
+        try:
+            counts = await _prefetch_comment_counts(
+                self.client, video_ids, self.config.api_key, self.quota
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 403:
+                console.print("  [yellow]API quota exhausted, switching to yt-dlp[/yellow]")
+                self.use_ytdlp = True
+                return video_ids
+            console.print(f"  [yellow]Comment count prefetch failed: {e}[/yellow]")
+            self.api_ids = set(video_ids)
+            return video_ids
+        except Exception as e:
+            console.print(f"  [yellow]Comment count prefetch failed: {e}[/yellow]")
+            self.api_ids = set(video_ids)
+            return video_ids
+
+        ordered, self.api_ids = _plan_videos(
+            video_ids, counts, self.quota.remaining(), self.config
+        )
+        console.print(
+            f"  [dim]Planned {len(ordered)}/{len(video_ids)} videos "
+            f"({len(self.api_ids)} via API, {len(ordered) - len(self.api_ids)} via yt-dlp; "
+            f"{len(video_ids) - len(ordered)} dropped for few/disabled comments)[/dim]"
+        )
+        return ordered
+
+    async def scrape_video(self, video_id: str) -> list[RawThread]:
         console.print(f"  [dim]Fetching comments for video {video_id}...[/dim]")
 
         comment_tree = None
 
         # Try API first (unless we already know quota is gone)
-        if not use_ytdlp:
-            comment_tree = asyncio.run(_fetch_comments_api(config, video_id))
+        if not self.use_ytdlp and video_id in self.api_ids:
+            comment_tree = await _fetch_comments_api(
+                self.client, self.config, video_id, self.reply_limit, self.quota
+            )
             if comment_tree is None:
-                console.print("  [yellow]API quota exhausted, switching to yt-dlp[/yellow]")
-                use_ytdlp = True
+                if not self.use_ytdlp:
+                    console.print("  [yellow]API quota exhausted, switching to yt-dlp[/yellow]")
+                    self.use_ytdlp = True
             elif comment_tree == []:
                 console.print(f"  [dim]No comments found for {video_id}[/dim]")
-                continue
+                return []
             else:
                 console.print(f"  [dim]Got {len(comment_tree)} comments via API, finding chains...[/dim]")
 
-        # yt-dlp fallback
-        if use_ytdlp:
-            ytdlp_comments = _fetch_comments_ytdlp(video_id, config.max_comments)
-            if not ytdlp_comments:
+        # yt-dlp fallback (extracted and mapped in a worker process)
+        if comment_tree is None:
+            comment_tree = await self.ytdlp.extract(video_id)
+            if not comment_tree:
                 console.print(f"  [dim]No comments found for {video_id}[/dim]")
-                continue
-            console.print(f"  [dim]Got {len(ytdlp_comments)} comments via yt-dlp, finding chains...[/dim]")
-            comment_tree = _map_ytdlp_comments(ytdlp_comments)
-
-        # Reconstruct threading and find argument chains
-        comment_tree = _reconstruct_threads(comment_tree, config.min_messages_per_side)
+                return []
+            console.print(f"  [dim]Got {len(comment_tree)} comments via yt-dlp, finding chains...[/dim]")
 
-        chains = find_argument_chains(
-            comment_tree,
-            min_per_side=config.min_messages_per_side,
+        # Thread reconstruction and chain detection run in the CPU pool
+        return await get_cpu_stage().arun(
+            _chains_to_threads, video_id, comment_tree, self.config, size=len(comment_tree)
         )
 
-        for chain in chains:
-            messages = [
-                RawMessage(
-                    author_id=msg["author"],
-                    body=msg["body"],
-                    timestamp=msg.get("timestamp", ""),
-                    score=msg.get("score"),
-                )
-                for msg in chain["messages"]
-            ]
-
-            threads.append(
-                RawThread(
-                    platform="youtube",
-                    source="YouTube",
-                    url=f"https://www.youtube.com/watch?v={video_id}",
-                    title=None,
-                    messages=messages,
-                    participant_a=chain["participant_a"],
-                    participant_b=chain["participant_b"],
-                )
-            )
-
-            console.print(
-                f"  [green]Found chain:[/green] {chain['participant_a']} vs {chain['participant_b']} "
-                f"({len(messages)} messages)"
-            )
-
-        if limit and len(threads) >= limit:
+    async def run(
+        self,
+        video_ids: list[str],
+        limit: int | None = None,
+        on_thread: Callable[[RawThread], None] | None = None,
+        cancel: threading.Event | None = None,
+    ) -> list[RawThread]:
+        """Scrape the videos; each video's threads also go to `on_thread` as
+        soon as it is done (up to `limit` in all). No new video is started
+        once `cancel` is set."""
+        video_ids = await self.plan(video_ids)
+        results: dict[int, list[RawThread]] = {}
+        found = 0
+
+        async def process(idx: int, video_id: str) -> None:
+            nonlocal found
+            async with self.video_limit:
+                if limit and found >= limit:
+                    return
+                if cancel is not None and cancel.is_set():
+                    return
+                results[idx] = await self.scrape_video(video_id)
+                if on_thread:
+                    room = limit - found if limit else len(results[idx])
+                    for thread in results[idx][: max(0, room)]:
+                        on_thread(thread)
+                found += len(results[idx])
+
+        await asyncio.gather(*(process(i, v) for i, v in enumerate(video_ids)))
+
+        threads = [t for idx in sorted(results) for t in results[idx]]
+        if limit:
             threads = threads[:limit]
-            break
+        return threads
+
 
+async def _scrape_videos(
+    config: YouTubeConfig,
+    video_ids: list[str],
+    limit: int | None = None,
+    on_thread: Callable[[RawThread], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> list[RawThread]:
+    """Scrape YouTube video comments for argument chains.
+    Tries YouTube Data API first, falls back to yt-dlp on quota exhaustion.
+    """
+    quota = QuotaAccountant(config.daily_quota)
+    limits = httpx.Limits(max_connections=config.video_concurrency + config.reply_concurrency)
+    async with httpx.AsyncClient(timeout=30.0, limits=limits) as client:
+        engine = _YouTubeEngine(client, config, quota)
+        threads = await engine.run(video_ids, limit, on_thread, cancel)
+
+    if config.api_key:
+        console.print(f"  [dim]YouTube API quota: {quota.summary()}[/dim]")
     return threads
 
 
@@ -415,8 +699,12 @@ def scrape_youtube(
     config: YouTubeConfig | None = None,
     video_ids: list[str] | None = None,
     limit: int | None = None,
+    on_thread: Callable[[RawThread], None] | None = None,
+    cancel: threading.Event | None = None,
 ) -> list[RawThread]:
-    """Main entry point: scrape YouTube comments for argument threads."""
+    """Main entry point: scrape YouTube comments for argument threads.
+    Threads are also passed to `on_thread` video by video; no new video
+    is started once `cancel` is set."""
     config = config or YouTubeConfig()
     video_ids = video_ids or []
 
@@ -425,6 +713,6 @@ def scrape_youtube(
         return []
 
     console.print("[bold cyan]Scraping YouTube[/bold cyan]")
-    threads = _scrape_videos(config, video_ids, limit)
+    threads = asyncio.run(_scrape_videos(config, video_ids, limit, on_thread, cancel))
     console.print(f"\n[bold]Total YouTube threads found: {len(threads)}[/bold]")
     return threads
@@ -0,0 +1,127 @@
+"""
+YouTube Data API quota accounting.
+
+Every API call is charged against the daily quota (10,000 units by
+default) in a local SQLite ledger, so the scraper knows how much budget
+is left before making a call instead of finding out from a 403. Calls
+reserve their units up front (check and charge in one transaction, so
+concurrent calls can't overspend together) and refund them if no
+response came back. The quota resets at midnight Pacific time, so usage
+is keyed by the Pacific calendar day.
+"""
+
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from pipeline.state import open_state_db
+
+# Unit cost per call, from the YouTube Data API quota calculator
+QUOTA_COSTS = {
+    "search": 100,
+    "commentThreads": 1,
+    "comments": 1,
+    "videos": 1,
+}
+
+_QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+
+
+class QuotaExceeded(Exception):
+    """Raised instead of making a call the remaining quota cannot cover."""
+
+
+def _quota_day() -> str:
+    return datetime.now(_QUOTA_TZ).date().isoformat()
+
+
+class QuotaAccountant:
+    """Persistent per-day ledger of YouTube API units spent, by endpoint."""
+
+    def __init__(self, daily_budget: int = 10_000, db_name: str = "youtube_quota"):
+        self.daily_budget = daily_budget
+        self._conn = open_state_db(db_name)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS quota_usage (
+                day TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                calls INTEGER NOT NULL,
+                units INTEGER NOT NULL,
+                PRIMARY KEY (day, endpoint)
+            )
+            """
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def used(self) -> int:
+        """Units spent so far today (across all runs)."""
+        with self._lock:
+            return self._used(_quota_day())
+
+    def remaining(self) -> int:
+        return max(0, self.daily_budget - self.used())
+
+    def can_afford(self, endpoint: str, calls: int = 1) -> bool:
+        return QUOTA_COSTS[endpoint] * calls <= self.remaining()
+
+    def reserve(self, endpoint: str, calls: int = 1) -> bool:
+        """Charge `calls` calls to `endpoint` if today's remaining quota
+        covers them; False (and nothing charged) if it doesn't.
+
+        The check and the charge happen in one write transaction, so
+        concurrent callers (threads here, or other runs sharing the ledger)
+        can't all pass the check before any of them is charged.
+        """
+        units = QUOTA_COSTS[endpoint] * calls
+        day = _quota_day()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if units > self.daily_budget - self._used(day):
+                    self._conn.rollback()
+                    return False
+                self._add(day, endpoint, calls, units)
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return True
+
+    def refund(self, endpoint: str, calls: int = 1) -> None:
+        """Give back a reservation for calls that never got a response."""
+        self._record(endpoint, -calls, -QUOTA_COSTS[endpoint] * calls)
+
+    def mark_exhausted(self) -> None:
+        """The API reported quotaExceeded: treat the rest of today as spent."""
+        remaining = self.remaining()
+        if remaining:
+            self._record("exhausted", 0, remaining)
+
+    def _record(self, endpoint: str, calls: int, units: int) -> None:
+        with self._lock:
+            self._add(_quota_day(), endpoint, calls, units)
+            self._conn.commit()
+
+    def _used(self, day: str) -> int:
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(units), 0) FROM quota_usage WHERE day = ?",
+            (day,),
+        ).fetchone()
+        return row[0]
+
+    def _add(self, day: str, endpoint: str, calls: int, units: int) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO quota_usage (day, endpoint, calls, units)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(day, endpoint) DO UPDATE SET
+                calls = calls + excluded.calls,
+                units = units + excluded.units
+            """,
+            (day, endpoint, calls, units),
+        )
+
+    def summary(self) -> str:
+        return f"{self.used():,}/{self.daily_budget:,} units used today"
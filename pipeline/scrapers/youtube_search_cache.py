@@ -0,0 +1,79 @@
+"""
+On-disk TTL cache for YouTube search results.
+
+Every search.list call costs 100 quota units and the static discovery
+queries return nearly the same videos hour to hour, so results are cached
+per (query, relevanceLanguage, maxResults) and reused until they expire.
+"""
+
+import json
+import time
+from typing import Optional
+
+from pipeline.scrapers.youtube_quota import QUOTA_COSTS
+from pipeline.state import open_state_db
+
+
+class SearchCache:
+    """(query, language, max_results) -> video ids, with a TTL."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        refresh: bool = False,
+        db_name: str = "youtube_search",
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.refresh = refresh
+        self._conn = open_state_db(db_name)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                query TEXT NOT NULL,
+                language TEXT NOT NULL,
+                max_results INTEGER NOT NULL,
+                video_ids TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (query, language, max_results)
+            )
+            """
+        )
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, query: str, language: str, max_results: int) -> Optional[list[str]]:
+        """Return cached video ids if present and fresh (and not refreshing)."""
+        if self.refresh:
+            self.misses += 1
+            return None
+        row = self._conn.execute(
+            """
+            SELECT video_ids, fetched_at FROM search_cache
+            WHERE query = ? AND language = ? AND max_results = ?
+            """,
+            (query, language, max_results),
+        ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, query: str, language: str, max_results: int, video_ids: list[str]) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO search_cache (query, language, max_results, video_ids, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(query, language, max_results) DO UPDATE SET
+                video_ids = excluded.video_ids,
+                fetched_at = excluded.fetched_at
+            """,
+            (query, language, max_results, json.dumps(video_ids), time.time()),
+        )
+        self._conn.commit()
+
+    def summary(self) -> str:
+        saved = self.hits * QUOTA_COSTS["search"]
+        return f"{self.hits} hits, {self.misses} misses, {saved:,} quota units saved"
@@ -0,0 +1,91 @@
+"""
+Parallel yt-dlp comment extraction in worker processes.
+
+yt-dlp extraction is slow, blocking and GIL-heavy, so each video is
+extracted in its own spawned process, at most `max_concurrent` at a time
+to stay under YouTube's throttling. Workers map comments to the internal
+comment-tree format themselves and send the finished tree back in one
+message (yt-dlp only hands over comments once extraction is complete, and
+chain detection needs the whole tree anyway), so the parent can run chain
+detection on one video while others are still downloading. A video that
+exceeds its timeout is killed.
+"""
+
+import asyncio
+import multiprocessing
+import queue as queue_lib
+
+from rich.console import Console
+
+console = Console()
+
+# How often the parent checks a worker's queue; polling keeps the wait
+# cancellable, where a blocking get() in a helper thread would not be
+_POLL_SECONDS = 0.2
+
+
+def _extract_worker(video_id: str, max_comments: int, out: multiprocessing.Queue) -> None:
+    """Child process entry point: extract and map one video's comments."""
+    from pipeline.scrapers.youtube import _fetch_comments_ytdlp, _map_ytdlp_comments
+
+    try:
+        comments = _fetch_comments_ytdlp(video_id, max_comments)
+        out.put(("done", _map_ytdlp_comments(comments)))
+    except Exception as e:
+        out.put(("error", str(e)))
+
+
+class YtDlpPool:
+    """Runs yt-dlp extractions in worker processes with per-video timeouts."""
+
+    def __init__(self, max_concurrent: int, timeout: float, max_comments: int):
+        self.timeout = timeout
+        self.max_comments = max_comments
+        self._ctx = multiprocessing.get_context("spawn")
+        self._slots = asyncio.Semaphore(max_concurrent)
+
+    async def extract(self, video_id: str) -> list[dict]:
+        """Return the video's mapped comment tree ([] on error or timeout)."""
+        async with self._slots:
+            out = self._ctx.Queue()
+            proc = self._ctx.Process(
+                target=_extract_worker,
+                args=(video_id, self.max_comments, out),
+                daemon=True,
+            )
+            proc.start()
+            try:
+                return await asyncio.wait_for(
+                    self._collect(video_id, proc, out), self.timeout
+                )
+            except asyncio.TimeoutError:
+                console.print(
+                    f"  [red]yt-dlp timed out after {self.timeout:.0f}s for {video_id}[/red]"
+                )
+                return []
+            finally:
+                # _collect() polls without a helper thread, so nothing is
+                # still reading from `out` by the time it is closed
+                if proc.is_alive():
+                    proc.terminate()
+                await asyncio.to_thread(proc.join, 5.0)
+                out.close()
+
+    async def _collect(self, video_id: str, proc, out) -> list[dict]:
+        while True:
+            try:
+                kind, payload = out.get_nowait()
+            except queue_lib.Empty:
+                if not proc.is_alive() and out.empty():
+                    console.print(
+                        f"  [red]yt-dlp worker for {video_id} exited "
+                        f"(code {proc.exitcode})[/red]"
+                    )
+                    return []
+                await asyncio.sleep(_POLL_SECONDS)
+                continue
+
+            if kind == "done":
+                return payload
+            console.print(f"  [red]yt-dlp error for {video_id}: {payload}[/red]")
+            return []
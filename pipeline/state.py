@@ -0,0 +1,21 @@
+"""Local SQLite state stores kept under STATE_DIR."""
+
+import os
+import sqlite3
+
+from pipeline.config import STATE_DIR
+
+
+def open_state_db(name: str) -> sqlite3.Connection:
+    """Open (creating if needed) the state database `STATE_DIR/<name>.sqlite3`.
+
+    Connections may be shared across threads; callers serialize writes.
+    """
+    os.makedirs(STATE_DIR, exist_ok=True)
+    conn = sqlite3.connect(
+        os.path.join(STATE_DIR, f"{name}.sqlite3"),
+        check_same_thread=False,
+        timeout=30.0,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
@@ -0,0 +1,4 @@
+ALTER TABLE "arguments" ALTER COLUMN "category" SET DATA TYPE text;--> statement-breakpoint
+ALTER TABLE "arguments" ADD COLUMN IF NOT EXISTS "nsfw_level" text;--> statement-breakpoint
+ALTER TABLE "arguments" ADD COLUMN IF NOT EXISTS "fingerprint" text;--> statement-breakpoint
+CREATE UNIQUE INDEX IF NOT EXISTS "arguments_fingerprint_idx" ON "arguments" ("fingerprint");
\ No newline at end of file
@@ -127,6 +127,7 @@ export const arguments_ = pgTable(
       }),
     viewCount: integer("view_count").notNull().default(0),
     shareCount: integer("share_count").notNull().default(0),
+    fingerprint: text("fingerprint"), // pipeline dedupe key, NULL on older rows; never exposed publicly
     createdAt: timestamp("created_at").notNull().defaultNow(),
     updatedAt: timestamp("updated_at").notNull().defaultNow(),
   },
@@ -141,6 +142,9 @@ export const arguments_ = pgTable(
     ),
     totalVotesIdx: index("arguments_total_votes_idx").on(table.totalVotes),
     createdAtIdx: index("arguments_created_at_idx").on(table.createdAt),
+    fingerprintIdx: uniqueIndex("arguments_fingerprint_idx").on(
+      table.fingerprint
+    ),
   })
 );
 
@@ -6,7 +6,7 @@ type ArgumentRow = InferSelectModel<typeof arguments_>;
 
 /**
  * Maps a snake_case DB row to the camelCase API response shape.
- * Strips `originalUrl` (never exposed publicly).
+ * Strips `originalUrl` and `fingerprint` (never exposed publicly).
  */
 export function serializeArgument(row: ArgumentRow): Argument {
   return {